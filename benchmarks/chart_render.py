@@ -0,0 +1,90 @@
+"""Rendu SVG vs WebGL des nuages de points et courbes selon le nombre de points.
+
+    python benchmarks/chart_render.py [--points 1000 10000 100000 500000] [--html dossier]
+
+Pour chaque taille et chaque mode: temps de construction de la figure Plotly
+Express, temps de sérialisation JSON (ce que Streamlit envoie au navigateur) et
+taille de la charge utile. Avec --html, une page autonome par cas est écrite
+dans le dossier: ouverte dans un navigateur, elle affiche la durée de
+Plotly.newPlot (rendu côté client), impossible à mesurer sans navigateur.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taxis_run.charts import SEUIL_WEBGL  # noqa: E402
+
+PAGE_CHRONOMETREE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script></head>
+<body><p id="temps">Rendu en cours...</p><div id="figure" style="height:600px"></div>
+<script>
+var figure = {figure};
+var debut = performance.now();
+Plotly.newPlot('figure', figure.data, figure.layout).then(function() {{
+    requestAnimationFrame(function() {{
+        var duree = (performance.now() - debut).toFixed(0);
+        document.getElementById('temps').textContent = '{titre}: ' + duree + ' ms';
+        document.title = duree + ' ms';
+    }});
+}});
+</script></body></html>
+"""
+
+
+def synthetic_trips(n, rng):
+    """Courses synthétiques: demande, revenu, horodatage et micro-région"""
+    return pd.DataFrame({
+        'date': pd.Timestamp('2024-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 365 * 24 * 3600, n)), unit='s'),
+        'demande': rng.gamma(2.0, 10.0, n),
+        'revenu': rng.normal(2800, 300, n),
+        'micro_region': rng.choice(['Nord', 'Sud', 'Ouest', 'Est', 'Cirques'], n),
+    })
+
+
+def build(kind, frame, mode):
+    """Figure du type demandé dans le mode de rendu donné"""
+    if kind == 'scatter':
+        return px.scatter(frame, x='demande', y='revenu', color='micro_region', render_mode=mode)
+    return px.line(frame, x='date', y='demande', color='micro_region', render_mode=mode)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--points', type=int, nargs='+', default=[1000, 10000, 100000, 500000])
+    parser.add_argument('--html', help="Dossier où écrire les pages de mesure du rendu navigateur")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.html:
+        os.makedirs(args.html, exist_ok=True)
+    # Premier appel hors mesure (import et validation des gabarits Plotly)
+    build('scatter', synthetic_trips(10, rng), 'svg').to_json()
+    print(f"Seuil de bascule automatique: {SEUIL_WEBGL} points")
+    print(f"{'type':<8} {'points':>8} {'mode':<6} {'trace':<10} {'construction':>13} {'json':>9} {'charge':>10}")
+    for n in args.points:
+        frame = synthetic_trips(n, rng)
+        for kind in ('scatter', 'line'):
+            for mode in ('svg', 'webgl'):
+                debut = time.perf_counter()
+                fig = build(kind, frame, mode)
+                construction = time.perf_counter() - debut
+                debut = time.perf_counter()
+                charge = fig.to_json()
+                serialisation = time.perf_counter() - debut
+                print(f"{kind:<8} {n:>8} {mode:<6} {fig.data[0].type:<10} {construction * 1000:>10.0f} ms "
+                      f"{serialisation * 1000:>6.0f} ms {len(charge) / 1024:>7.0f} Ko")
+                if args.html:
+                    chemin = os.path.join(args.html, f"{kind}_{n}_{mode}.html")
+                    with open(chemin, 'w', encoding='utf-8') as fichier:
+                        fichier.write(PAGE_CHRONOMETREE.format(figure=charge, titre=f"{kind} {n} {mode}"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""Parité et temps des moteurs de calcul pandas et Polars (taxis_run.compute).
+
+    python benchmarks/compute_backends.py [--lignes 10000000] [--repetitions 3]
+
+Vérifie d'abord, sur les données intégrées puis sur un historique journalier
+synthétique de --lignes lignes, que les deux moteurs donnent les mêmes
+résultats pour chaque opération de l'interface: filtre d'égalité, top n,
+sommes par année et micro-région, sommes par date, agrégations nommées par
+micro-région. Mêmes lignes, même ordre et même index; les valeurs peuvent
+différer de 1e-5 en relatif (mesures intégrées en float32, additions dans un
+autre ordre).
+
+Mesure ensuite chaque opération sur l'historique synthétique: pandas, Polars
+au premier appel (conversion du DataFrame comprise) et Polars aux appels
+suivants (conversion mémorisée). Le gain de Polars dépend du nombre de cœurs
+disponibles, affiché en tête. Le code de sortie est non nul si un résultat
+diffère entre les moteurs.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taxis_run.compute import PandasBackend, PolarsBackend  # noqa: E402
+from taxis_run.data import ReunionTaxiData  # noqa: E402
+from taxis_run.metrics import derive_microregion_metrics  # noqa: E402
+from taxis_run.schema import MICRO_REGIONS  # noqa: E402
+
+
+def synthetic_history(lignes, communes=1000, seed=0):
+    """Historique journalier synthétique d'environ lignes lignes pour communes communes"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2000-01-01', periods=max(1, lignes // communes), freq='D')
+    n = len(dates) * communes
+    noms = pd.Categorical([f"Zone {i:04d}" for i in range(communes)])
+    return pd.DataFrame({
+        'date': np.repeat(dates, communes),
+        'commune': pd.Categorical.from_codes(np.tile(np.arange(communes), len(dates)), noms.categories),
+        'micro_region': pd.Categorical.from_codes(np.tile(np.arange(communes) % 5, len(dates)), dtype=MICRO_REGIONS),
+        'nombre_taxis': rng.uniform(5, 200, n),
+        'demande_moyenne_journaliere': rng.uniform(50, 3000, n),
+    })
+
+
+def operations(historique, commune):
+    """Opérations de l'interface sur un historique: {nom: fonction(moteur)}"""
+    mesures = ['nombre_taxis', 'demande_moyenne_journaliere']
+    return {
+        'filtre commune': lambda moteur: moteur.filter_eq(historique, 'commune', commune),
+        'top 10 demande': lambda moteur: moteur.top_n(historique, 'demande_moyenne_journaliere', 10),
+        'sommes année x micro-région': lambda moteur: moteur.group_sum(
+            historique, ['date', 'micro_region'], mesures, annuel=True),
+        'sommes par date': lambda moteur: moteur.group_sum(historique, ['date'], ['nombre_taxis']),
+        'agrégations micro-région': lambda moteur: moteur.group_agg(historique, 'micro_region', {
+            'lignes': ('commune', 'size'),
+            'taxis': ('nombre_taxis', 'sum'),
+            'demande_moyenne': ('demande_moyenne_journaliere', 'mean'),
+        }),
+    }
+
+
+def mismatch(attendu, obtenu):
+    """Description de l'écart entre deux résultats, None s'ils sont identiques"""
+    try:
+        pd.testing.assert_frame_equal(attendu, obtenu, check_dtype=False, check_index_type=False,
+                                      check_exact=False, rtol=1e-5)
+    except AssertionError as erreur:
+        return str(erreur).splitlines()[0]
+    return None
+
+
+def check_parity(libelle, ops, pandas, polars):
+    """Liste des opérations dont les résultats diffèrent entre les moteurs"""
+    echecs = []
+    for nom, operation in ops.items():
+        ecart = mismatch(operation(pandas), operation(polars))
+        print(f"  {libelle:<22} {nom:<30} {'OK' if ecart is None else 'DIFFÉRENT'}")
+        if ecart is not None:
+            echecs.append(f"{libelle} / {nom}: {ecart}")
+    return echecs
+
+
+def timed(operation, moteur, repetitions):
+    """Médiane des durées (ms) de repetitions appels"""
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        operation(moteur)
+        durees.append((time.perf_counter() - debut) * 1000)
+    return statistics.median(durees)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lignes', type=int, default=10_000_000, help="Taille de l'historique synthétique")
+    parser.add_argument('--repetitions', type=int, default=3)
+    args = parser.parse_args()
+
+    import polars
+
+    pandas, polars_moteur = PandasBackend(), PolarsBackend()
+    print(f"Polars {polars.__version__}, {polars.thread_pool_size()} threads, {os.cpu_count()} cœurs")
+
+    print("Parité")
+    data = ReunionTaxiData(trace=False)
+    commune = data.current_data['nom'].iloc[0]
+    echecs = check_parity('données intégrées', operations(data.historical_data, commune), pandas, polars_moteur)
+    echecs += check_parity('données intégrées', {
+        'top 10 communes': lambda moteur: moteur.top_n(data.current_data, 'nombre_taxis', 10),
+        'métriques micro-régions': lambda moteur: derive_microregion_metrics(data.current_data, moteur),
+    }, pandas, polars_moteur)
+
+    historique = synthetic_history(args.lignes)
+    ops = operations(historique, historique['commune'].iloc[0])
+    echecs += check_parity(f"{len(historique):,} lignes", ops, pandas, polars_moteur)
+
+    print(f"Temps sur {len(historique):,} lignes (médiane de {args.repetitions}, ms)")
+    print(f"  {'opération':<30}{'pandas':>10}{'Polars 1er':>12}{'Polars':>10}{'gain':>8}")
+    for nom, operation in ops.items():
+        moteur = PolarsBackend()
+        premier = timed(operation, moteur, 1)
+        suivants = timed(operation, moteur, args.repetitions)
+        reference = timed(operation, pandas, args.repetitions)
+        print(f"  {nom:<30}{reference:>10.0f}{premier:>12.0f}{suivants:>10.0f}{reference / suivants:>7.1f}x")
+
+    for echec in echecs:
+        print(f"ÉCHEC {echec}")
+    sys.exit(1 if echecs else 0)
+
+
+if __name__ == '__main__':
+    main()
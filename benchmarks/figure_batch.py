@@ -0,0 +1,97 @@
+"""Construction des figures d'une vue: en série ou ensemble dans le pool de processus.
+
+    python benchmarks/figure_batch.py [--workers 1 2 4 8] [--repetitions 5]
+
+Construit les figures de deux vues (les six distributions de la page
+Taxiteurs, les huit figures de la Vue d'ensemble) comme le fait FigureBatch,
+et compare, pour chaque nombre de processus, la durée du lot à la somme et au
+maximum des durées des figures construites une à une. Avec assez de cœurs la
+durée du lot approche celle de la figure la plus lente (plus l'envoi des
+données aux processus); sur un seul cœur, le pool ne peut qu'ajouter ce coût.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import plotly.express as px
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taxis_run.charts import FigureFactory, build_figure, render_mode  # noqa: E402
+from taxis_run.data import ReunionTaxiData  # noqa: E402
+from taxis_run.drivers import driver_distributions  # noqa: E402
+
+
+def drivers_specs(data):
+    """Les six distributions de la page Taxiteurs"""
+    distributions = driver_distributions(data.drivers_data, [], [])
+    specs = []
+    for nom in ('age', 'anciennete', 'heures_hebdo', 'contrat', 'formation', 'langues'):
+        if nom in ('age', 'contrat'):
+            specs.append((px.pie, (distributions[nom],), dict(values='pourcentage', names='categorie', title=nom),
+                          None, ()))
+        else:
+            specs.append((px.bar, (distributions[nom],), dict(x='categorie', y='pourcentage', color='pourcentage',
+                                                              title=nom), None, ()))
+    return specs
+
+
+def overview_specs(data):
+    """Les figures des onglets Évolution, Micro-régions et Stations de la Vue d'ensemble"""
+    evolution = data.annual_microregion_totals()
+    microregions = data.microregion_data
+    historique = data.historical_data
+    specs = [
+        (px.line, (evolution,), dict(x='date', y=mesure, color='micro_region', title=mesure,
+                                     render_mode=render_mode(len(evolution))), dict(yaxis_title=mesure), ())
+        for mesure in ('nombre_taxis', 'demande_moyenne_journaliere')
+    ]
+    specs += [
+        (px.pie, (microregions,), dict(values='nombre_taxis_total', names='micro_region', title='taxis'), None, ()),
+        (px.bar, (microregions,), dict(x='micro_region', y='demande_totale_journaliere', color='micro_region',
+                                       title='demande'), None, ()),
+        (px.bar, (data.taxi_stations_data,), dict(x='nom', y='nombre_taxis', color='type', title='stations'),
+         None, ()),
+        (px.bar, (microregions,), dict(x='micro_region', y='taux_occupation_moyen', color='micro_region',
+                                       title='occupation'), None, ()),
+    ]
+    specs += [
+        (px.line, (historique,), dict(x='date', y=mesure, color='commune', title=f"{mesure} par commune",
+                                      render_mode=render_mode(len(historique))), None, ())
+        for mesure in ('nombre_taxis', 'demande_moyenne_journaliere')
+    ]
+    return specs
+
+
+def timed(fonction, *args):
+    debut = time.perf_counter()
+    fonction(*args)
+    return (time.perf_counter() - debut) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--repetitions', type=int, default=5)
+    args = parser.parse_args()
+
+    data = ReunionTaxiData(trace=False)
+    vues = {'taxiteurs': drivers_specs(data), "vue d'ensemble": overview_specs(data)}
+    print(f"{os.cpu_count()} cœurs")
+    print(f"{'vue':<16}{'figures':>8}{'somme (ms)':>12}{'plus lente':>12}{'processus':>11}{'lot (ms)':>10}")
+    for vue, specs in vues.items():
+        for spec in specs:
+            build_figure(*spec)
+        durees = [statistics.median(timed(build_figure, *spec) for _ in range(args.repetitions)) for spec in specs]
+        for workers in args.workers:
+            fabrique = FigureFactory(workers)
+            fabrique.build(specs)
+            lot = statistics.median(timed(fabrique.build, specs) for _ in range(args.repetitions))
+            fabrique.shutdown()
+            print(f"{vue:<16}{len(specs):>8}{sum(durees):>12.0f}{max(durees):>12.0f}{workers:>11}{lot:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Historique partitionné: ajout d'une période, agrégats incrémentaux et lectures élaguées.
+
+    python benchmarks/history_store.py [--zones 1000] [--annees 5]
+
+Écrit un historique journalier synthétique mois par mois dans un dossier
+partitionné temporaire, puis mesure l'ajout d'un mois supplémentaire, les
+totaux annuels déduits du manifeste (comparés à un groupby sur l'historique
+complet) et la lecture d'un mois, d'une année et de tout l'historique.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taxis_run.history_store import HistoryStore  # noqa: E402
+from taxis_run.schema import MICRO_REGIONS  # noqa: E402
+
+
+def synthetic_month(debut, zones, rng):
+    """Un mois d'historique journalier pour zones communes"""
+    dates = pd.date_range(debut, pd.Timestamp(debut) + pd.offsets.MonthEnd(0), freq='D')
+    n = len(dates) * zones
+    return pd.DataFrame({
+        'date': np.repeat(dates, zones),
+        'commune': np.tile([f"Zone {i:04d}" for i in range(zones)], len(dates)),
+        'micro_region': np.tile(np.asarray(MICRO_REGIONS.categories)[np.arange(zones) % 5], len(dates)),
+        'nombre_taxis': rng.uniform(5, 200, n),
+        'demande_moyenne_journaliere': rng.uniform(50, 3000, n),
+        'revenu_moyen_mensuel': rng.uniform(1800, 3200, n),
+    })
+
+
+def timed(fonction, *args):
+    debut = time.perf_counter()
+    resultat = fonction(*args)
+    return resultat, (time.perf_counter() - debut) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--zones', type=int, default=1000)
+    parser.add_argument('--annees', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    mois = pd.date_range('2020-01-01', periods=12 * args.annees, freq='MS')
+    with tempfile.TemporaryDirectory() as dossier:
+        store = HistoryStore(dossier)
+        for debut in mois:
+            store.append(synthetic_month(debut, args.zones, rng))
+        taille = sum(os.path.getsize(os.path.join(dossier, f['fichier'])) for f in store.manifeste['fichiers'])
+        print(f"{len(mois)} partitions, {store.partitions()['lignes'].sum():,} lignes, {taille / 2**20:.0f} Mo")
+
+        nouveau = synthetic_month(mois[-1] + pd.offsets.MonthBegin(1), args.zones, rng)
+        _, duree = timed(store.append, nouveau)
+        print(f"ajout d'un mois ({len(nouveau):,} lignes, manifeste compris): {duree:8.0f} ms")
+
+        totaux, duree = timed(store.annual_totals)
+        print(f"totaux annuels depuis le manifeste:                 {duree:8.1f} ms")
+        historique, duree_lecture = timed(store.read)
+        reference, duree = timed(lambda: historique.groupby([historique['date'].dt.year, 'micro_region'],
+                                                            observed=True)['nombre_taxis'].sum())
+        ecart = np.abs(totaux['nombre_taxis'].to_numpy() - reference.to_numpy()).max()
+        print(f"mêmes totaux par groupby sur l'historique lu:        {duree:8.1f} ms (écart max {ecart:.2g})")
+
+        annee = mois[-1].year
+        for libelle, debut, fin in (('un mois', f"{annee}-06-01", f"{annee}-06-30"),
+                                    ('une année', f"{annee}-01-01", f"{annee}-12-31")):
+            lignes, duree = timed(store.read, debut, fin)
+            print(f"lecture {libelle:<10} ({len(store.files(debut, fin)):>2} fichiers, {len(lignes):>9,} lignes): "
+                  f"{duree:8.0f} ms")
+        print(f"lecture complète   ({len(store.files()):>2} fichiers, {len(historique):>9,} lignes): "
+              f"{duree_lecture:8.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
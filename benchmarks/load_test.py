@@ -0,0 +1,261 @@
+"""Charge de N sessions simultanées: latence des reruns, CPU et mémoire du serveur.
+
+    python benchmarks/load_test.py [--sessions 1 2 4 8] [--parcours 3] [--pause 0.5] [--etapes]
+
+Démarre un serveur `streamlit run Dashboard.py` sans navigateur, puis y
+connecte N clients headless qui parlent le protocole du navigateur (messages
+protobuf sur le websocket /_stcore/stream): chaque client demande un rerun
+avec l'état de ses widgets et attend la fin du script. Une session enchaîne
+un parcours réaliste: changement de page, sélection de commune et de
+micro-région, déplacement des curseurs du simulateur, filtre des taxiteurs,
+exécution d'une requête SQL, avec une pause aléatoire (moyenne --pause
+secondes) entre deux actions.
+
+AppTest n'est pas utilisé ici: il modifie un état global de Streamlit
+(runtime, configuration) et ne supporte pas plusieurs sessions simultanées
+dans un même processus.
+
+Chaque niveau de charge est mesuré sur un serveur neuf, après un parcours de
+préchauffage (sauf --froid). Sont rapportés: percentiles p50/p95/p99 de la
+latence des reruns, débit, CPU du processus serveur (100 % = un cœur plein)
+et sa mémoire résidente (RSS) maximale et finale, lues dans /proc (Linux).
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WIDGETS = ('selectbox', 'multiselect', 'slider', 'button')
+INTERVALLE_MESURE = 0.1
+DELAI_DEMARRAGE = 60
+
+
+def process_usage(pid):
+    """Temps CPU cumulé (s) et mémoire résidente (octets) d'un processus, d'après /proc"""
+    with open(f"/proc/{pid}/stat") as fichier:
+        # utime et stime, comptés après le nom du processus (entre parenthèses)
+        champs = fichier.read().rsplit(')', 1)[1].split()
+    cpu = (int(champs[11]) + int(champs[12])) / os.sysconf('SC_CLK_TCK')
+    with open(f"/proc/{pid}/statm") as fichier:
+        rss = int(fichier.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    return cpu, rss
+
+
+def start_server(port):
+    """Lance le dashboard sur port et attend qu'il réponde"""
+    serveur = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', 'Dashboard.py', '--server.headless', 'true',
+         '--server.port', str(port), '--server.fileWatcherType', 'none', '--browser.gatherUsageStats', 'false'],
+        cwd=RACINE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    limite = time.monotonic() + DELAI_DEMARRAGE
+    while time.monotonic() < limite:
+        try:
+            with urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1):
+                return serveur
+        except OSError:
+            time.sleep(0.2)
+    serveur.kill()
+    raise RuntimeError(f"Le serveur n'a pas démarré en {DELAI_DEMARRAGE} s")
+
+
+class Session:
+    """Client headless d'une session: état des widgets, page courante et reruns"""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.pages = {}
+        self.page = ''
+        self.widgets = {}
+        self.etats = {}
+
+    async def rerun(self):
+        """Demande un rerun et attend la fin du script: (durée en s, messages d'erreur)"""
+        message = BackMsg()
+        message.rerun_script.query_string = ''
+        message.rerun_script.page_script_hash = self.page
+        message.rerun_script.widget_states.widgets.extend(self.etats.values())
+        debut = time.perf_counter()
+        await self.websocket.send(message.SerializeToString())
+        widgets, erreurs = {}, []
+        while True:
+            reponse = ForwardMsg()
+            reponse.ParseFromString(await self.websocket.recv())
+            nature = reponse.WhichOneof('type')
+            if nature == 'navigation':
+                self.pages = {page.url_pathname: page.page_script_hash for page in reponse.navigation.app_pages}
+            elif nature == 'delta' and reponse.delta.WhichOneof('type') == 'new_element':
+                element = reponse.delta.new_element
+                type_element = element.WhichOneof('type')
+                if type_element in WIDGETS:
+                    widgets[getattr(element, type_element).label] = getattr(element, type_element)
+                elif type_element == 'exception':
+                    erreurs.append(f"{element.exception.type}: {element.exception.message}")
+            elif nature == 'script_finished' and reponse.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                break
+        duree = time.perf_counter() - debut
+        self.widgets = widgets
+        # Un bouton ne déclenche qu'un rerun
+        self.etats = {id_: etat for id_, etat in self.etats.items() if not etat.trigger_value}
+        return duree, erreurs
+
+    def switch_page(self, chemin):
+        self.page = self.pages[chemin]
+
+    def widget(self, label):
+        if label not in self.widgets:
+            raise LookupError(f"Widget introuvable: {label}")
+        return self.widgets[label]
+
+    def set_state(self, label, **valeur):
+        """Nouvel état du widget label, envoyé avec les suivants à chaque rerun (comme le navigateur)"""
+        etat = WidgetState(id=self.widget(label).id)
+        for champ, donnee in valeur.items():
+            if champ in ('string_array_value', 'double_array_value'):
+                getattr(etat, champ).data[:] = donnee
+            else:
+                setattr(etat, champ, donnee)
+        self.etats[etat.id] = etat
+
+
+def choose(rng, options):
+    return options[rng.integers(len(options))]
+
+
+def click_path():
+    """Parcours d'une session: (nom de l'étape, action(session, rng)), chaque action suivie d'un rerun"""
+    def selection(label):
+        return lambda s, rng: s.set_state(label, string_value=choose(rng, s.widget(label).options))
+
+    def curseur(label, minimum, maximum):
+        return lambda s, rng: s.set_state(label, double_array_value=[float(rng.integers(minimum, maximum + 1))])
+
+    return [
+        ("page vue d'ensemble", lambda s, rng: s.switch_page('')),
+        ("commune des séries", selection('Commune')),
+        ("page communes", lambda s, rng: s.switch_page('communes')),
+        ("filtre micro-région", selection('Micro-région:')),
+        ("détail commune", selection('Sélectionnez une commune:')),
+        ("page scénarios", lambda s, rng: s.switch_page('scenarios')),
+        ("curseur tourisme", curseur('Croissance touristique (%)', 0, 50)),
+        ("curseur stations", curseur('Nouvelles stations', 0, 20)),
+        ("page taxiteurs", lambda s, rng: s.switch_page('drivers')),
+        ("filtre taxiteurs", lambda s, rng: s.set_state(
+            'Micro-régions:', string_array_value=[choose(rng, s.widget('Micro-régions:').options)])),
+        ("page micro-régions", lambda s, rng: s.switch_page('microregions')),
+        ("détail micro-région", selection('Sélectionnez une micro-région:')),
+        ("page analyse avancée", lambda s, rng: s.switch_page('advanced')),
+        ("requête SQL", lambda s, rng: s.set_state('▶️ Exécuter', trigger_value=True)),
+    ]
+
+
+async def run_session(port, numero, parcours, pause, mesures, erreurs):
+    """Joue parcours fois le parcours de clics et ajoute (étape, latence en s) à mesures"""
+    rng = np.random.default_rng(numero)
+    async with websockets.connect(f"ws://localhost:{port}/_stcore/stream", subprotocols=['streamlit'],
+                                  origin=f"http://localhost:{port}", max_size=None) as websocket:
+        session = Session(websocket)
+        await session.rerun()
+        for _ in range(parcours):
+            for etape, action in click_path():
+                if pause:
+                    await asyncio.sleep(rng.exponential(pause))
+                try:
+                    action(session, rng)
+                except (LookupError, KeyError) as erreur:
+                    erreurs.append(f"{etape}: {erreur}")
+                    continue
+                duree, exceptions = await session.rerun()
+                mesures.append((etape, duree))
+                erreurs.extend(f"{etape}: {exception}" for exception in exceptions)
+
+
+async def run_sessions(port, sessions, parcours, pause, mesures, erreurs):
+    await asyncio.gather(*(run_session(port, numero, parcours, pause, mesures, erreurs)
+                           for numero in range(1, sessions + 1)))
+
+
+def measure_load(port, sessions, parcours, pause, froid):
+    """Mesure un niveau de charge sur un serveur neuf"""
+    serveur = start_server(port)
+    try:
+        if not froid:
+            asyncio.run(run_sessions(port, 1, 1, 0, [], []))
+
+        mesures, erreurs = [], []
+        echantillons = [process_usage(serveur.pid)]
+        fin = threading.Event()
+
+        def echantillonner():
+            while not fin.wait(INTERVALLE_MESURE):
+                echantillons.append(process_usage(serveur.pid))
+
+        echantillonneur = threading.Thread(target=echantillonner, daemon=True)
+        echantillonneur.start()
+        debut = time.perf_counter()
+        asyncio.run(run_sessions(port, sessions, parcours, pause, mesures, erreurs))
+        duree = time.perf_counter() - debut
+        fin.set()
+        echantillonneur.join()
+        echantillons.append(process_usage(serveur.pid))
+    finally:
+        serveur.terminate()
+        serveur.wait()
+
+    latences = np.array([latence for _, latence in mesures]) * 1000
+    par_etape = {}
+    for etape, latence in mesures:
+        par_etape.setdefault(etape, []).append(latence * 1000)
+    rss = [memoire for _, memoire in echantillons]
+    return {
+        'reruns': len(latences),
+        'p50': np.percentile(latences, 50),
+        'p95': np.percentile(latences, 95),
+        'p99': np.percentile(latences, 99),
+        'max': latences.max(),
+        'debit': len(latences) / duree,
+        'cpu': 100 * (echantillons[-1][0] - echantillons[0][0]) / duree,
+        'rss_max': max(rss),
+        'rss_fin': rss[-1],
+        'etapes': {etape: np.percentile(valeurs, 95) for etape, valeurs in par_etape.items()},
+        'erreurs': erreurs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--parcours', type=int, default=3, help="Parcours complets par session")
+    parser.add_argument('--pause', type=float, default=0.5, help="Pause moyenne entre deux actions (s)")
+    parser.add_argument('--port', type=int, default=8599)
+    parser.add_argument('--froid', action='store_true', help="Sans parcours de préchauffage")
+    parser.add_argument('--etapes', action='store_true', help="Détail du p95 par étape du parcours")
+    args = parser.parse_args()
+
+    print(f"{'sessions':>8}{'reruns':>8}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'max (ms)':>10}"
+          f"{'reruns/s':>10}{'CPU':>7}{'RSS max':>10}{'RSS fin':>10}")
+    for sessions in args.sessions:
+        m = measure_load(args.port, sessions, args.parcours, args.pause, args.froid)
+        print(f"{sessions:>8}{m['reruns']:>8}{m['p50']:>10.0f}{m['p95']:>10.0f}{m['p99']:>10.0f}{m['max']:>10.0f}"
+              f"{m['debit']:>10.1f}{m['cpu']:>6.0f}%{m['rss_max'] / 2**20:>7.0f} Mo{m['rss_fin'] / 2**20:>7.0f} Mo")
+        if args.etapes:
+            for etape, p95 in m['etapes'].items():
+                print(f"{'':>8}  {etape:<24} p95 {p95:8.0f} ms")
+        if m['erreurs']:
+            print(f"{'':>8}  {len(m['erreurs'])} erreurs, dont:")
+        for erreur in m['erreurs'][:3]:
+            print(f"{'':>8}  ! {erreur}")
+
+
+if __name__ == '__main__':
+    main()
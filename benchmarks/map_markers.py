@@ -0,0 +1,100 @@
+"""Coût de construction et de rendu de la carte selon le nombre de marqueurs.
+
+    python benchmarks/map_markers.py [--marqueurs 1000 10000]
+
+Compare la boucle historique (dictionnaires, iterrows, un Marker/Popup/Icon
+Folium par point) aux enregistrements vectorisés émis dans une seule couche.
+Les communes et stations sont dupliquées avec un léger décalage pour atteindre
+le nombre de marqueurs demandé (moitié communes, moitié stations).
+"""
+import argparse
+import os
+import sys
+import time
+
+import folium
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taxis_run.data import ReunionTaxiData  # noqa: E402
+from taxis_run.markers import MarkerLayer, commune_markers, station_markers  # noqa: E402
+
+
+def replicate(frame, n, rng):
+    """Réplique les lignes de frame jusqu'à n lignes, positions décalées aléatoirement"""
+    frame = frame.iloc[np.arange(n) % len(frame)].reset_index(drop=True)
+    frame['lat'] = frame['lat'] + rng.normal(0, 0.02, n)
+    frame['lon'] = frame['lon'] + rng.normal(0, 0.02, n)
+    return frame
+
+
+def legacy_map(communes_data, stations):
+    """Construction d'origine: un dictionnaire et un objet Marker par commune, iterrows pour les stations"""
+    couleurs = {'Élevé': 'green', 'Moyen': 'orange', 'Faible': 'red', 'Limitée': 'lightgray'}
+    m = folium.Map(location=[-21.115, 55.536], zoom_start=10)
+    for commune in communes_data:
+        popup_text = f"""
+        <b>{commune['nom']}</b><br>
+        Micro-région: {commune['micro_region']}<br>
+        Nombre de taxis: {commune['nombre_taxis']}<br>
+        Activité: {commune['taux_activite']}<br>
+        Demande journalière: {commune['demande_moyenne_journaliere']} courses<br>
+        Revenu moyen: {commune['revenu_moyen_mensuel']} €
+        """
+        folium.Marker(
+            [commune['lat'], commune['lon']],
+            popup=folium.Popup(popup_text, max_width=300),
+            tooltip=f"{commune['nom']} - {commune['nombre_taxis']} taxis",
+            icon=folium.Icon(color=couleurs.get(commune['taux_activite'], 'darkgray'), icon='taxi', prefix='fa')
+        ).add_to(m)
+    for _, station in stations.iterrows():
+        folium.Marker(
+            [station['lat'], station['lon']],
+            popup=folium.Popup(f"<b>{station['nom']}</b><br>{station['nombre_taxis']} taxis", max_width=200),
+            tooltip=f"{station['nom']}",
+            icon=folium.Icon(color='blue', icon='flag', prefix='fa')
+        ).add_to(m)
+    return m
+
+
+def layer_map(current_data, stations):
+    """Construction actuelle: enregistrements vectorisés, une couche par type de marqueur"""
+    m = folium.Map(location=[-21.115, 55.536], zoom_start=10)
+    MarkerLayer(commune_markers(current_data), max_width=300).add_to(m)
+    MarkerLayer(station_markers(stations), max_width=200).add_to(m)
+    return m
+
+
+def measure(construire, *args):
+    """(construction, rendu) en secondes et taille du HTML en octets"""
+    debut = time.perf_counter()
+    m = construire(*args)
+    construction = time.perf_counter() - debut
+    debut = time.perf_counter()
+    html = folium.Figure().add_child(m).render()
+    return construction, time.perf_counter() - debut, len(html.encode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--marqueurs', type=int, nargs='+', default=[1000, 10000])
+    args = parser.parse_args()
+
+    data = ReunionTaxiData(trace=False)
+    rng = np.random.default_rng(0)
+    print(f"{'marqueurs':>10} {'méthode':<12} {'construction':>13} {'rendu':>9} {'µs/marqueur':>12} {'HTML':>10}")
+    for n in args.marqueurs:
+        communes = replicate(data.current_data, n // 2, rng)
+        stations = replicate(data.taxi_stations_data, n - n // 2, rng)
+        communes_data = communes.astype({'nom': str, 'micro_region': str, 'taux_activite': str}) \
+            .to_dict(orient='records')
+        for methode, construire, args_carte in (('historique', legacy_map, (communes_data, stations)),
+                                                ('couche', layer_map, (communes, stations))):
+            construction, rendu, taille = measure(construire, *args_carte)
+            print(f"{n:>10} {methode:<12} {construction * 1000:>10.0f} ms {rendu * 1000:>6.0f} ms "
+                  f"{(construction + rendu) / n * 1e6:>12.1f} {taille / 1024:>7.0f} Ko")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""Budgets de performance par page sur un jeu de données agrandi (Streamlit AppTest, sans navigateur).
+
+    python benchmarks/page_budgets.py [--facteur 20] [--marge 1.0] [--page communes]
+
+Écrit dans un dossier temporaire un référentiel de facteur copies décalées
+des communes et stations intégrées (23 x facteur communes, 8 x facteur
+stations; historique et taxiteurs en sont dérivés au chargement), puis rend
+chaque page du dashboard via TAXIS_RUN_DATA_DIR et vérifie deux budgets:
+
+- le temps médian d'un rerun à chaud (caches remplis), multiplié par --marge
+  pour une machine plus lente;
+- le nombre d'éléments Streamlit émis, indépendant de la taille des données:
+  une boucle qui émet un élément par commune ou par ligne le fait exploser.
+
+Le code de sortie est non nul si un budget est dépassé ou si une page lève
+une exception, pour servir de garde-fou en intégration continue: un iterrows
+ou une copie complète remis dans un chemin critique fait échouer la
+vérification. Les mêmes budgets sont vérifiés par tests/test_page_budgets.py
+avec la commande de test habituelle.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taxis_run.data import ReunionTaxiData  # noqa: E402
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# page: (rerun à chaud médian en ms, éléments émis), pour --facteur 20
+BUDGETS = {
+    'overview': (1000, 80),
+    'communes': (600, 90),
+    'microregions': (600, 80),
+    'drivers': (800, 60),
+    'scenarios': (600, 80),
+    'advanced': (500, 60),
+    'about': (300, 60),
+}
+
+
+def scaled_sources(dossier, facteur, seed=0):
+    """Écrit communes.json et stations.csv agrandis facteur fois; retourne leurs nombres de lignes"""
+    rng = np.random.default_rng(seed)
+    data = ReunionTaxiData(trace=False)
+    communes = pd.DataFrame(data.communes_data)
+    stations = data.taxi_stations_data
+    copies_communes, copies_stations = [], []
+    for copie in range(facteur):
+        suffixe = '' if copie == 0 else f" {copie + 1}"
+        bloc = communes.copy()
+        bloc['nom'] = bloc['nom'] + suffixe
+        if copie:
+            bloc['lat'] += rng.normal(0, 0.01, len(bloc))
+            bloc['lon'] += rng.normal(0, 0.01, len(bloc))
+        copies_communes.append(bloc)
+        bloc = stations.copy()
+        bloc['nom'] = bloc['nom'] + suffixe
+        bloc['commune'] = bloc['commune'] + suffixe
+        copies_stations.append(bloc)
+    communes = pd.concat(copies_communes, ignore_index=True)
+    stations = pd.concat(copies_stations, ignore_index=True)
+    communes.to_json(os.path.join(dossier, 'communes.json'), orient='records', force_ascii=False)
+    stations.to_csv(os.path.join(dossier, 'stations.csv'), index=False)
+    return len(communes), len(stations)
+
+
+def count_elements(noeud):
+    """Nombre d'éléments feuilles sous un nœud de l'arbre AppTest"""
+    enfants = getattr(noeud, 'children', None)
+    if not enfants:
+        return 1
+    return sum(count_elements(enfant) for enfant in enfants.values())
+
+
+def measure_page(page, repetitions):
+    """(premier rendu en s, reruns à chaud en s, éléments émis, exceptions) d'une page"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(RACINE, 'Dashboard.py'), default_timeout=600)
+    debut = time.perf_counter()
+    at.switch_page(f"views/{page}.py").run()
+    froid = time.perf_counter() - debut
+    chauds = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        at.run()
+        chauds.append(time.perf_counter() - debut)
+    return froid, chauds, count_elements(at._tree), [exception.message for exception in at.exception]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--facteur', type=int, default=20, help="Multiplicateur des communes et stations")
+    parser.add_argument('--marge', type=float, default=1.0, help="Multiplicateur des budgets de temps")
+    parser.add_argument('--repetitions', type=int, default=5)
+    parser.add_argument('--page', nargs='+', choices=list(BUDGETS), default=list(BUDGETS))
+    args = parser.parse_args()
+
+    echecs = []
+    with tempfile.TemporaryDirectory() as dossier:
+        communes, stations = scaled_sources(dossier, args.facteur)
+        os.environ['TAXIS_RUN_DATA_DIR'] = dossier
+        print(f"{communes} communes, {stations} stations")
+        print(f"{'page':<14}{'froid (ms)':>12}{'chaud (ms)':>12}{'budget':>8}{'éléments':>10}{'budget':>8}")
+        for page in args.page:
+            froid, chauds, elements, exceptions = measure_page(page, args.repetitions)
+            chaud = statistics.median(chauds) * 1000
+            budget_temps, budget_elements = BUDGETS[page]
+            budget_temps *= args.marge
+            print(f"{page:<14}{froid * 1000:>12.0f}{chaud:>12.0f}{budget_temps:>8.0f}"
+                  f"{elements:>10}{budget_elements:>8}")
+            if chaud > budget_temps:
+                echecs.append(f"{page}: rerun à chaud {chaud:.0f} ms > {budget_temps:.0f} ms")
+            if elements > budget_elements:
+                echecs.append(f"{page}: {elements} éléments émis > {budget_elements}")
+            echecs.extend(f"{page}: exception {message}" for message in exceptions)
+
+    for echec in echecs:
+        print(f"ÉCHEC {echec}")
+    sys.exit(1 if echecs else 0)
+
+
+if __name__ == '__main__':
+    main()
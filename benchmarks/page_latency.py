@@ -0,0 +1,61 @@
+"""Latence à froid et à chaud de chaque page du dashboard (Streamlit AppTest, sans navigateur).
+
+    python benchmarks/page_latency.py [--repetitions 5]
+
+À froid: premier rendu de la page dans un processus neuf (imports, chargement
+des données, caches vides). À chaud: reruns suivants de la même page.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ['overview', 'communes', 'microregions', 'drivers', 'scenarios', 'advanced', 'about']
+
+
+def measure_page(page, repetitions):
+    """Mesure une page dans le processus courant: (froid, [chauds]) en secondes"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(RACINE, 'Dashboard.py'), default_timeout=600)
+    debut = time.perf_counter()
+    at.switch_page(f"views/{page}.py").run()
+    froid = time.perf_counter() - debut
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+
+    chauds = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        at.run()
+        chauds.append(time.perf_counter() - debut)
+    return froid, chauds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repetitions', type=int, default=5)
+    parser.add_argument('--page', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.page:
+        froid, chauds = measure_page(args.page, args.repetitions)
+        print(json.dumps({'froid': froid, 'chauds': chauds}))
+        return
+
+    print(f"{'page':<14}{'froid (ms)':>12}{'chaud médian (ms)':>20}{'chaud max (ms)':>16}")
+    for page in PAGES:
+        # Un processus par page pour que la mesure à froid ne profite d'aucun cache
+        sortie = subprocess.run([sys.executable, __file__, '--page', page, '--repetitions', str(args.repetitions)],
+                                capture_output=True, text=True, check=True, cwd=RACINE)
+        mesure = json.loads(sortie.stdout.strip().splitlines()[-1])
+        print(f"{page:<14}{mesure['froid'] * 1000:>12.0f}"
+              f"{statistics.median(mesure['chauds']) * 1000:>20.0f}{max(mesure['chauds']) * 1000:>16.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Agrégation en flux des journaux de service d'une année, mémoire bornée.
+
+    python benchmarks/shift_logs.py [--facteur 20] [--bloc 500000] [--dossier chemin]
+
+Écrit une année de services synthétiques (un fichier CSV par semaine, pour un
+registre de 1096 x facteur taxiteurs), puis compare l'agrégation en flux par
+blocs au chargement complet des journaux suivi d'un groupby. Le pic mémoire
+de chaque méthode est mesuré par tracemalloc (allocations Python et NumPy).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taxis_run.data import ReunionTaxiData  # noqa: E402
+from taxis_run.drivers import bracket_distribution, synthetic_driver_registry  # noqa: E402
+from taxis_run.shifts import (ORIGINE, SEMAINE, WeeklyHoursAccumulator, read_shift_chunks,  # noqa: E402
+                              shift_log_files, stream_weekly_hours, synthetic_shift_chunks)
+
+
+def write_logs(dossier, drivers):
+    """Une année de services, un fichier par semaine"""
+    os.makedirs(dossier, exist_ok=True)
+    for semaine, bloc in enumerate(synthetic_shift_chunks(drivers, '2025-01-06')):
+        bloc.to_csv(os.path.join(dossier, f"services_{semaine:02d}.csv"), index=False)
+    return shift_log_files(dossier)
+
+
+def streamed(fichiers, taille_bloc):
+    accumulateur = WeeklyHoursAccumulator()
+    for _ in stream_weekly_hours(read_shift_chunks(fichiers, taille_bloc), accumulateur):
+        pass
+    return accumulateur.distribution(), accumulateur.services
+
+
+def loaded_whole(fichiers):
+    """Référence: tous les journaux en mémoire (sans répartition des services à cheval sur deux semaines)"""
+    services = pd.concat([pd.read_csv(f, parse_dates=['debut', 'fin']) for f in fichiers], ignore_index=True)
+    services['semaine'] = (services['debut'] - ORIGINE) // SEMAINE
+    services['heures'] = (services['fin'] - services['debut']) / pd.Timedelta('1h')
+    hebdo = services.groupby(['id_taxiteur', 'semaine'])['heures'].sum()
+    return bracket_distribution(hebdo.groupby(level=0).mean(), 'heures_hebdo'), len(services)
+
+
+def measure(fonction, *args):
+    tracemalloc.start()
+    debut = time.perf_counter()
+    resultat = fonction(*args)
+    duree = time.perf_counter() - debut
+    pic = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return resultat, duree, pic
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--facteur', type=int, default=20, help="Multiplicateur du registre de taxiteurs")
+    parser.add_argument('--bloc', type=int, default=500_000, help="Services par bloc lu")
+    parser.add_argument('--dossier', help="Dossier des journaux (temporaire par défaut)")
+    args = parser.parse_args()
+
+    data = ReunionTaxiData(trace=False)
+    drivers = synthetic_driver_registry(data.communes_data, facteur=args.facteur)
+    with tempfile.TemporaryDirectory() as temporaire:
+        dossier = args.dossier or temporaire
+        fichiers = write_logs(dossier, drivers)
+        taille = sum(os.path.getsize(f) for f in fichiers)
+        print(f"{len(drivers)} taxiteurs, {len(fichiers)} fichiers, {taille / 2**20:.0f} Mo de journaux")
+        print(f"{'méthode':<12} {'services':>10} {'durée':>8} {'pic mémoire':>12}")
+        distributions = {}
+        for methode, fonction, args_methode in (('flux', streamed, (fichiers, args.bloc)),
+                                                ('complet', loaded_whole, (fichiers,))):
+            (distributions[methode], services), duree, pic = measure(fonction, *args_methode)
+            print(f"{methode:<12} {services:>10} {duree:>7.1f}s {pic / 2**20:>9.0f} Mo")
+        print(pd.DataFrame({methode: d.set_index('categorie')['effectif'] for methode, d in distributions.items()}))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Couche de données et de calcul du dashboard Taxis & Taxiteurs - Île de la Réunion"""
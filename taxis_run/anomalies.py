@@ -0,0 +1,108 @@
+"""Détection des valeurs anormales dans les séries historiques des communes.
+
+Toutes les séries commune x indicateur sont traitées en une fois, comme les
+colonnes d'une matrice large temps x séries: les statistiques glissantes sur
+les fenetre périodes précédentes sont obtenues par différences de sommes
+cumulées (un passage, quelle que soit la largeur de la fenêtre), sans boucle
+par commune.
+
+Deux scores:
+- 'zscore': écart à la moyenne glissante divisé par l'écart type glissant;
+- 'mad' (par défaut): écart à la moyenne glissante divisé par l'écart absolu
+  médian de ces écarts sur toute la série (x 1.4826), robuste aux pics
+  eux-mêmes.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+METRIQUES = ('nombre_taxis', 'demande_moyenne_journaliere')
+SEUILS = {'zscore': 3.0, 'mad': 3.5}
+LIBELLES_METRIQUES = {'nombre_taxis': 'taxis', 'demande_moyenne_journaliere': 'demande'}
+# Facteur rendant l'écart absolu médian comparable à un écart type (loi normale)
+FACTEUR_MAD = 1.4826
+
+
+def wide_matrix(historique, metriques=METRIQUES):
+    """Matrice temps x (commune, indicateur) en float64, NaN pour les périodes manquantes"""
+    i_date, dates = pd.factorize(historique['date'], sort=True)
+    communes = historique['commune'].astype('category')
+    i_commune = communes.cat.codes.to_numpy()
+    n_communes = len(communes.cat.categories)
+    matrice = np.full((len(dates), n_communes * len(metriques)), np.nan)
+    for k, metrique in enumerate(metriques):
+        matrice[i_date, k * n_communes + i_commune] = historique[metrique].to_numpy(dtype='float64')
+    colonnes = pd.MultiIndex.from_product([metriques, communes.cat.categories.astype(str)],
+                                          names=['metrique', 'commune'])
+    return pd.DatetimeIndex(dates), colonnes, matrice
+
+
+def trailing_stats(matrice, fenetre, min_periodes=2):
+    """Moyenne et écart type des fenetre périodes précédant chaque ligne (NaN si trop peu de valeurs)"""
+    # Centrage par colonne: limite les pertes de précision de la variance par sommes cumulées
+    centre = np.nanmean(matrice, axis=0)
+    valeurs = matrice - centre
+    presentes = ~np.isnan(valeurs)
+    valeurs = np.where(presentes, valeurs, 0)
+
+    def somme_glissante(x):
+        cumul = np.zeros((len(x) + 1, x.shape[1]))
+        np.cumsum(x, axis=0, out=cumul[1:])
+        debut = np.maximum(np.arange(len(x)) - fenetre, 0)
+        return cumul[np.arange(len(x))] - cumul[debut]
+
+    n = somme_glissante(presentes.astype('float64'))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        moyenne = somme_glissante(valeurs) / n
+        variance = np.maximum(somme_glissante(valeurs ** 2) / n - moyenne ** 2, 0) * n / (n - 1)
+    insuffisant = n < min_periodes
+    moyenne[insuffisant] = np.nan
+    variance[insuffisant] = np.nan
+    return moyenne + centre, np.sqrt(variance)
+
+
+def anomaly_scores(matrice, fenetre=3, methode='mad', min_periodes=2):
+    """Scores (même forme que matrice) et valeurs de référence (moyenne glissante)"""
+    if methode not in SEUILS:
+        raise ValueError(f"Méthode inconnue: {methode}")
+    reference, ecart_type = trailing_stats(matrice, fenetre, min_periodes)
+    ecarts = matrice - reference
+    if methode == 'zscore':
+        echelle = ecart_type
+    else:
+        with warnings.catch_warnings():
+            # Séries sans aucune période évaluable: échelle NaN, donc aucun signalement
+            warnings.simplefilter('ignore', RuntimeWarning)
+            echelle = FACTEUR_MAD * np.nanmedian(np.abs(ecarts), axis=0, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scores = ecarts / np.maximum(echelle, 1e-12)
+    return scores, reference
+
+
+def detect_anomalies(historique, fenetre=3, methode='mad', seuil=None, metriques=METRIQUES):
+    """Valeurs anormales de l'historique: une ligne par (date, commune, indicateur), par score décroissant"""
+    seuil = SEUILS[methode] if seuil is None else seuil
+    dates, colonnes, matrice = wide_matrix(historique, metriques)
+    with np.errstate(invalid='ignore'):
+        scores, reference = anomaly_scores(matrice, fenetre, methode)
+    lignes, series = np.nonzero(np.abs(np.nan_to_num(scores)) > seuil)
+    anomalies = pd.DataFrame({
+        'date': dates[lignes],
+        'commune': colonnes.get_level_values('commune')[series],
+        'metrique': colonnes.get_level_values('metrique')[series],
+        'valeur': matrice[lignes, series],
+        'reference': reference[lignes, series],
+        'score': scores[lignes, series],
+    })
+    anomalies['ecart_pct'] = (anomalies['valeur'] / anomalies['reference'] - 1) * 100
+    return anomalies.iloc[np.argsort(-np.abs(anomalies['score'].to_numpy()), kind='stable')].reset_index(drop=True)
+
+
+def latest_alerts(anomalies, date):
+    """Alertes de la période date par commune: {commune: 'demande +35% (score 4.2); ...'}"""
+    recentes = anomalies[anomalies['date'] == date]
+    libelles = recentes['metrique'].map(LIBELLES_METRIQUES).fillna(recentes['metrique']) + ' ' \
+        + recentes['ecart_pct'].map('{:+.0f}%'.format) + ' (score ' + recentes['score'].map('{:.1f}'.format) + ')'
+    return libelles.groupby(recentes['commune'].to_numpy()).agg('; '.join).to_dict()
+
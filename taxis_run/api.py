@@ -0,0 +1,405 @@
+"""API JSON locale exposant les agrégats du dashboard, sans Streamlit.
+
+Lancement:
+
+    python -m taxis_run.api --port 8600
+
+Les réponses sont sérialisées une seule fois puis conservées dans un cache LRU
+en mémoire (corps brut, corps gzip et l'ETag de chacun), indexé par le jeton
+de version des seules données lues par la route. Les clients qui acceptent
+gzip reçoivent la version compressée, sous un ETag distinct de la version
+brute (deux codages, deux validateurs forts); ceux qui renvoient l'ETag de la
+version qu'ils recevraient dans If-None-Match reçoivent un 304 sans corps. Un signal SIGHUP recharge les fichiers sources: seules les réponses
+dont les données ont changé sont recalculées.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import math
+import signal
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from taxis_run.coverage import compute_coverage_grid
+from taxis_run.data import ReunionTaxiData, sources_from_directory
+from taxis_run.placement import optimize_station_placement
+from taxis_run.scenarios import project_simulator
+from taxis_run.simulation import build_simulation_model, run_replications
+from taxis_run.versioning import ArtifactCache
+
+logger = logging.getLogger('taxis_run.api')
+
+TAILLE_MIN_GZIP = 512
+# Simulations non mises en cache exécutées en même temps (au-delà: 503)
+SIMULATIONS_SIMULTANEES = 2
+
+# Route -> composants des données lus (None: réponse jamais mise en cache)
+ROUTE_COMPOSANTS = {
+    '/api': (),
+    '/api/communes': ('communes', 'stations'),
+    '/api/microregions': ('communes', 'stations'),
+    '/api/stations': ('stations',),
+    '/api/historique': ('historique',),
+    '/api/simulateur': ('communes', 'stations', 'simulateur'),
+    '/api/simulation': ('communes', 'stations', 'simulateur'),
+    '/api/version': None,
+    '/api/cache': None,
+}
+
+
+class ApiError(Exception):
+    """Erreur renvoyée au client avec son code HTTP"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class CachedResponse:
+    """Réponse sérialisée prête à l'envoi"""
+    __slots__ = ('body', 'gzip_body', 'etag', 'gzip_etag')
+
+    def __init__(self, body):
+        self.body = body
+        self.gzip_body = gzip.compress(body, compresslevel=6) if len(body) >= TAILLE_MIN_GZIP else None
+        empreinte = hashlib.sha1(body).hexdigest()[:20]
+        self.etag = f'"{empreinte}"'
+        self.gzip_etag = f'"{empreinte}-gzip"'
+
+    def representation(self, accepte_gzip):
+        """(corps, ETag, codage) de la version envoyée selon Accept-Encoding"""
+        if accepte_gzip and self.gzip_body is not None:
+            return self.gzip_body, self.gzip_etag, 'gzip'
+        return self.body, self.etag, None
+
+
+class ResponseCache:
+    """Cache LRU thread-safe des réponses, indexé par chemin et paramètres normalisés"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, key, response):
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def entries(self):
+        """Entrées du cache: route, paramètres, version et tailles"""
+        with self._lock:
+            return [{
+                'route': path,
+                'parametres': dict(params),
+                'version': version,
+                'octets': len(response.body),
+                'octets_gzip': len(response.gzip_body) if response.gzip_body is not None else None,
+            } for (path, params, version), response in self._entries.items()]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _json_default(valeur):
+    """Convertit les scalaires NumPy/pandas pour json.dumps"""
+    if hasattr(valeur, 'isoformat'):
+        return valeur.isoformat()
+    if hasattr(valeur, 'item'):
+        return valeur.item()
+    return str(valeur)
+
+
+def _finite(valeur):
+    """Remplace récursivement NaN, infinis, NaT et NA par None (JSON n'a pas de NaN)"""
+    if isinstance(valeur, dict):
+        return {cle: _finite(v) for cle, v in valeur.items()}
+    if isinstance(valeur, (list, tuple)):
+        return [_finite(v) for v in valeur]
+    if isinstance(valeur, (float, np.floating)):
+        return float(valeur) if math.isfinite(valeur) else None
+    if valeur is pd.NaT or valeur is pd.NA:
+        return None
+    return valeur
+
+
+def _to_json_bytes(payload):
+    """Sérialise un DataFrame (liste d'enregistrements) ou un dict en JSON UTF-8 strict"""
+    if isinstance(payload, pd.DataFrame):
+        return payload.to_json(orient='records', date_format='iso', force_ascii=False).encode('utf-8')
+    return json.dumps(_finite(payload), ensure_ascii=False, default=_json_default, allow_nan=False).encode('utf-8')
+
+
+def _date_param(params, nom):
+    """Lit un paramètre date optionnel de la requête"""
+    if nom not in params:
+        return None
+    try:
+        return pd.Timestamp(params[nom])
+    except ValueError:
+        raise ApiError(400, "Dates 'debut'/'fin' invalides (format AAAA-MM-JJ attendu)")
+
+
+def _int_param(params, nom, defaut, minimum, maximum):
+    """Lit un paramètre entier borné de la requête"""
+    valeur = params.get(nom, defaut)
+    try:
+        valeur = int(valeur)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"Paramètre '{nom}' invalide: entier attendu")
+    if not minimum <= valeur <= maximum:
+        raise ApiError(400, f"Paramètre '{nom}' hors bornes [{minimum}, {maximum}]")
+    return valeur
+
+
+class TaxiApi:
+    """Routes de l'API au-dessus de la couche de données du dashboard"""
+
+    def __init__(self, data=None):
+        self.data = data if data is not None else ReunionTaxiData()
+        self.artefacts = ArtifactCache()
+        self.response_cache = None
+        self.simulations = threading.BoundedSemaphore(SIMULATIONS_SIMULTANEES)
+        self.routes = {
+            '/api': self.index,
+            '/api/communes': self.communes,
+            '/api/microregions': self.microregions,
+            '/api/stations': self.stations,
+            '/api/historique': self.historique,
+            '/api/simulateur': self.simulateur,
+            '/api/simulation': self.simulation,
+            '/api/version': self.version,
+            '/api/cache': self.cache,
+        }
+
+    def reload(self, data):
+        """Remplace la couche de données; les caches se réindexent sur sa version"""
+        self.data = data
+
+    def cache_key(self, data, path, params):
+        """Clé de cache d'une requête (None si la réponse ne doit pas être mise en cache)"""
+        path = path.rstrip('/') or '/api'
+        composants = ROUTE_COMPOSANTS.get('/api/communes' if path.startswith('/api/communes/') else path, ())
+        if composants is None:
+            return None
+        annees = None
+        if path == '/api/historique' and ('debut' in params or 'fin' in params):
+            # Seules les partitions annuelles de l'intervalle entrent dans la version
+            debut, fin = (_date_param(params, nom) for nom in ('debut', 'fin'))
+            annees = data.version.history_years(debut, fin)
+        version = data.version.token(*composants, annees=annees) if composants else 'statique'
+        return path, tuple(sorted(params.items())), version
+
+    def handle(self, data, path, params):
+        """Retourne la charge utile (DataFrame ou dict) d'une route pour un état des données"""
+        path = path.rstrip('/') or '/api'
+        if path.startswith('/api/communes/'):
+            return self.commune(data, unquote(path[len('/api/communes/'):]))
+        route = self.routes.get(path)
+        if route is None:
+            raise ApiError(404, f"Route inconnue: {path}")
+        return route(data, params)
+
+    def index(self, data, params):
+        return {'routes': sorted(self.routes) + ['/api/communes/<nom>']}
+
+    def version(self, data, params):
+        return {'version': data.version.token(), 'composants': data.version.composants,
+                'partitions_historique': data.version.partitions}
+
+    def cache(self, data, params):
+        return {
+            'reponses': self.response_cache.entries() if self.response_cache is not None else [],
+            'artefacts': self.artefacts.entries().to_dict(orient='records'),
+        }
+
+    def communes(self, data, params):
+        communes = data.current_data
+        if 'micro_region' in params:
+            communes = communes[communes['micro_region'] == params['micro_region']]
+        if 'niveau' in params:
+            communes = communes[communes['taux_activite'] == params['niveau']]
+        return communes
+
+    def commune(self, data, nom):
+        commune = data.current_data[data.current_data['nom'] == nom]
+        if commune.empty:
+            raise ApiError(404, f"Commune inconnue: {nom}")
+        return commune.iloc[0].to_dict()
+
+    def microregions(self, data, params):
+        return data.microregion_data
+
+    def stations(self, data, params):
+        return data.taxi_stations_data
+
+    def historique(self, data, params):
+        historique = data.historical_data
+        masque = pd.Series(True, index=historique.index)
+        if 'commune' in params:
+            masque &= historique['commune'] == params['commune']
+        if 'micro_region' in params:
+            masque &= historique['micro_region'] == params['micro_region']
+        debut, fin = _date_param(params, 'debut'), _date_param(params, 'fin')
+        if debut is not None:
+            masque &= historique['date'] >= debut
+        if fin is not None:
+            masque &= historique['date'] <= fin
+        return historique[masque]
+
+    def placement(self, data):
+        """Placement optimal des nouvelles stations, calculé une fois par version des données"""
+        def calcul():
+            grid = compute_coverage_grid(data.current_data, data.taxi_stations_data, 500)
+            return optimize_station_placement(grid, data.current_data, 50)
+        return self.artefacts.get_or_compute(
+            'placement_stations', data.version.token('communes', 'stations', 'simulateur'), calcul, (500, 50))
+
+    def simulateur(self, data, params):
+        nouvelles_stations = _int_param(params, 'nouvelles_stations', 8, 0, 50)
+        placement = self.placement(data).head(nouvelles_stations)
+        projection = project_simulator(
+            data.current_data, placement,
+            _int_param(params, 'croissance_tourisme', 20, 0, 50),
+            _int_param(params, 'taux_digitalisation', 60, 0, 100),
+            nouvelles_stations,
+        )
+        projection['emplacements'] = placement.to_dict(orient='records')
+        return projection
+
+    def simulation(self, data, params):
+        model = build_simulation_model(
+            data.current_data, data.taxi_stations_data,
+            _int_param(params, 'flotte', 100, 50, 150) / 100,
+            _int_param(params, 'demande', 100, 50, 200) / 100,
+        )
+        replications = _int_param(params, 'replications', 4, 1, 32)
+        # Réplications sur le pool de processus partagé; les requêtes en excès sont refusées, pas empilées
+        if not self.simulations.acquire(blocking=False):
+            raise ApiError(503, "Trop de simulations en cours, réessayez plus tard")
+        try:
+            return run_replications(model, replications, seed=0)
+        finally:
+            self.simulations.release()
+
+
+def make_handler(api, cache):
+    """Construit la classe de gestionnaire HTTP liée à une API et à son cache"""
+
+    class TaxiApiHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        server_version = 'TaxisRUN-API'
+        # En-têtes et corps partent en deux écritures: sans TCP_NODELAY, Nagle et
+        # l'ACK retardé du client ajoutent ~40 ms à chaque réponse keep-alive
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            params = {cle: valeurs[-1] for cle, valeurs in parse_qs(url.query).items()}
+            # Un seul état des données par requête, même si un rechargement survient pendant
+            data = api.data
+
+            try:
+                cle = api.cache_key(data, url.path, params)
+                response = cache.get(cle) if cle is not None else None
+                if response is None:
+                    response = CachedResponse(_to_json_bytes(api.handle(data, url.path, params)))
+                    if cle is not None:
+                        cache.put(cle, response)
+            except ApiError as erreur:
+                self._send(erreur.status, _to_json_bytes({'erreur': erreur.message}))
+                return
+            except Exception:
+                # Toujours une réponse: sinon le client ne voit qu'une connexion keep-alive coupée
+                logger.exception("Erreur sur %s", self.path)
+                self._send(500, _to_json_bytes({'erreur': "Erreur interne du serveur"}))
+                return
+
+            accepte_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+            corps, etag, encoding = response.representation(accepte_gzip)
+            if etag in (tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')):
+                self._send(304, b'', etag=etag)
+                return
+            self._send(200, corps, etag=etag, encoding=encoding)
+
+        def _send(self, status, body, etag=None, encoding=None):
+            self.send_response(status)
+            if status != 304:
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Vary', 'Accept-Encoding')
+            if etag:
+                self.send_header('ETag', etag)
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            if self.server.verbose:
+                super().log_message(format, *args)
+
+    return TaxiApiHandler
+
+
+def create_server(host='127.0.0.1', port=8600, api=None, cache_size=1024, verbose=False):
+    """Crée le serveur HTTP multi-thread de l'API"""
+    api = api if api is not None else TaxiApi()
+    api.response_cache = ResponseCache(cache_size)
+    server = ThreadingHTTPServer((host, port), make_handler(api, api.response_cache))
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API JSON locale du dashboard Taxis Réunion")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--cache-size', type=int, default=1024)
+    parser.add_argument('--data-dir', help="Dossier des fichiers sources (communes, stations, historique)")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    api = TaxiApi(ReunionTaxiData(sources_from_directory(args.data_dir)))
+    server = create_server(args.host, args.port, api=api, cache_size=args.cache_size, verbose=args.verbose)
+    if hasattr(signal, 'SIGHUP'):
+        def recharger(signum, frame):
+            threading.Thread(target=lambda: api.reload(ReunionTaxiData(sources_from_directory(args.data_dir))),
+                             daemon=True).start()
+        signal.signal(signal.SIGHUP, recharger)
+    print(f"API Taxis Réunion sur http://{args.host}:{args.port}/api")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""Choix du moteur de rendu des graphiques Plotly.
+
+Les nuages de points et courbes en SVG créent un nœud DOM par point: au-delà
+de quelques milliers de points (niveau zone ou course), le navigateur se fige.
+Les traces WebGL (Scattergl) dessinent tout dans un seul canevas; elles sont
+utilisées automatiquement au-delà de SEUIL_WEBGL points, le SVG (plus net et
+exportable) restant la règle pour les petits graphiques.
+
+Avant envoi, les figures sont compactées: valeurs arrondies à la précision
+d'affichage (relative à l'ordre de grandeur de chaque série) et stockées dans le plus petit type de tableau typé exact, dates
+sans heure, gabarit réduit aux seuls éléments utilisés par la figure.
+
+Les figures d'une vue sont indépendantes: FigureFactory les construit
+ensemble dans un pool de processus (la construction Plotly est du Python pur,
+des threads la sérialiseraient sur le GIL), puis les rend dans l'ordre de
+déclaration. La latence d'une vue est alors celle de sa figure la plus lente.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+SEUIL_WEBGL = 2000
+
+
+def render_mode(n_points, seuil=SEUIL_WEBGL):
+    """Mode de rendu Plotly Express pour n_points: 'webgl' au-delà du seuil, 'svg' sinon"""
+    return 'webgl' if n_points > seuil else 'svg'
+
+
+# Attributs de trace portant des tableaux de valeurs
+ATTRIBUTS_TABLEAUX = ('x', 'y', 'z', 'values', 'marker.size')
+DECIMALES_AFFICHAGE = 2
+# Chiffres significatifs conservés pour les séries de petite amplitude (taux, ratios par habitant)
+CHIFFRES_SIGNIFICATIFS = 4
+TYPES_ENTIERS = ('int8', 'uint8', 'int16', 'uint16', 'int32')
+
+
+def compact_array(valeurs, decimales=DECIMALES_AFFICHAGE):
+    """Tableau réduit à la précision d'affichage, dans le plus petit type exact.
+
+    Les flottants sont arrondis à decimales décimales au moins, davantage si
+    la série est petite (sa plus grande valeur absolue garde
+    CHIFFRES_SIGNIFICATIFS chiffres significatifs: 0.00123 n'est pas ramené à
+    0), et passent en entiers s'ils le sont tous; les entiers prennent le plus
+    petit type qui les contient (tableaux typés plus courts); les dates à
+    minuit sont écrites sans heure. Les autres valeurs sont retournées telles
+    quelles.
+    """
+    tableau = np.asarray(valeurs)
+    if tableau.ndim != 1 or tableau.size == 0:
+        return valeurs
+    if tableau.dtype.kind == 'M':
+        jours = tableau.astype('datetime64[D]')
+        return np.datetime_as_string(jours, unit='D').astype(object) if (tableau == jours).all() else valeurs
+    if tableau.dtype.kind == 'f':
+        if not np.isfinite(tableau).all():
+            return valeurs
+        amplitude = np.abs(tableau).max()
+        if amplitude > 0:
+            decimales = max(decimales, CHIFFRES_SIGNIFICATIFS - 1 - int(np.floor(np.log10(amplitude))))
+        tableau = np.round(tableau, decimales)
+        if not (tableau == np.round(tableau)).all():
+            return tableau
+    elif tableau.dtype.kind not in 'iu':
+        return valeurs
+    minimum, maximum = tableau.min(), tableau.max()
+    for dtype in TYPES_ENTIERS:
+        limites = np.iinfo(dtype)
+        if limites.min <= minimum and maximum <= limites.max:
+            return tableau.astype(dtype)
+    return tableau
+
+
+def trim_template(fig):
+    """Réduit le gabarit embarqué aux types de traces présents et aux échelles de couleur utilisées"""
+    gabarit = fig.layout.template.to_plotly_json()
+    types = {trace.type for trace in fig.data}
+    layout = dict(gabarit.get('layout', {}))
+    if not fig.layout.coloraxis.to_plotly_json():
+        layout.pop('colorscale', None)
+        layout.pop('coloraxis', None)
+    fig.layout.template = {
+        'data': {nom: traces for nom, traces in gabarit.get('data', {}).items() if nom in types},
+        'layout': layout,
+    }
+    return fig
+
+
+def compact_figure(fig, decimales=DECIMALES_AFFICHAGE):
+    """Réduit la charge utile d'une figure avant envoi au navigateur (modifie la figure)"""
+    for trace in fig.data:
+        for attribut in ATTRIBUTS_TABLEAUX:
+            parent, _, nom = attribut.rpartition('.')
+            objet = trace[parent] if parent else trace
+            if nom in objet and objet[nom] is not None:
+                objet[nom] = compact_array(objet[nom], decimales)
+    return trim_template(fig)
+
+
+def figure_bytes(fig):
+    """Taille en octets de la figure telle que sérialisée pour le navigateur"""
+    return len(pio.to_json(fig, validate=False).encode('utf-8'))
+
+
+def add_anomaly_markers(fig, anomalies, metrique):
+    """Superpose les valeurs anormales de l'indicateur à la courbe"""
+    points = anomalies[anomalies['metrique'] == metrique]
+    if len(points):
+        fig.add_scatter(x=points['date'], y=points['valeur'], mode='markers', name='Anomalie',
+                        marker=dict(color='red', size=11, symbol='x'),
+                        customdata=points['score'], hovertemplate='%{x|%Y}: %{y:.0f} (score %{customdata:.1f})')
+
+
+def build_figure(constructeur, args=(), kwargs=None, layout=None, finitions=()):
+    """Construit, complète, met en page et compacte une figure: (dictionnaire de la figure, octets émis).
+
+    finitions: [(fonction, *args)], appelées fonction(fig, *args) après la construction.
+    """
+    fig = constructeur(*args, **(kwargs or {}))
+    for fonction, *arguments in finitions:
+        fonction(fig, *arguments)
+    if layout:
+        fig.update_layout(**layout)
+    compact_figure(fig)
+    return fig.to_dict(), figure_bytes(fig)
+
+
+def _warm_up():
+    """Importe Plotly Express dans un processus du pool avant la première vue"""
+    import plotly.express  # noqa: F401
+
+
+class FigureFactory:
+    """Construction concurrente des figures d'une vue dans un pool de processus.
+
+    Une figure est décrite par (constructeur, args, kwargs, layout, finitions):
+    une fonction Plotly Express, ses arguments (DataFrames compris, transmis
+    par pickle), la mise en page et les compléments appliqués ensuite, tous
+    importables depuis un module (pas de lambda). Avec un seul processus
+    (machine à un cœur) les figures sont construites sur place, sans pool.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or int(os.environ.get('TAXIS_RUN_FIGURE_WORKERS') or os.cpu_count() or 1)
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def pool(self):
+        """Pool de processus, créé au premier lot et préchauffé"""
+        with self._lock:
+            if self._pool is None:
+                # spawn: pas de fork d'un serveur qui a déjà des threads
+                self._pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context('spawn'))
+                for _ in range(self.max_workers):
+                    self._pool.submit(_warm_up)
+            return self._pool
+
+    def build(self, specs):
+        """Figures des specs, construites ensemble et rendues dans l'ordre: [(go.Figure, octets)]"""
+        if self.max_workers < 2 or len(specs) < 2:
+            resultats = [build_figure(*spec) for spec in specs]
+        else:
+            try:
+                futures = [self.pool().submit(build_figure, *spec) for spec in specs]
+                resultats = [future.result() for future in futures]
+            except BrokenProcessPool:
+                # Processus tué (mémoire...): pool recréé au lot suivant, ce lot construit sur place
+                self.shutdown()
+                resultats = [build_figure(*spec) for spec in specs]
+        # Figures déjà validées par leur constructeur: pas de seconde validation
+        return [(go.Figure(figure, _validate=False), taille) for figure, taille in resultats]
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
@@ -0,0 +1,131 @@
+"""Moteurs de calcul des agrégations: pandas (par défaut) ou Polars.
+
+Les vues et la couche de données passent par la même petite interface:
+filtres d'égalité, top n, sommes groupées (éventuellement par année) et
+agrégations nommées. Entrées et sorties sont des DataFrames pandas, dans le
+même ordre de lignes quel que soit le moteur.
+
+Le moteur Polars construit des requêtes paresseuses (LazyFrame): le
+planificateur ne lit que les colonnes utiles, pousse les filtres avant les
+agrégations et exécute chaque requête sur tous les cœurs. Chaque DataFrame
+source n'est converti qu'une fois (tant qu'il existe). Polars est une
+dépendance optionnelle: le moteur est choisi par TAXIS_RUN_BACKEND
+(pandas ou polars).
+"""
+import os
+import threading
+import weakref
+
+import pandas as pd
+
+MOTEURS = ('pandas', 'polars')
+AGREGATIONS = ('sum', 'mean', 'size')
+
+
+class PandasBackend:
+    """Agrégations pandas (moteur par défaut)"""
+
+    nom = 'pandas'
+
+    def filter_eq(self, frame, colonne, valeur):
+        """Lignes où colonne == valeur"""
+        return frame[frame[colonne] == valeur]
+
+    def top_n(self, frame, colonne, n):
+        """n lignes de plus grande valeur de colonne (ordre d'origine en cas d'égalité)"""
+        return frame.nlargest(n, colonne)
+
+    def group_sum(self, frame, cles, mesures, annuel=False):
+        """Sommes des mesures par clés, triées par clés; annuel: la clé 'date' est ramenée à l'année"""
+        groupes = [frame['date'].dt.year if annuel and cle == 'date' else cle for cle in cles]
+        return frame.groupby(groupes, observed=True)[list(mesures)].sum().reset_index()
+
+    def group_agg(self, frame, cle, agregations):
+        """Agrégations nommées par clé: {sortie: (colonne, 'sum' | 'mean' | 'size')}, triées par clé"""
+        return frame.groupby(cle, sort=True, observed=True).agg(**agregations)
+
+
+class PolarsBackend:
+    """Agrégations Polars sur des requêtes paresseuses, multithreadées"""
+
+    nom = 'polars'
+
+    def __init__(self):
+        import polars
+
+        self.pl = polars
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def lazy(self, frame):
+        """LazyFrame d'un DataFrame pandas, converti une seule fois tant que le DataFrame existe"""
+        cle = id(frame)
+        with self._lock:
+            entree = self._frames.get(cle)
+            if entree is not None and entree[0]() is frame:
+                return entree[1]
+        paresseux = self.pl.from_pandas(frame).lazy()
+        with self._lock:
+            self._frames[cle] = (weakref.ref(frame), paresseux)
+        weakref.finalize(frame, self._frames.pop, cle, None)
+        return paresseux
+
+    def _pandas(self, resultat, source, cles=()):
+        """Résultat en pandas, colonnes catégorielles rétablies comme dans la source, trié par clés
+
+        Les catégories reviennent de Polars dans l'ordre de première
+        apparition; astype ne les réordonne pas (deux catégorielles non
+        ordonnées de mêmes valeurs sont égales), d'où la reconstruction, qui
+        rétablit aussi le tri par code de la source.
+        """
+        resultat = resultat.to_pandas()
+        for colonne in resultat.columns:
+            if colonne in source.columns and isinstance(source[colonne].dtype, pd.CategoricalDtype):
+                resultat[colonne] = pd.Categorical(resultat[colonne], dtype=source[colonne].dtype)
+        if cles:
+            resultat = resultat.sort_values(list(cles), kind='stable', ignore_index=True)
+        return resultat
+
+    def _rows(self, requete, source):
+        """Lignes sélectionnées par requete (sur source numérotée), avec leur index d'origine"""
+        resultat = requete.collect()
+        lignes = resultat['_ligne'].to_numpy()
+        resultat = self._pandas(resultat.drop('_ligne'), source)
+        resultat.index = source.index[lignes]
+        return resultat
+
+    def filter_eq(self, frame, colonne, valeur):
+        requete = self.lazy(frame).with_row_index('_ligne').filter(self.pl.col(colonne) == valeur)
+        return self._rows(requete, frame)
+
+    def top_n(self, frame, colonne, n):
+        requete = self.lazy(frame).with_row_index('_ligne') \
+            .sort(colonne, descending=True, nulls_last=True, maintain_order=True).head(n)
+        return self._rows(requete, frame)
+
+    def group_sum(self, frame, cles, mesures, annuel=False):
+        pl = self.pl
+        groupes = [pl.col('date').dt.year() if annuel and cle == 'date' else pl.col(cle) for cle in cles]
+        requete = self.lazy(frame).group_by(groupes).agg([pl.col(mesure).sum() for mesure in mesures])
+        return self._pandas(requete.collect(), frame, cles)
+
+    def group_agg(self, frame, cle, agregations):
+        pl = self.pl
+        expressions = []
+        for sortie, (colonne, fonction) in agregations.items():
+            if fonction not in AGREGATIONS:
+                raise ValueError(f"Agrégation non prise en charge: {fonction}")
+            expression = pl.len() if fonction == 'size' else getattr(pl.col(colonne), fonction)()
+            expressions.append(expression.alias(sortie))
+        resultat = self._pandas(self.lazy(frame).group_by(cle).agg(expressions).collect(), frame, [cle])
+        return resultat.set_index(cle)
+
+
+def get_backend(nom=None):
+    """Moteur de calcul nommé, à défaut celui de TAXIS_RUN_BACKEND (pandas si non défini)"""
+    nom = (nom or os.environ.get('TAXIS_RUN_BACKEND') or 'pandas').lower()
+    if nom == 'pandas':
+        return PandasBackend()
+    if nom == 'polars':
+        return PolarsBackend()
+    raise ValueError(f"Moteur de calcul inconnu: {nom} (attendu: {', '.join(MOTEURS)})")
@@ -0,0 +1,138 @@
+"""Grille de couverture offre / demande sur l'ensemble de l'île.
+
+L'île est discrétisée en cellules carrées (100 m par défaut) dans le plan
+projeté de taxis_run.spatial. La demande des communes et l'offre des stations
+sont diffusées sur la grille par des noyaux gaussiens. Le noyau gaussien étant
+séparable en x et y, la diffusion de S sources sur une grille ny x nx se
+réduit au produit matriciel (ny x S) @ (S x nx), calculé par blocs de sources:
+aucune boucle Python par cellule.
+"""
+import numpy as np
+
+from taxis_run.spatial import project, unproject
+
+# Emprise de La Réunion: lat_min, lon_min, lat_max, lon_max
+BBOX_REUNION = (-21.40, 55.20, -20.86, 55.85)
+SIGMA_STATION_M = 1500.0
+SIGMA_COMMUNE_MIN_M = 1500.0
+SIGMA_COMMUNE_MAX_M = 6000.0
+TAILLE_BLOC_SOURCES = 4096
+
+
+def build_grid(resolution_m=100.0, bbox=BBOX_REUNION):
+    """Centres des cellules de la grille en mètres projetés: (x, y) en 1D"""
+    coins = project([bbox[0], bbox[2]], [bbox[1], bbox[3]])
+    x = np.arange(coins[0, 0], coins[1, 0], resolution_m) + resolution_m / 2
+    y = np.arange(coins[0, 1], coins[1, 1], resolution_m) + resolution_m / 2
+    return x, y
+
+
+def commune_sigmas(population):
+    """Rayon de diffusion (m) de chaque commune, croissant avec sa population"""
+    population = np.asarray(population, dtype='float64')
+    return np.clip(np.sqrt(population) * 10.0, SIGMA_COMMUNE_MIN_M, SIGMA_COMMUNE_MAX_M)
+
+
+def _axis_weights(centres, positions, sigmas):
+    """Poids gaussiens 1D normalisés par source: matrice (n_centres, n_sources)"""
+    ecarts = ((centres[:, None] - positions[None, :]) / sigmas[None, :]).astype('float32')
+    poids = np.exp(-0.5 * ecarts * ecarts)
+    sommes = poids.sum(axis=0)
+    poids /= np.where(sommes > 0, sommes, 1.0)
+    return poids
+
+
+def spread_on_grid(x, y, sources_xy, valeurs, sigmas):
+    """Diffuse les valeurs des sources sur la grille (ny, nx) en conservant leur somme"""
+    sources_xy = np.asarray(sources_xy, dtype='float64')
+    valeurs = np.asarray(valeurs, dtype='float32')
+    sigmas = np.broadcast_to(np.asarray(sigmas, dtype='float64'), valeurs.shape)
+    grille = np.zeros((len(y), len(x)), dtype='float32')
+
+    for debut in range(0, len(valeurs), TAILLE_BLOC_SOURCES):
+        bloc = slice(debut, debut + TAILLE_BLOC_SOURCES)
+        poids_x = _axis_weights(x, sources_xy[bloc, 0], sigmas[bloc])
+        poids_y = _axis_weights(y, sources_xy[bloc, 1], sigmas[bloc])
+        grille += (poids_y * valeurs[bloc]) @ poids_x.T
+    return grille
+
+
+def taxis_outside_stations(current_data, stations):
+    """Taxis de chaque commune qui ne sont rattachés à aucune station listée"""
+    taxis_communes = current_data['nombre_taxis'].to_numpy(dtype='float64')
+    taxis_en_station = (stations.groupby('commune', observed=True)['nombre_taxis'].sum()
+                        .reindex(current_data['nom'].astype(str)).fillna(0).to_numpy())
+    return np.clip(taxis_communes - taxis_en_station, 0, None)
+
+
+def compute_coverage_grid(current_data, stations, resolution_m=100.0, bbox=BBOX_REUNION):
+    """Calcule demande, offre et écart (courses/jour) par cellule de la grille.
+
+    La demande de chaque commune est diffusée autour de son centre avec un
+    rayon croissant avec sa population. L'offre correspond aux taxis des
+    stations, plus les taxis de la commune non rattachés à une station
+    (placés au centre de la commune), convertis en capacité avec la demande
+    moyenne par taxi de l'île.
+    """
+    x, y = build_grid(resolution_m, bbox)
+
+    sigmas_communes = commune_sigmas(current_data['population'])
+    communes_xy = project(current_data['lat'], current_data['lon'])
+    demande = spread_on_grid(x, y, communes_xy, current_data['demande_moyenne_journaliere'], sigmas_communes)
+
+    taxis_hors_station = taxis_outside_stations(current_data, stations)
+
+    sources_offre = np.vstack([project(stations['lat'], stations['lon']), communes_xy])
+    taxis_offre = np.concatenate([stations['nombre_taxis'].to_numpy(dtype='float64'), taxis_hors_station])
+    sigmas_offre = np.concatenate([np.full(len(stations), SIGMA_STATION_M), sigmas_communes])
+
+    courses_par_taxi = current_data['demande_moyenne_journaliere'].sum() / max(taxis_offre.sum(), 1.0)
+    offre = spread_on_grid(x, y, sources_offre, taxis_offre * courses_par_taxi, sigmas_offre)
+
+    lat, _ = unproject(np.column_stack([np.zeros_like(y), y]))
+    _, lon = unproject(np.column_stack([x, np.zeros_like(x)]))
+    return {
+        'lat': lat,
+        'lon': lon,
+        'resolution_m': resolution_m,
+        'demande': demande,
+        'offre': offre,
+        'ecart': demande - offre,
+    }
+
+
+def _block_reduce(valeurs, facteur, reduction):
+    """Agrège un tableau 1D ou 2D par blocs de facteur cellules (bords complétés)"""
+    if facteur == 1:
+        return valeurs
+    if valeurs.ndim == 1:
+        reste = (-len(valeurs)) % facteur
+        valeurs = np.pad(valeurs, (0, reste), mode='edge')
+        return reduction(valeurs.reshape(-1, facteur), axis=1)
+    reste_y, reste_x = (-valeurs.shape[0]) % facteur, (-valeurs.shape[1]) % facteur
+    valeurs = np.pad(valeurs, ((0, reste_y), (0, reste_x)))
+    ny, nx = valeurs.shape
+    return reduction(valeurs.reshape(ny // facteur, facteur, nx // facteur, facteur), axis=(1, 3))
+
+
+def heatmap_points(grid, max_points=20000, seuil=0.01):
+    """Points [lat, lon, poids] du déficit de couverture pour folium HeatMap.
+
+    La grille est agrégée par blocs si nécessaire pour limiter le nombre de
+    points envoyés au navigateur; les poids sont normalisés entre 0 et 1.
+    """
+    deficit = np.clip(grid['ecart'], 0, None)
+    maximum = deficit.max()
+    if maximum <= 0:
+        return []
+    actives = np.count_nonzero(deficit > seuil * maximum)
+    facteur = max(int(np.ceil(np.sqrt(actives / max_points))), 1)
+
+    deficit = _block_reduce(deficit, facteur, np.sum)
+    lat = _block_reduce(grid['lat'], facteur, np.mean)
+    lon = _block_reduce(grid['lon'], facteur, np.mean)
+
+    maximum = deficit.max()
+    lignes, colonnes = np.nonzero(deficit > seuil * maximum)
+    poids = deficit[lignes, colonnes] / maximum
+    return np.column_stack([lat[lignes], lon[colonnes], poids]).round(5).tolist()
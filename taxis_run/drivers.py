@@ -0,0 +1,131 @@
+"""Registre individuel des taxiteurs et distributions de leur profil.
+
+Un enregistrement par taxiteur, en types compacts (catégories, entiers 8 bits;
+les langues parlées sont un masque de bits). Les six distributions affichées
+par la page Taxiteurs sont calculées en un seul passage vectorisé sur le
+sous-ensemble filtré: tranches par recherche dichotomique sur les bornes puis
+np.bincount, effectifs des catégories sur leurs codes, langues par décalage
+de bits.
+"""
+import numpy as np
+import pandas as pd
+
+from taxis_run.loader import read_table
+from taxis_run.schema import CONTRATS, DRIVERS_SCHEMA, FORMATIONS, apply_schema
+
+# Distribution -> (bornes des tranches, libellés)
+TRANCHES = {
+    'age': ([30, 40, 50, 60], ['<30 ans', '30-40 ans', '40-50 ans', '50-60 ans', '>60 ans']),
+    'anciennete': ([5, 10, 15, 20], ['<5 ans', '5-10 ans', '10-15 ans', '15-20 ans', '>20 ans']),
+    'heures_hebdo': ([35, 45, 55, 65], ['<35h', '35-45h', '45-55h', '55-65h', '>65h']),
+}
+LANGUES = ['Anglais', 'Allemand', 'Italien', 'Espagnol', 'Chinois']
+DISTRIBUTIONS = ('age', 'anciennete', 'heures_hebdo', 'contrat', 'formation', 'langues')
+
+# Proportions de référence des enquêtes professionnelles, utilisées pour le registre synthétique
+PROPORTIONS_REFERENCE = {
+    'age': [0.08, 0.22, 0.35, 0.25, 0.10],
+    'anciennete': [0.15, 0.25, 0.30, 0.20, 0.10],
+    'heures_hebdo': [0.05, 0.25, 0.40, 0.20, 0.10],
+    'contrat': [0.65, 0.20, 0.10, 0.05],
+    'formation': [0.35, 0.30, 0.20, 0.10, 0.05],
+    'langues': [0.40, 0.15, 0.10, 0.25, 0.05],
+}
+BORNES_TIRAGE = {'age': (21, 70), 'anciennete': (0, 40), 'heures_hebdo': (20, 80)}
+
+
+def encode_languages(langues):
+    """Masque de bits (uint8) à partir de listes de langues séparées par ';'"""
+    masque = np.zeros(len(langues), dtype='uint8')
+    for bit, langue in enumerate(LANGUES):
+        masque |= langues.fillna('').str.contains(langue, regex=False).to_numpy().astype('uint8') << bit
+    return masque
+
+
+def _draw_in_brackets(rng, n, distribution):
+    """Tire n valeurs entières: tranche selon les proportions de référence, puis uniforme dans la tranche"""
+    bornes, _ = TRANCHES[distribution]
+    minimum, maximum = BORNES_TIRAGE[distribution]
+    limites = np.array([minimum] + bornes + [maximum + 1])
+    tranche = rng.choice(len(limites) - 1, size=n, p=PROPORTIONS_REFERENCE[distribution])
+    return rng.integers(limites[tranche], limites[tranche + 1])
+
+
+def synthetic_driver_registry(communes_data, seed=0, facteur=1):
+    """Registre synthétique: nombre_taxiteurs x facteur enregistrements par commune"""
+    rng = np.random.default_rng(seed)
+    communes = pd.DataFrame(communes_data)
+    effectifs = communes['nombre_taxiteurs'].to_numpy() * facteur
+    n = int(effectifs.sum())
+
+    age = _draw_in_brackets(rng, n, 'age')
+    langues = np.zeros(n, dtype='uint8')
+    for bit, proportion in enumerate(PROPORTIONS_REFERENCE['langues']):
+        langues |= (rng.random(n) < proportion).astype('uint8') << bit
+
+    registre = pd.DataFrame({
+        'id_taxiteur': np.arange(1, n + 1),
+        'commune': np.repeat(communes['nom'].astype(str).to_numpy(), effectifs),
+        'micro_region': np.repeat(communes['micro_region'].astype(str).to_numpy(), effectifs),
+        'age': age,
+        # L'ancienneté ne peut dépasser les années écoulées depuis 21 ans
+        'anciennete': np.minimum(_draw_in_brackets(rng, n, 'anciennete'), age - 21),
+        'heures_hebdo': _draw_in_brackets(rng, n, 'heures_hebdo'),
+        'contrat': pd.Categorical.from_codes(
+            rng.choice(len(CONTRATS.categories), size=n, p=PROPORTIONS_REFERENCE['contrat']), dtype=CONTRATS),
+        'formation': pd.Categorical.from_codes(
+            rng.choice(len(FORMATIONS.categories), size=n, p=PROPORTIONS_REFERENCE['formation']), dtype=FORMATIONS),
+        'langues': langues,
+    })
+    return apply_schema(registre, DRIVERS_SCHEMA)
+
+
+def load_driver_registry(path):
+    """Charge le registre depuis un fichier; la colonne langues peut être un texte 'Anglais;Espagnol'"""
+    registre = read_table(path)
+    if registre['langues'].dtype == object:
+        registre['langues'] = encode_languages(registre['langues'])
+    return apply_schema(registre, DRIVERS_SCHEMA)
+
+
+def _frame(categories, effectifs, total):
+    return pd.DataFrame({
+        'categorie': categories,
+        'effectif': effectifs,
+        'pourcentage': effectifs / total * 100 if total else np.zeros(len(effectifs)),
+    })
+
+
+def bracket_distribution(valeurs, distribution):
+    """Effectifs et pourcentages par tranche (TRANCHES[distribution]) des valeurs données"""
+    bornes, libelles = TRANCHES[distribution]
+    codes = np.searchsorted(bornes, np.asarray(valeurs), side='right')
+    return _frame(libelles, np.bincount(codes, minlength=len(libelles)), len(codes))
+
+
+def selection_mask(drivers, communes=None, micro_regions=None):
+    """Masque des taxiteurs des communes et micro-régions données (toutes si vide)"""
+    masque = np.ones(len(drivers), dtype=bool)
+    if communes:
+        masque &= drivers['commune'].isin(communes).to_numpy()
+    if micro_regions:
+        masque &= drivers['micro_region'].isin(micro_regions).to_numpy()
+    return masque
+
+
+def driver_distributions(drivers, communes=None, micro_regions=None):
+    """Les six distributions du profil des taxiteurs filtrés: {distribution: DataFrame}"""
+    masque = selection_mask(drivers, communes, micro_regions)
+    total = int(masque.sum())
+
+    resultats = {}
+    for distribution in TRANCHES:
+        resultats[distribution] = bracket_distribution(drivers[distribution].to_numpy()[masque], distribution)
+    for distribution in ('contrat', 'formation'):
+        colonne = drivers[distribution]
+        codes = colonne.cat.codes.to_numpy()[masque]
+        categories = list(colonne.cat.categories)
+        resultats[distribution] = _frame(categories, np.bincount(codes[codes >= 0], minlength=len(categories)), total)
+    bits = (drivers['langues'].to_numpy()[masque, None] >> np.arange(len(LANGUES), dtype='uint8')) & 1
+    resultats['langues'] = _frame(LANGUES, bits.sum(axis=0), total)
+    return resultats
@@ -0,0 +1,95 @@
+"""Export en flux des vues filtrées vers CSV, Parquet ou Arrow.
+
+Les données sont converties et écrites par lots de lignes (un groupe de lignes
+Parquet / un record batch Arrow par lot): seul le lot courant est converti en
+mémoire, jamais le fichier complet. La source peut être un DataFrame ou un
+itérable de DataFrames (par exemple des partitions d'historique lues une à une).
+"""
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+# Format -> (extension, type MIME)
+FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'Arrow': ('arrow', 'application/vnd.apache.arrow.file'),
+}
+TAILLE_LOT = 100_000
+MEMOIRE_MAX_OCTETS = 16 * 1024 * 1024
+
+
+def iter_chunks(data, taille_lot=TAILLE_LOT):
+    """Découpe la source en DataFrames d'au plus taille_lot lignes"""
+    frames = [data] if isinstance(data, pd.DataFrame) else data
+    for frame in frames:
+        for debut in range(0, len(frame), taille_lot):
+            yield frame.iloc[debut:debut + taille_lot]
+
+
+class _StreamWriter:
+    """Écrivain par lots commun aux trois formats, ouvert au premier lot"""
+
+    def __init__(self, sink, format):
+        if format not in FORMATS:
+            raise ValueError(f"Format d'export inconnu: {format}")
+        self.sink = sink
+        self.format = format
+        self.schema = None
+        self._writer = None
+
+    def write(self, chunk):
+        if self.schema is None:
+            self.schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+            if self.format == 'CSV':
+                # Le CSV n'a pas de type dictionnaire: les catégories sont écrites en texte
+                self.schema = pa.schema([
+                    champ.with_type(champ.type.value_type) if pa.types.is_dictionary(champ.type) else champ
+                    for champ in self.schema
+                ]).with_metadata(None)
+            self._writer = self._open()
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if not table.schema.equals(self.schema):
+            table = table.cast(self.schema)
+        if self.format == 'Parquet':
+            self._writer.write_table(table, row_group_size=len(table))
+        else:
+            self._writer.write_table(table)
+
+    def _open(self):
+        if self.format == 'CSV':
+            return pa_csv.CSVWriter(self.sink, self.schema)
+        if self.format == 'Parquet':
+            return pq.ParquetWriter(self.sink, self.schema, compression='zstd')
+        return pa.ipc.new_file(self.sink, self.schema)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def write_export(data, sink, format, taille_lot=TAILLE_LOT):
+    """Écrit la source dans sink (chemin ou fichier binaire) par lots; retourne le nombre de lignes"""
+    writer = _StreamWriter(sink, format)
+    lignes = 0
+    try:
+        for chunk in iter_chunks(data, taille_lot):
+            writer.write(chunk)
+            lignes += len(chunk)
+        if writer.schema is None and isinstance(data, pd.DataFrame):
+            # Source vide: on écrit au moins l'en-tête / le schéma
+            writer.write(data.iloc[:0])
+    finally:
+        writer.close()
+    return lignes
+
+
+def export_to_file(data, format, taille_lot=TAILLE_LOT, memoire_max=MEMOIRE_MAX_OCTETS):
+    """Exporte vers un fichier temporaire (en mémoire jusqu'à memoire_max, sur disque au-delà)"""
+    fichier = tempfile.SpooledTemporaryFile(max_size=memoire_max, mode='w+b')
+    write_export(data, fichier, format, taille_lot)
+    fichier.seek(0)
+    return fichier
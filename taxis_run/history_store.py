@@ -0,0 +1,205 @@
+"""Historique sur disque partitionné par année et par mois, en ajout seul.
+
+Disposition (compatible avec le partitionnement Hive des moteurs Parquet):
+
+    dossier/
+        manifest.json
+        annee=2024/mois=12/part-0000.parquet
+        annee=2025/mois=01/part-0000.parquet
+
+Un ajout n'écrit que de nouveaux fichiers, jamais ne réécrit les existants;
+le manifeste liste chaque fichier avec sa période couverte, son empreinte de
+contenu et ses totaux par micro-région. Les agrégats de l'historique se
+déduisent du manifeste seul (un ajout ne calcule que ceux de la nouvelle
+partition) et une lecture bornée dans le temps n'ouvre que les fichiers dont
+la période recoupe l'intervalle demandé. Une partition dont l'empreinte figure
+déjà au manifeste pour le même mois est ignorée: réimporter un fichier ne
+double pas l'historique.
+
+    python -m taxis_run.history_store init dossier [--depuis historique.csv]
+    python -m taxis_run.history_store append dossier nouvelle_periode.csv
+    python -m taxis_run.history_store info dossier
+"""
+import argparse
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+from taxis_run.loader import read_table
+from taxis_run.schema import HISTORY_SCHEMA, MICRO_REGIONS, apply_schema
+from taxis_run.versioning import hash_frame
+
+MANIFESTE = 'manifest.json'
+MESURES = ('nombre_taxis', 'demande_moyenne_journaliere', 'revenu_moyen_mensuel')
+
+
+def _write_atomically(chemin, ecrire):
+    """Écrit via un fichier temporaire du même dossier renommé à la fin: jamais de fichier à moitié écrit"""
+    descripteur, temporaire = tempfile.mkstemp(dir=os.path.dirname(chemin), suffix='.tmp')
+    os.close(descripteur)
+    try:
+        ecrire(temporaire)
+        os.replace(temporaire, chemin)
+    except BaseException:
+        os.remove(temporaire)
+        raise
+
+
+def partition_totals(partition):
+    """Totaux d'une partition par micro-région: {micro_region: {'lignes': n, mesure: somme}}"""
+    groupes = partition.groupby('micro_region', observed=True)
+    totaux = groupes[list(MESURES)].sum().astype('float64')
+    totaux.insert(0, 'lignes', groupes.size())
+    return {str(region): {cle: float(valeur) for cle, valeur in ligne.items()}
+            for region, ligne in totaux.to_dict(orient='index').items()}
+
+
+class HistoryStore:
+    """Historique Parquet partitionné par (année, mois) et son manifeste"""
+
+    def __init__(self, dossier):
+        self.dossier = dossier
+        chemin = os.path.join(dossier, MANIFESTE)
+        if os.path.exists(chemin):
+            with open(chemin, encoding='utf-8') as fichier:
+                self.manifeste = json.load(fichier)
+        else:
+            self.manifeste = {'fichiers': []}
+
+    @staticmethod
+    def exists(dossier):
+        return os.path.exists(os.path.join(dossier, MANIFESTE))
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.dossier, MANIFESTE)
+
+    def partitions(self):
+        """Fichiers du manifeste: année, mois, chemin, lignes, période couverte et empreinte"""
+        colonnes = ['annee', 'mois', 'fichier', 'lignes', 'debut', 'fin', 'empreinte']
+        fichiers = pd.DataFrame(self.manifeste['fichiers'], columns=colonnes + ['totaux'])[colonnes]
+        return fichiers.astype({'debut': 'datetime64[ns]', 'fin': 'datetime64[ns]'})
+
+    def append(self, frame):
+        """Ajoute des lignes en nouveaux fichiers, une partition (année, mois) à la fois
+
+        Les partitions déjà présentes (même empreinte pour le même mois) ne
+        sont pas réécrites; seuls les fichiers ajoutés sont renvoyés.
+        """
+        frame = frame.copy()
+        frame['date'] = pd.to_datetime(frame['date'])
+        frame = apply_schema(frame, HISTORY_SCHEMA)
+        os.makedirs(self.dossier, exist_ok=True)
+        existants = [(f['annee'], f['mois']) for f in self.manifeste['fichiers']]
+        empreintes = {(f['annee'], f['mois'], f['empreinte']) for f in self.manifeste['fichiers']}
+
+        ajouts = []
+        for (annee, mois), partition in frame.groupby([frame['date'].dt.year, frame['date'].dt.month]):
+            annee, mois = int(annee), int(mois)
+            partition = partition.reset_index(drop=True)
+            empreinte = hash_frame(partition)
+            if (annee, mois, empreinte) in empreintes:
+                continue
+            relatif = os.path.join(f"annee={annee}", f"mois={mois:02d}",
+                                   f"part-{existants.count((annee, mois)):04d}.parquet")
+            chemin = os.path.join(self.dossier, relatif)
+            os.makedirs(os.path.dirname(chemin), exist_ok=True)
+            _write_atomically(chemin, lambda temporaire: partition.to_parquet(temporaire, index=False))
+            ajouts.append({
+                'annee': annee,
+                'mois': mois,
+                'fichier': relatif,
+                'lignes': len(partition),
+                'debut': partition['date'].min().isoformat(),
+                'fin': partition['date'].max().isoformat(),
+                'empreinte': empreinte,
+                'totaux': partition_totals(partition),
+            })
+
+        # Le manifeste n'est remplacé qu'une fois tous les nouveaux fichiers écrits
+        manifeste = {'fichiers': self.manifeste['fichiers'] + ajouts}
+
+        def ecrire(temporaire):
+            with open(temporaire, 'w', encoding='utf-8') as fichier:
+                json.dump(manifeste, fichier, ensure_ascii=False, indent=1)
+        _write_atomically(self.manifest_path, ecrire)
+        self.manifeste = manifeste
+        return ajouts
+
+    def files(self, debut=None, fin=None):
+        """Chemins des fichiers dont la période recoupe [debut, fin]"""
+        debut = None if debut is None else pd.Timestamp(debut)
+        fin = None if fin is None else pd.Timestamp(fin)
+        return [os.path.join(self.dossier, f['fichier']) for f in self.manifeste['fichiers']
+                if (fin is None or pd.Timestamp(f['debut']) <= fin)
+                and (debut is None or pd.Timestamp(f['fin']) >= debut)]
+
+    def read(self, debut=None, fin=None, colonnes=None):
+        """Lignes de [debut, fin], en ne lisant que les fichiers concernés (et les colonnes demandées)"""
+        colonnes = list(colonnes or HISTORY_SCHEMA)
+        lues = colonnes if 'date' in colonnes else ['date'] + colonnes
+        fichiers = self.files(debut, fin)
+        if not fichiers:
+            historique = pd.DataFrame({colonne: pd.Series(dtype='object') for colonne in lues})
+        else:
+            historique = pd.concat([pd.read_parquet(f, columns=lues) for f in fichiers], ignore_index=True)
+        historique['date'] = pd.to_datetime(historique['date'])
+        masque = pd.Series(True, index=historique.index)
+        if debut is not None:
+            masque &= historique['date'] >= pd.Timestamp(debut)
+        if fin is not None:
+            masque &= historique['date'] <= pd.Timestamp(fin)
+        historique = historique.loc[masque, colonnes].reset_index(drop=True)
+        return apply_schema(historique, {c: t for c, t in HISTORY_SCHEMA.items() if c in colonnes})
+
+    def annual_totals(self):
+        """Totaux par (année, micro-région), déduits du manifeste sans lire les données"""
+        lignes = [{'date': f['annee'], 'micro_region': region, **totaux}
+                  for f in self.manifeste['fichiers'] for region, totaux in f['totaux'].items()]
+        if not lignes:
+            return pd.DataFrame(columns=['date', 'micro_region', 'lignes', *MESURES])
+        totaux = pd.DataFrame(lignes).astype({'micro_region': MICRO_REGIONS})
+        return totaux.groupby(['date', 'micro_region'], observed=True, as_index=False).sum()
+
+
+def load_history_store(dossier):
+    """Historique complet d'un dossier partitionné (tâche de chargement)"""
+    return HistoryStore(dossier).read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commandes = parser.add_subparsers(dest='commande', required=True)
+    init = commandes.add_parser('init', help="Crée le dossier depuis un fichier ou l'historique intégré")
+    init.add_argument('dossier')
+    init.add_argument('--depuis', help="Fichier d'historique (CSV, Parquet ou JSON)")
+    ajout = commandes.add_parser('append', help="Ajoute une nouvelle période")
+    ajout.add_argument('dossier')
+    ajout.add_argument('fichier')
+    info = commandes.add_parser('info', help="Liste les partitions du manifeste")
+    info.add_argument('dossier')
+    args = parser.parse_args()
+
+    store = HistoryStore(args.dossier)
+    if args.commande == 'init':
+        if store.exists(args.dossier):
+            parser.error(f"{args.dossier} contient déjà un historique partitionné (utiliser append)")
+        if args.depuis:
+            historique = read_table(args.depuis, HISTORY_SCHEMA)
+        else:
+            from taxis_run.data import ReunionTaxiData
+            historique = ReunionTaxiData(trace=False).historical_data
+        ajouts = store.append(historique)
+    elif args.commande == 'append':
+        ajouts = store.append(read_table(args.fichier, HISTORY_SCHEMA))
+    else:
+        print(store.partitions().to_string(index=False))
+        return
+    for ajout in ajouts:
+        print(f"{ajout['fichier']}: {ajout['lignes']} lignes ({ajout['debut'][:10]} -> {ajout['fin'][:10]})")
+
+
+if __name__ == '__main__':
+    main()
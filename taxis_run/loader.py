@@ -0,0 +1,138 @@
+"""Chargement concurrent des sources de données au démarrage.
+
+Chaque tâche déclare ses dépendances; elle est soumise dès que toutes ses
+entrées sont prêtes. Les tâches d'entrée/sortie (lecture et parsing de
+fichiers) tournent dans un pool de threads, les tâches gourmandes en CPU dans
+un pool de processus créé uniquement si nécessaire (méthode spawn: le
+chargement tourne déjà dans des threads, et sous Streamlit dans le thread du
+script; un fork y risquerait un interblocage). La chronologie réelle de
+chaque tâche est enregistrée et peut être affichée après le chargement.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from taxis_run.schema import apply_schema
+
+IO, CPU = 'io', 'cpu'
+
+
+def read_table(path, schema=None):
+    """Lit un fichier CSV, Parquet ou JSON (selon l'extension) et applique le schéma éventuel"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        table = pd.read_csv(path)
+    elif extension in ('.parquet', '.pq'):
+        table = pd.read_parquet(path)
+    elif extension == '.json':
+        table = pd.read_json(path, orient='records')
+    else:
+        raise ValueError(f"Format de fichier non pris en charge: {path}")
+    if schema is not None:
+        if 'date' in schema and 'date' in table.columns:
+            table['date'] = pd.to_datetime(table['date'])
+        table = apply_schema(table, schema)
+    return table
+
+
+def _timed_call(fonction, args):
+    """Exécute la tâche et retourne (début, fin, exécutant, résultat); perf_counter est commun aux processus"""
+    debut = time.perf_counter()
+    resultat = fonction(*args)
+    executant = f"pid {os.getpid()}" if threading.current_thread() is threading.main_thread() \
+        else threading.current_thread().name
+    return debut, time.perf_counter(), executant, resultat
+
+
+class LoadTask:
+    """Tâche de chargement: fonction, arguments fixes, dépendances et nature (io/cpu)"""
+    __slots__ = ('nom', 'fonction', 'args', 'dependances', 'nature')
+
+    def __init__(self, nom, fonction, args, dependances, nature):
+        self.nom = nom
+        self.fonction = fonction
+        self.args = args
+        self.dependances = tuple(dependances)
+        self.nature = nature
+
+
+class ConcurrentLoader:
+    """Ordonnanceur de tâches de chargement dépendantes"""
+
+    def __init__(self, max_threads=8, max_processes=None):
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        self.tasks = {}
+        self.timeline = []
+
+    def add(self, nom, fonction, *args, dependances=(), nature=IO):
+        """Déclare une tâche; fonction reçoit args puis les résultats des dépendances, dans l'ordre"""
+        if nature not in (IO, CPU):
+            raise ValueError(f"Nature de tâche inconnue: {nature}")
+        self.tasks[nom] = LoadTask(nom, fonction, args, dependances, nature)
+
+    def run(self):
+        """Exécute toutes les tâches au plus tôt et retourne {nom: résultat}"""
+        inconnues = {d for t in self.tasks.values() for d in t.dependances} - set(self.tasks)
+        if inconnues:
+            raise ValueError(f"Dépendances inconnues: {sorted(inconnues)}")
+
+        resultats = {}
+        en_attente = dict(self.tasks)
+        en_cours = {}
+        self.timeline = []
+        self.origine = time.perf_counter()
+        pool_processus = None
+
+        with ThreadPoolExecutor(self.max_threads, thread_name_prefix='chargement') as pool_threads:
+            try:
+                while en_attente or en_cours:
+                    prets = [t for t in en_attente.values() if all(d in resultats for d in t.dependances)]
+                    for tache in prets:
+                        del en_attente[tache.nom]
+                        args = tache.args + tuple(resultats[d] for d in tache.dependances)
+                        if tache.nature == CPU:
+                            if pool_processus is None:
+                                pool_processus = ProcessPoolExecutor(
+                                    self.max_processes, mp_context=multiprocessing.get_context('spawn'))
+                            pool = pool_processus
+                        else:
+                            pool = pool_threads
+                        en_cours[pool.submit(_timed_call, tache.fonction, args)] = tache
+
+                    if not en_cours:
+                        raise ValueError(f"Dépendances circulaires: {sorted(en_attente)}")
+
+                    termines, _ = wait(en_cours, return_when=FIRST_COMPLETED)
+                    for future in termines:
+                        tache = en_cours.pop(future)
+                        debut, fin, executant, resultats[tache.nom] = future.result()
+                        self.timeline.append({
+                            'tache': tache.nom,
+                            'nature': tache.nature,
+                            'executant': executant,
+                            'debut_ms': (debut - self.origine) * 1000,
+                            'fin_ms': (fin - self.origine) * 1000,
+                        })
+            finally:
+                if pool_processus is not None:
+                    pool_processus.shutdown(cancel_futures=True)
+        return resultats
+
+    def format_timeline(self, largeur=40):
+        """Chronologie texte du dernier chargement (une ligne par tâche, barre proportionnelle)"""
+        if not self.timeline:
+            return "Aucune tâche exécutée"
+        total = max(e['fin_ms'] for e in self.timeline) or 1.0
+        lignes = [f"Chronologie du chargement ({total:.0f} ms)"]
+        for e in sorted(self.timeline, key=lambda e: e['debut_ms']):
+            debut = int(e['debut_ms'] / total * largeur)
+            fin = max(int(e['fin_ms'] / total * largeur), debut + 1)
+            barre = ' ' * debut + '█' * (fin - debut)
+            lignes.append(f"  {e['tache']:<18} {e['nature']:<3} {e['debut_ms']:>7.1f} → {e['fin_ms']:>7.1f} ms "
+                          f"|{barre:<{largeur}}| {e['executant']}")
+        return '\n'.join(lignes)
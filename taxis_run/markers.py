@@ -0,0 +1,89 @@
+"""Marqueurs de carte des communes et des stations.
+
+Les enregistrements sont des namedtuples construits en bloc depuis les
+colonnes: popups et infobulles sont générés par concaténation vectorisée, sans
+dictionnaire ni Series par ligne. Les marqueurs d'une couche sont émis dans un
+seul élément Folium (données JSON + boucle JavaScript) au lieu d'un objet
+Marker/Popup/Icon par point: le coût côté Python par marqueur est constant et
+faible.
+"""
+from collections import namedtuple
+from itertools import repeat
+
+from branca.element import MacroElement
+from jinja2 import Template
+
+MarkerRecord = namedtuple('MarkerRecord', ['lat', 'lon', 'popup', 'tooltip', 'couleur', 'icone'])
+
+COULEURS_ACTIVITE = {'Élevé': 'green', 'Moyen': 'orange', 'Faible': 'red', 'Limitée': 'lightgray'}
+
+
+def _texte(colonne):
+    """Colonne convertie en chaînes (catégories comprises)"""
+    return colonne.astype(str)
+
+
+def _records(lat, lon, popup, tooltip, couleur, icone):
+    """Enregistrements à partir de colonnes (couleur et icône peuvent être des constantes)"""
+    couleur = repeat(couleur) if isinstance(couleur, str) else couleur.tolist()
+    icone = repeat(icone) if isinstance(icone, str) else icone.tolist()
+    return list(map(MarkerRecord._make, zip(lat.tolist(), lon.tolist(), popup.tolist(), tooltip.tolist(),
+                                            couleur, icone)))
+
+
+def commune_markers(current_data, alertes=None):
+    """Marqueurs des communes, colorés selon le niveau d'activité.
+
+    alertes: {commune: texte} des communes à signaler (icône d'alerte, texte ajouté au popup).
+    """
+    nom = _texte(current_data['nom'])
+    popup = ('<b>' + nom + '</b><br>'
+             + 'Micro-région: ' + _texte(current_data['micro_region']) + '<br>'
+             + 'Nombre de taxis: ' + _texte(current_data['nombre_taxis']) + '<br>'
+             + 'Activité: ' + _texte(current_data['taux_activite']) + '<br>'
+             + 'Demande journalière: ' + _texte(current_data['demande_moyenne_journaliere']) + ' courses<br>'
+             + 'Revenu moyen: ' + _texte(current_data['revenu_moyen_mensuel']) + ' €')
+    tooltip = nom + ' - ' + _texte(current_data['nombre_taxis']) + ' taxis'
+    couleur = _texte(current_data['taux_activite']).map(COULEURS_ACTIVITE).fillna('darkgray')
+    if not alertes:
+        return _records(current_data['lat'], current_data['lon'], popup, tooltip, couleur, 'taxi')
+    alerte = nom.map(alertes)
+    signalees = alerte.notna()
+    popup = popup.where(~signalees, popup + '<br><b>⚠️ Anomalie:</b> ' + alerte)
+    tooltip = tooltip.where(~signalees, tooltip + ' ⚠️')
+    icone = signalees.map({True: 'exclamation-triangle', False: 'taxi'})
+    return _records(current_data['lat'], current_data['lon'], popup, tooltip, couleur, icone)
+
+
+def station_markers(stations):
+    """Marqueurs des stations de taxis"""
+    nom = _texte(stations['nom'])
+    popup = '<b>' + nom + '</b><br>' + _texte(stations['nombre_taxis']) + ' taxis'
+    return _records(stations['lat'], stations['lon'], popup, nom, 'blue', 'flag')
+
+
+class MarkerLayer(MacroElement):
+    """Ensemble de marqueurs Font Awesome ajoutés par une seule boucle JavaScript"""
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function() {
+            var marqueurs = {{ this.records|tojson }};
+            for (var i = 0; i < marqueurs.length; i++) {
+                var m = marqueurs[i];
+                L.marker([m[0], m[1]], {
+                    icon: L.AwesomeMarkers.icon({markerColor: m[4], iconColor: 'white', icon: m[5], prefix: 'fa'})
+                })
+                .bindPopup(m[2], {maxWidth: {{ this.max_width }}})
+                .bindTooltip(m[3], {sticky: true})
+                .addTo({{ this._parent.get_name() }});
+            }
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, records, max_width=300):
+        super().__init__()
+        self._name = 'MarkerLayer'
+        self.records = records
+        self.max_width = max_width
@@ -0,0 +1,168 @@
+"""Indicateurs dérivés par commune et par micro-région.
+
+Tous les ratios sont calculés une seule fois, au chargement des données,
+en une passe vectorisée. Les vues lisent ensuite directement ces colonnes.
+
+Les indicateurs clés par période (année x micro-région) sont précalculés de
+même dans un tableau dense: chaque indicateur et sa variation d'une année sur
+l'autre se lisent ensuite par indexation, sans repasser sur l'historique.
+"""
+import numpy as np
+import pandas as pd
+
+from taxis_run.compute import PandasBackend
+from taxis_run.schema import MICRO_REGIONS
+
+MESURES_PERIODE = ('nombre_taxis', 'nombre_taxiteurs', 'demande_moyenne_journaliere', 'revenu_moyen_mensuel',
+                   'population', 'communes')
+
+
+def _ratio(numerateur, denominateur, echelle=1.0):
+    """Division vectorisée protégée contre les dénominateurs nuls"""
+    numerateur = np.asarray(numerateur, dtype='float64')
+    denominateur = np.asarray(denominateur, dtype='float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        resultat = numerateur / denominateur * echelle
+    return np.where(denominateur > 0, resultat, np.nan)
+
+
+def derive_commune_metrics(current_data):
+    """Ajoute les indicateurs dérivés par commune au tableau courant"""
+    population = current_data['population']
+    taxis = current_data['nombre_taxis']
+    taxiteurs = current_data['nombre_taxiteurs']
+    demande = current_data['demande_moyenne_journaliere']
+
+    return current_data.assign(
+        taxis_10k_hab=_ratio(taxis, population, 10000),
+        taxiteurs_10k_hab=_ratio(taxiteurs, population, 10000),
+        taxiteurs_par_taxi=_ratio(taxiteurs, taxis),
+        demande_par_taxi=_ratio(demande, taxis),
+        demande_par_taxiteur=_ratio(demande, taxiteurs),
+        demande_1k_hab=_ratio(demande, population, 1000),
+    )
+
+
+def derive_microregion_metrics(current_data, compute=None):
+    """Agrège les communes par micro-région avec ratios et moyennes pondérées par la population"""
+    compute = compute or PandasBackend()
+    population = current_data['population'].astype('float64')
+    ponderes = current_data.assign(
+        revenu_x_pop=current_data['revenu_moyen_mensuel'] * population,
+        occupation_x_pop=current_data['taux_occupation'] * population,
+    )
+
+    data = compute.group_agg(ponderes, 'micro_region', {
+        'nombre_taxis_total': ('nombre_taxis', 'sum'),
+        'nombre_taxiteurs_total': ('nombre_taxiteurs', 'sum'),
+        'demande_totale_journaliere': ('demande_moyenne_journaliere', 'sum'),
+        'population_totale': ('population', 'sum'),
+        'revenu_moyen_mensuel': ('revenu_moyen_mensuel', 'mean'),
+        'taux_occupation_moyen': ('taux_occupation', 'mean'),
+        'nombre_communes': ('nom', 'size'),
+        'revenu_x_pop': ('revenu_x_pop', 'sum'),
+        'occupation_x_pop': ('occupation_x_pop', 'sum'),
+    })
+    revenu_x_pop = data.pop('revenu_x_pop')
+    occupation_x_pop = data.pop('occupation_x_pop')
+
+    population_totale = data['population_totale']
+    taxis_total = data['nombre_taxis_total']
+    taxiteurs_total = data['nombre_taxiteurs_total']
+    demande_totale = data['demande_totale_journaliere']
+
+    data = data.assign(
+        revenu_moyen_pondere=_ratio(revenu_x_pop, population_totale),
+        taux_occupation_pondere=_ratio(occupation_x_pop, population_totale),
+        densite_taxis=_ratio(taxis_total, population_totale, 10000),
+        taxiteurs_10k_hab=_ratio(taxiteurs_total, population_totale, 10000),
+        taxiteurs_par_taxi=_ratio(taxiteurs_total, taxis_total),
+        demande_par_taxi=_ratio(demande_totale, taxis_total),
+        demande_1k_hab=_ratio(demande_totale, population_totale, 1000),
+    )
+    return data.reset_index()
+
+
+def _variation(valeur, reference):
+    """Variation en % (None sans référence exploitable)"""
+    if reference is None or not reference or np.isnan(reference):
+        return None
+    return (valeur / reference - 1) * 100
+
+
+class PeriodTotals:
+    """Totaux de l'historique par (année, micro-région), lus en temps constant.
+
+    L'historique ne comptant pas les taxiteurs, leur nombre est estimé par
+    commune avec le ratio taxiteurs par taxi actuel de la commune.
+    """
+
+    def __init__(self, historical_data, current_data):
+        annees = historical_data['date'].dt.year.to_numpy()
+        self.annees, i_annee = np.unique(annees, return_inverse=True)
+        self.regions = list(MICRO_REGIONS.categories)
+        i_region = historical_data['micro_region'].astype(MICRO_REGIONS).cat.codes.to_numpy()
+
+        communes = current_data.set_index(current_data['nom'].astype(str))
+        nom = historical_data['commune'].astype(str)
+        ratio = nom.map(communes['taxiteurs_par_taxi']).fillna(np.nanmedian(communes['taxiteurs_par_taxi']))
+        valeurs = {
+            'nombre_taxis': historical_data['nombre_taxis'].to_numpy(dtype='float64'),
+            'nombre_taxiteurs': historical_data['nombre_taxis'].to_numpy(dtype='float64') * ratio.to_numpy(),
+            'demande_moyenne_journaliere': historical_data['demande_moyenne_journaliere'].to_numpy(dtype='float64'),
+            'revenu_moyen_mensuel': historical_data['revenu_moyen_mensuel'].to_numpy(dtype='float64'),
+            'population': nom.map(communes['population']).fillna(0).to_numpy(dtype='float64'),
+            'communes': np.ones(len(historical_data)),
+        }
+        cellules = i_annee * len(self.regions) + i_region
+        self.totaux = np.stack([
+            np.bincount(cellules, weights=valeurs[mesure], minlength=len(self.annees) * len(self.regions))
+            for mesure in MESURES_PERIODE
+        ], axis=-1).reshape(len(self.annees), len(self.regions), len(MESURES_PERIODE))
+
+    def year_position(self, annee_debut, annee_fin):
+        """Position de la dernière année disponible dans [annee_debut, annee_fin] (None si aucune)"""
+        position = int(np.searchsorted(self.annees, annee_fin, side='right')) - 1
+        if position < 0 or self.annees[position] < annee_debut:
+            return None
+        return position
+
+    def indicators(self, position, regions=None):
+        """Indicateurs agrégés d'une année (position) sur les micro-régions données (toutes si vide)"""
+        colonnes = [self.regions.index(r) for r in regions] if regions else slice(None)
+        totaux = dict(zip(MESURES_PERIODE, self.totaux[position, colonnes].reshape(-1, len(MESURES_PERIODE)).sum(axis=0)))
+        communes = totaux['communes']
+        return {
+            'nombre_taxis': totaux['nombre_taxis'],
+            'nombre_taxiteurs': totaux['nombre_taxiteurs'],
+            'demande_moyenne_journaliere': totaux['demande_moyenne_journaliere'],
+            'revenu_moyen_mensuel': totaux['revenu_moyen_mensuel'] / communes if communes else np.nan,
+            'taxis_10k_hab': _ratio(totaux['nombre_taxis'], totaux['population'], 10000).item(),
+            'demande_par_taxi': _ratio(totaux['demande_moyenne_journaliere'], totaux['nombre_taxis']).item(),
+        }
+
+    def kpis(self, annee_debut, annee_fin, regions=None):
+        """Indicateurs de la dernière année de la période, variations sur un an et croissance annuelle moyenne.
+
+        Retourne None si la période ne contient aucune année de l'historique.
+        """
+        position = self.year_position(annee_debut, annee_fin)
+        if position is None:
+            return None
+        courant = self.indicators(position, regions)
+        precedent = self.indicators(position - 1, regions) if position > 0 else {}
+        # Croissance annuelle moyenne de la demande depuis la première année de la période
+        premiere = max(int(np.searchsorted(self.annees, annee_debut)), 0)
+        n_annees = self.annees[position] - self.annees[premiere]
+        demande_debut = self.indicators(premiere, regions)['demande_moyenne_journaliere']
+        croissance = None
+        if n_annees > 0 and demande_debut > 0:
+            croissance = ((courant['demande_moyenne_journaliere'] / demande_debut) ** (1 / n_annees) - 1) * 100
+        return {
+            'annee': int(self.annees[position]),
+            'annee_reference': int(self.annees[position - 1]) if position > 0 else None,
+            'valeurs': courant,
+            'variations': {cle: _variation(valeur, precedent.get(cle)) for cle, valeur in courant.items()},
+            'croissance_demande': croissance,
+            'periode_croissance': (int(self.annees[premiere]), int(self.annees[position])),
+        }
@@ -0,0 +1,92 @@
+"""Placement optimal de nouvelles stations de taxis.
+
+On cherche les N emplacements qui maximisent la demande non couverte captée
+(cellules en déficit de la grille de couverture situées à moins d'un rayon de
+service d'une nouvelle station). La couverture est une fonction sous-modulaire:
+l'algorithme glouton paresseux (lazy greedy) garantit une solution à (1 - 1/e)
+de l'optimum en ne réévaluant que les candidats en tête du tas.
+
+La solution gloutonne pour N stations est le préfixe de la solution pour
+N + 1: un seul calcul pour N maximal suffit à servir toutes les valeurs du
+curseur.
+"""
+import heapq
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+from taxis_run.spatial import SpatialIndex
+
+RAYON_SERVICE_M = 2000.0
+
+
+def deficit_points(grid):
+    """Cellules en déficit de la grille de couverture: (lat, lon, demande non couverte)"""
+    deficit = np.clip(grid['ecart'], 0, None)
+    lignes, colonnes = np.nonzero(deficit > 0)
+    return grid['lat'][lignes], grid['lon'][colonnes], deficit[lignes, colonnes].astype('float64')
+
+
+def coverage_matrix(index_demande, lat_candidats, lon_candidats, rayon_m=RAYON_SERVICE_M):
+    """Matrice creuse candidats x points de demande (1 si le point est dans le rayon)"""
+    voisins = index_demande.within_radius(lat_candidats, lon_candidats, rayon_m)
+    longueurs = np.fromiter((len(v) for v in voisins), dtype='int64', count=len(voisins))
+    indices = np.concatenate([np.asarray(v, dtype='int64') for v in voisins]) if longueurs.sum() else np.empty(0, 'int64')
+    indptr = np.concatenate([[0], np.cumsum(longueurs)])
+    return csr_matrix((np.ones(len(indices), dtype='float64'), indices, indptr),
+                      shape=(len(voisins), len(index_demande)))
+
+
+def lazy_greedy_max_coverage(matrice, poids, n_choix):
+    """Sélectionne n_choix lignes de la matrice maximisant le poids total couvert.
+
+    Retourne les indices choisis et le gain marginal de chacun, dans l'ordre.
+    """
+    couvert = np.zeros(matrice.shape[1], dtype=bool)
+    gains_initiaux = matrice @ poids
+    tas = [(-gain, j) for j, gain in enumerate(gains_initiaux) if gain > 0]
+    heapq.heapify(tas)
+
+    choix, gains = [], []
+    while tas and len(choix) < n_choix:
+        _, j = heapq.heappop(tas)
+        points = matrice.indices[matrice.indptr[j]:matrice.indptr[j + 1]]
+        gain = poids[points][~couvert[points]].sum()
+        if gain <= 0:
+            continue
+        # Borne périmée: le candidat est remis dans le tas avec son gain à jour
+        if tas and gain < -tas[0][0]:
+            heapq.heappush(tas, (-gain, j))
+            continue
+        choix.append(j)
+        gains.append(gain)
+        couvert[points] = True
+    return np.array(choix, dtype='int64'), np.array(gains)
+
+
+def optimize_station_placement(grid, current_data, n_stations=50, rayon_m=RAYON_SERVICE_M):
+    """Choisit jusqu'à n_stations emplacements parmi les cellules en déficit et les centres des communes"""
+    lat_demande, lon_demande, poids = deficit_points(grid)
+    colonnes = ['rang', 'lat', 'lon', 'source', 'commune', 'demande_captee', 'demande_captee_cumulee']
+    if len(poids) == 0:
+        return pd.DataFrame(columns=colonnes)
+
+    lat_candidats = np.concatenate([lat_demande, current_data['lat'].to_numpy()])
+    lon_candidats = np.concatenate([lon_demande, current_data['lon'].to_numpy()])
+    sources = np.array(['Grille'] * len(lat_demande) + ['Commune'] * len(current_data))
+
+    matrice = coverage_matrix(SpatialIndex(lat_demande, lon_demande), lat_candidats, lon_candidats, rayon_m)
+    choix, gains = lazy_greedy_max_coverage(matrice, poids, n_stations)
+
+    _, communes_proches = SpatialIndex(current_data['lat'], current_data['lon']).nearest(
+        lat_candidats[choix], lon_candidats[choix])
+    return pd.DataFrame({
+        'rang': np.arange(1, len(choix) + 1),
+        'lat': lat_candidats[choix],
+        'lon': lon_candidats[choix],
+        'source': sources[choix],
+        'commune': current_data['nom'].astype(str).to_numpy()[communes_proches],
+        'demande_captee': gains,
+        'demande_captee_cumulee': np.cumsum(gains),
+    }, columns=colonnes)
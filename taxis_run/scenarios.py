@@ -0,0 +1,26 @@
+"""Projections du simulateur de développement, partagées par le dashboard et l'API."""
+
+
+def project_simulator(current_data, placement, croissance_tourisme, taux_digitalisation, nouvelles_stations):
+    """Calcule les taxis et la demande projetés pour un jeu de paramètres du simulateur.
+
+    placement est le résultat de optimize_station_placement: les
+    nouvelles_stations premiers emplacements captent la demande non couverte.
+    """
+    placement = placement.head(nouvelles_stations)
+    taxis_actuels = current_data['nombre_taxis'].sum()
+    taxis_projetes = taxis_actuels * (1 + (croissance_tourisme + taux_digitalisation/2)/100)
+    demande_actuelle = current_data['demande_moyenne_journaliere'].sum()
+    demande_captee = placement['demande_captee'].sum()
+    demande_projetee = demande_actuelle * (1 + croissance_tourisme/100) + demande_captee
+
+    return {
+        'taxis_actuels': float(taxis_actuels),
+        'taxis_projetes': float(taxis_projetes),
+        'evolution_taxis_pct': float((taxis_projetes/taxis_actuels - 1) * 100),
+        'demande_actuelle': float(demande_actuelle),
+        'demande_projetee': float(demande_projetee),
+        'evolution_demande_pct': float((demande_projetee/demande_actuelle - 1) * 100),
+        'demande_captee': float(demande_captee),
+        'nouvelles_stations': int(len(placement)),
+    }
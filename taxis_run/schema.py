@@ -0,0 +1,90 @@
+"""Schéma de types compacts pour les tableaux communes, historique et taxiteurs.
+
+Les colonnes à faible cardinalité sont stockées en catégories (codes entiers)
+et les colonnes numériques sont réduites en int32/float32 lorsque la précision
+le permet. Les coordonnées restent en float64 pour les calculs de distance.
+"""
+import pandas as pd
+
+MICRO_REGIONS = pd.CategoricalDtype(['Nord', 'Ouest', 'Sud', 'Est', 'Cirques'])
+NIVEAUX_ACTIVITE = pd.CategoricalDtype(['Limitée', 'Faible', 'Moyen', 'Élevé'], ordered=True)
+COUVERTURES_NUIT = pd.CategoricalDtype(['Nulle', 'Très faible', 'Faible', 'Moyenne', 'Élevée'], ordered=True)
+ACCES_AEROPORT = pd.CategoricalDtype(['Direct', 'Proche', 'Éloigné', 'Très éloigné'], ordered=True)
+CONTRATS = pd.CategoricalDtype(['Indépendant', 'Salarié', 'Portage', 'Coopérative'])
+FORMATIONS = pd.CategoricalDtype(['CAP/BEP', 'Bac', 'Bac+2', 'Bac+3', 'Supérieur'], ordered=True)
+
+COMMUNES_SCHEMA = {
+    'nom': 'category',
+    'micro_region': MICRO_REGIONS,
+    'population': 'int32',
+    'nombre_taxis': 'int32',
+    'nombre_taxiteurs': 'int32',
+    'taux_activite': NIVEAUX_ACTIVITE,
+    'demande_moyenne_journaliere': 'int32',
+    'revenu_moyen_mensuel': 'int32',
+    'stations_principales': 'int16',
+    'taux_occupation': 'float32',
+    'couverture_nuit': COUVERTURES_NUIT,
+    'acces_aeroport': ACCES_AEROPORT,
+    'lat': 'float64',
+    'lon': 'float64',
+    'taxis_10k_hab': 'float32',
+    'taxiteurs_10k_hab': 'float32',
+    'taxiteurs_par_taxi': 'float32',
+    'demande_par_taxi': 'float32',
+    'demande_par_taxiteur': 'float32',
+    'demande_1k_hab': 'float32',
+    'distance_aeroport_km': 'float32',
+    'distance_station_km': 'float32',
+}
+
+HISTORY_SCHEMA = {
+    'date': 'datetime64[ns]',
+    'commune': 'category',
+    'micro_region': MICRO_REGIONS,
+    'nombre_taxis': 'float32',
+    'demande_moyenne_journaliere': 'float32',
+    'revenu_moyen_mensuel': 'float32',
+}
+
+DRIVERS_SCHEMA = {
+    'id_taxiteur': 'uint32',
+    'commune': 'category',
+    'micro_region': MICRO_REGIONS,
+    'age': 'uint8',
+    'anciennete': 'uint8',
+    'heures_hebdo': 'uint8',
+    'contrat': CONTRATS,
+    'formation': FORMATIONS,
+    'langues': 'uint8',
+}
+
+
+def apply_schema(df, schema):
+    """Convertit les colonnes présentes selon le schéma (les autres sont inchangées)"""
+    conversions = {}
+    for colonne, dtype in schema.items():
+        if colonne not in df.columns:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype) and dtype.categories is not None:
+            inconnues = set(df[colonne].dropna().unique()) - set(dtype.categories)
+            if inconnues:
+                raise ValueError(f"Valeurs inconnues pour '{colonne}': {sorted(map(str, inconnues))}")
+        conversions[colonne] = dtype
+    return df.astype(conversions)
+
+
+def memory_report(frames):
+    """Retourne l'empreinte mémoire de chaque tableau (dict nom -> DataFrame)"""
+    lignes = []
+    for nom, df in frames.items():
+        octets = int(df.memory_usage(index=True, deep=True).sum())
+        lignes.append({
+            'tableau': nom,
+            'lignes': len(df),
+            'colonnes': df.shape[1],
+            'colonnes_categorielles': int((df.dtypes == 'category').sum()),
+            'memoire_ko': octets / 1024,
+            'octets_par_ligne': octets / len(df) if len(df) else 0.0,
+        })
+    return pd.DataFrame(lignes)
@@ -0,0 +1,176 @@
+"""Agrégation en flux des journaux de service (taxiteur, début, fin).
+
+Les journaux d'une année ne tiennent pas en mémoire: ils sont lus par blocs
+(générateurs), et chaque bloc est versé dans un accumulateur dense
+taxiteur x semaine d'heures travaillées (float32). Les identifiants (numéros
+de licence, chaînes...) sont ramenés à des numéros de ligne compacts dans
+l'ordre de première apparition; les colonnes sont les numéros absolus de
+semaine. La mémoire est bornée par le nombre de taxiteurs distincts et de
+semaines couverts, quels que soient les identifiants et le nombre de services
+lus. La distribution des heures hebdomadaires (<35h...>65h)
+est émise après chaque bloc.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from taxis_run.drivers import bracket_distribution
+from taxis_run.versioning import LONGUEUR_JETON, hash_records
+
+COLONNES = ['id_taxiteur', 'debut', 'fin']
+EXTENSIONS_JOURNAUX = ('.csv', '.parquet')
+TAILLE_BLOC = 500_000
+# Un service plus long est considéré comme une erreur de saisie
+DUREE_MAX = pd.Timedelta('24h')
+# Lundi de référence des numéros de semaine
+ORIGINE = pd.Timestamp('1970-01-05')
+SEMAINE = pd.Timedelta('7D')
+
+
+def shift_log_files(dossier):
+    """Fichiers de journaux de service (.csv, .parquet) d'un dossier, par ordre de nom"""
+    if not dossier or not os.path.isdir(dossier):
+        return []
+    return sorted(os.path.join(dossier, nom) for nom in os.listdir(dossier)
+                  if os.path.splitext(nom)[1].lower() in EXTENSIONS_JOURNAUX)
+
+
+def shift_logs_token(paths):
+    """Jeton des journaux (nom, taille, date de modification), sans les relire"""
+    etats = [(os.path.abspath(p), os.stat(p).st_size, os.stat(p).st_mtime_ns) for p in paths]
+    return hash_records(etats)[:LONGUEUR_JETON]
+
+
+def read_shift_chunks(paths, taille_bloc=TAILLE_BLOC):
+    """Blocs de taille_bloc services au plus, fichier après fichier"""
+    for path in paths:
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.csv':
+            for bloc in pd.read_csv(path, usecols=COLONNES, parse_dates=['debut', 'fin'], chunksize=taille_bloc):
+                yield bloc
+        elif extension == '.parquet':
+            import pyarrow.parquet as pq
+            for lot in pq.ParquetFile(path).iter_batches(batch_size=taille_bloc, columns=COLONNES):
+                yield lot.to_pandas()
+        else:
+            raise ValueError(f"Format de fichier non pris en charge: {path}")
+
+
+def synthetic_shift_chunks(drivers, debut, semaines=52, seed=0):
+    """Services synthétiques, un bloc par semaine, autour des heures hebdomadaires du registre"""
+    rng = np.random.default_rng(seed)
+    ids = drivers['id_taxiteur'].to_numpy()
+    cible = drivers['heures_hebdo'].to_numpy(dtype='float64')
+    lundi = ORIGINE + (pd.Timestamp(debut) - ORIGINE) // SEMAINE * SEMAINE
+    for semaine in range(semaines):
+        # Semaines de congé, puis 5 à 7 jours travaillés se partageant les heures de la semaine
+        actifs = rng.random(len(ids)) >= 0.06
+        travailles = rng.random((len(ids), 7)) < np.where(cible > 55, 0.9, 0.75)[:, None]
+        travailles &= actifs[:, None]
+        taxiteur, jour = np.nonzero(travailles)
+        heures = cible * rng.lognormal(0, 0.08, len(ids)) / np.maximum(travailles.sum(axis=1), 1)
+        heures = np.minimum(heures, 14)
+        depart = lundi + semaine * SEMAINE + pd.to_timedelta(jour, unit='D') \
+            + pd.to_timedelta(np.clip(rng.normal(6.5, 2.5, len(jour)), 0, 20), unit='h')
+        yield pd.DataFrame({
+            'id_taxiteur': ids[taxiteur],
+            'debut': depart.round('min'),
+            'fin': (depart + pd.to_timedelta(heures[taxiteur], unit='h')).round('min'),
+        })
+
+
+def _nanoseconds(instants):
+    """Instants en entiers (ns depuis l'époque); cache=False évite un parcours élément par élément"""
+    return np.asarray(pd.to_datetime(instants, cache=False), dtype='datetime64[ns]').view('int64')
+
+
+class WeeklyHoursAccumulator:
+    """Heures travaillées par taxiteur et par semaine, dans une matrice dense qui s'agrandit au besoin.
+
+    La ligne d'un taxiteur est la position de son identifiant dans
+    self.identifiants (identifiants rencontrés, dans l'ordre d'apparition).
+    """
+
+    def __init__(self):
+        self.heures = np.zeros((0, 0), dtype='float32')
+        self.identifiants = pd.Index([], name='id_taxiteur')
+        self.semaine0 = 0
+        self.services = 0
+        self.rejetes = 0
+
+    def _rows(self, ids):
+        """Numéros de ligne des identifiants, les nouveaux étant ajoutés à la suite"""
+        lignes = self.identifiants.get_indexer(ids)
+        nouveaux = lignes < 0
+        if nouveaux.any():
+            ajout = pd.Index(pd.unique(ids[nouveaux]), name='id_taxiteur')
+            # Premier bloc: le type des identifiants est celui du journal
+            self.identifiants = self.identifiants.append(ajout) if len(self.identifiants) else ajout
+            lignes[nouveaux] = self.identifiants.get_indexer(ids[nouveaux])
+        return lignes
+
+    def _reserve(self, n_lignes, semaine_min, semaine_max):
+        """Agrandit la matrice pour couvrir n_lignes taxiteurs et les semaines [semaine_min, semaine_max]"""
+        lignes, colonnes = self.heures.shape
+        if colonnes == 0:
+            self.semaine0 = semaine_min
+        avant = max(self.semaine0 - semaine_min, 0)
+        apres = max(semaine_max - (self.semaine0 + colonnes - 1), 0)
+        # Capacité doublée pour amortir les agrandissements successifs
+        supplement = max(n_lignes - lignes, 0)
+        if supplement:
+            supplement = max(supplement, lignes)
+        if avant or apres or supplement:
+            self.heures = np.pad(self.heures, ((0, supplement), (avant, apres)))
+            self.semaine0 -= avant
+
+    def add(self, ids, debut, fin):
+        """Verse un bloc de services; un service à cheval sur deux semaines est réparti entre elles"""
+        ids = pd.Series(ids).to_numpy()
+        debut = _nanoseconds(debut)
+        fin = _nanoseconds(fin)
+        valides = (fin > debut) & (fin - debut <= DUREE_MAX.value) & ~pd.isna(ids)
+        self.rejetes += int((~valides).sum())
+        self.services += int(valides.sum())
+        ids, debut, fin = ids[valides], debut[valides], fin[valides]
+        if len(ids) == 0:
+            return
+
+        semaine_debut = (debut - ORIGINE.value) // SEMAINE.value
+        semaine_fin = (fin - ORIGINE.value) // SEMAINE.value
+        lignes_taxiteurs = self._rows(ids)
+        self._reserve(len(self.identifiants), int(semaine_debut.min()), int(semaine_fin.max()))
+        # Heures avant et après la limite de semaine (nulles après si le service n'est pas à cheval)
+        limite = np.minimum(ORIGINE.value + (semaine_debut + 1) * SEMAINE.value, fin)
+        heure = pd.Timedelta('1h').value
+        colonnes = self.heures.shape[1]
+        positions = np.concatenate([lignes_taxiteurs * colonnes + semaine_debut - self.semaine0,
+                                    lignes_taxiteurs * colonnes + semaine_fin - self.semaine0])
+        poids = np.concatenate([(limite - debut) / heure, (fin - limite) / heure])
+        # Seules les cases touchées par le bloc sont mises à jour (vue à plat de la matrice contiguë)
+        np.add.at(self.heures.reshape(-1), positions, poids.astype('float32'))
+
+    def weeks(self):
+        """Lundis des semaines couvertes"""
+        return ORIGINE + (self.semaine0 + np.arange(self.heures.shape[1])) * SEMAINE
+
+    def driver_hours(self):
+        """Moyenne des heures hebdomadaires de chaque taxiteur sur ses semaines travaillées"""
+        actives = self.heures > 0
+        n_semaines = actives.sum(axis=1)
+        lignes = np.flatnonzero(n_semaines)
+        return pd.Series(self.heures[lignes].sum(axis=1) / n_semaines[lignes], index=self.identifiants[lignes],
+                         name='heures_hebdo')
+
+    def distribution(self):
+        """Répartition des taxiteurs par tranche d'heures hebdomadaires (<35h...>65h)"""
+        return bracket_distribution(self.driver_hours(), 'heures_hebdo')
+
+
+def stream_weekly_hours(blocs, accumulateur=None):
+    """Consomme les blocs de services et émet (services lus, distribution) après chacun"""
+    accumulateur = accumulateur or WeeklyHoursAccumulator()
+    for bloc in blocs:
+        accumulateur.add(bloc['id_taxiteur'], bloc['debut'], bloc['fin'])
+        yield accumulateur.services, accumulateur.distribution()
@@ -0,0 +1,187 @@
+"""Simulation à événements discrets d'une journée de service taxi.
+
+Les demandes de course arrivent dans chaque commune selon un processus de
+Poisson (total journalier = demande_moyenne_journaliere, réparti selon un
+profil horaire). Chaque demande est affectée au taxi libre le plus proche;
+à défaut elle attend dans une file jusqu'à ce qu'un taxi se libère ou que le
+client abandonne. Les événements sont ordonnés dans un tas (heapq) et l'état
+des véhicules est stocké dans des tableaux NumPy.
+
+Les réplications sont indépendantes et exécutées en parallèle sur plusieurs
+processus, chacune avec sa propre graine dérivée d'un SeedSequence. Le pool
+de processus est créé une fois (méthode spawn: l'appelant, script Streamlit
+ou serveur HTTP, a déjà des threads) et réutilisé par toutes les simulations.
+"""
+import heapq
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from taxis_run.coverage import commune_sigmas, taxis_outside_stations
+from taxis_run.spatial import project
+
+# Poids horaires de la demande (0h -> 23h)
+PROFIL_HORAIRE = np.array([
+    0.4, 0.3, 0.2, 0.2, 0.4, 1.2, 2.6, 3.8, 3.4, 2.4, 2.2, 2.6,
+    3.0, 2.6, 2.2, 2.4, 3.0, 3.6, 3.4, 2.6, 1.8, 1.4, 1.0, 0.6,
+])
+DUREE_JOURNEE_MIN = 24 * 60
+VITESSE_M_PAR_MIN = 500.0
+DUREE_COURSE_MOYENNE_MIN = 18.0
+PATIENCE_MIN = 20.0
+RAYON_APPROCHE_MAX_M = 15000.0
+
+ARRIVEE, FIN_COURSE, ABANDON = 0, 1, 2
+EN_ATTENTE, SERVIE, ABANDONNEE = 0, 1, 2
+
+
+def build_simulation_model(current_data, stations, facteur_flotte=1.0, facteur_demande=1.0):
+    """Prépare les tableaux d'entrée de la simulation (sérialisables vers les processus)"""
+    communes = current_data['nom'].astype(str).to_numpy()
+    code_commune = {nom: i for i, nom in enumerate(communes)}
+    communes_xy = project(current_data['lat'], current_data['lon'])
+
+    # Flotte: taxis des stations, puis taxis hors station au centre de leur commune
+    taxis_station = np.round(stations['nombre_taxis'].to_numpy(dtype='float64') * facteur_flotte).astype('int64')
+    taxis_hors_station = np.round(taxis_outside_stations(current_data, stations) * facteur_flotte).astype('int64')
+    stations_xy = project(stations['lat'], stations['lon'])
+    stations_commune = stations['commune'].astype(str).map(code_commune).fillna(-1).to_numpy(dtype='int64')
+
+    return {
+        'communes': communes,
+        'communes_xy': communes_xy,
+        'sigmas': commune_sigmas(current_data['population']),
+        'demande': current_data['demande_moyenne_journaliere'].to_numpy(dtype='float64') * facteur_demande,
+        'taxis_xy': np.vstack([np.repeat(stations_xy, taxis_station, axis=0),
+                               np.repeat(communes_xy, taxis_hors_station, axis=0)]),
+        'taxis_commune': np.concatenate([np.repeat(stations_commune, taxis_station),
+                                         np.repeat(np.arange(len(communes)), taxis_hors_station)]),
+    }
+
+
+def _generate_requests(model, rng):
+    """Tire les demandes de la journée: instants (min), commune et position, triés par instant"""
+    nombres = rng.poisson(model['demande'])
+    commune = np.repeat(np.arange(len(nombres)), nombres)
+    heures = rng.choice(24, size=len(commune), p=PROFIL_HORAIRE / PROFIL_HORAIRE.sum())
+    instants = (heures + rng.random(len(commune))) * 60.0
+    positions = model['communes_xy'][commune] + rng.normal(size=(len(commune), 2)) * model['sigmas'][commune, None]
+    ordre = np.argsort(instants, kind='stable')
+    return instants[ordre], commune[ordre], positions[ordre]
+
+
+def simulate_day(model, seed=None):
+    """Simule une journée et retourne les indicateurs bruts par commune (dict de tableaux)"""
+    rng = np.random.default_rng(seed)
+    instants, commune, positions = _generate_requests(model, rng)
+    n_demandes = len(instants)
+
+    # État des véhicules
+    taxis_x = model['taxis_xy'][:, 0]
+    taxis_y = model['taxis_xy'][:, 1]
+    libre = np.ones(len(taxis_x), dtype=bool)
+    minutes_occupees = np.zeros(len(taxis_x))
+
+    # État des demandes
+    statut = np.full(n_demandes, EN_ATTENTE, dtype='int8')
+    attente = np.full(n_demandes, np.nan)
+    file_attente = []
+
+    evenements = [(t, ARRIVEE, i) for i, t in enumerate(instants)]
+    heapq.heapify(evenements)
+
+    def dispatch(taxi, demande, maintenant, distance):
+        approche = distance / VITESSE_M_PAR_MIN
+        occupation = 2 * approche + rng.exponential(DUREE_COURSE_MOYENNE_MIN)
+        libre[taxi] = False
+        minutes_occupees[taxi] += min(occupation, DUREE_JOURNEE_MIN - maintenant)
+        statut[demande] = SERVIE
+        attente[demande] = maintenant - instants[demande] + approche
+        heapq.heappush(evenements, (maintenant + occupation, FIN_COURSE, taxi))
+
+    while evenements:
+        maintenant, nature, ident = heapq.heappop(evenements)
+
+        if nature == ARRIVEE:
+            distances = np.hypot(taxis_x - positions[ident, 0], taxis_y - positions[ident, 1])
+            distances[~libre] = np.inf
+            taxi = int(np.argmin(distances)) if len(distances) else -1
+            if taxi >= 0 and distances[taxi] <= RAYON_APPROCHE_MAX_M:
+                dispatch(taxi, ident, maintenant, distances[taxi])
+            else:
+                file_attente.append(ident)
+                heapq.heappush(evenements, (maintenant + PATIENCE_MIN, ABANDON, ident))
+
+        elif nature == FIN_COURSE:
+            libre[ident] = True
+            file_attente = [d for d in file_attente if statut[d] == EN_ATTENTE]
+            if file_attente:
+                en_file = np.asarray(file_attente)
+                distances = np.hypot(positions[en_file, 0] - taxis_x[ident], positions[en_file, 1] - taxis_y[ident])
+                eligibles = np.flatnonzero(distances <= RAYON_APPROCHE_MAX_M)
+                if len(eligibles):
+                    # La file est ordonnée par arrivée: on sert le client éligible le plus ancien
+                    rang = eligibles[0]
+                    dispatch(ident, en_file[rang], maintenant, distances[rang])
+                    del file_attente[rang]
+
+        elif statut[ident] == EN_ATTENTE:
+            statut[ident] = ABANDONNEE
+
+    n_communes = len(model['communes'])
+    servies = statut == SERVIE
+    return {
+        'demandes': np.bincount(commune, minlength=n_communes),
+        'servies': np.bincount(commune, weights=servies, minlength=n_communes),
+        'attente_totale': np.bincount(commune[servies], weights=attente[servies], minlength=n_communes),
+        'attente_p90': np.array([
+            np.percentile(attente[servies & (commune == c)], 90) if np.any(servies & (commune == c)) else np.nan
+            for c in range(n_communes)
+        ]),
+        'minutes_occupees': np.bincount(model['taxis_commune'], weights=minutes_occupees, minlength=n_communes),
+        'taxis': np.bincount(model['taxis_commune'], minlength=n_communes),
+    }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def simulation_pool(max_workers):
+    """Pool de processus partagé de max_workers processus, créé au premier appel"""
+    with _pools_lock:
+        if max_workers not in _pools:
+            _pools[max_workers] = ProcessPoolExecutor(max_workers,
+                                                      mp_context=multiprocessing.get_context('spawn'))
+        return _pools[max_workers]
+
+
+def run_replications(model, n_replications=8, seed=None, max_workers=None):
+    """Exécute n réplications indépendantes (en parallèle) et agrège les résultats par commune"""
+    graines = np.random.SeedSequence(seed).spawn(n_replications)
+    max_workers = max_workers or os.cpu_count() or 1
+    if n_replications == 1 or max_workers == 1:
+        resultats = [simulate_day(model, graine) for graine in graines]
+    else:
+        resultats = list(simulation_pool(max_workers).map(simulate_day, [model] * n_replications, graines))
+
+    empiles = {cle: np.stack([r[cle] for r in resultats]) for cle in resultats[0]}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        occupation = empiles['minutes_occupees'] / (empiles['taxis'] * DUREE_JOURNEE_MIN) * 100
+        attente_moyenne = empiles['attente_totale'] / empiles['servies']
+        taux_service = empiles['servies'] / empiles['demandes'] * 100
+
+    return pd.DataFrame({
+        'commune': model['communes'],
+        'demandes_simulees': empiles['demandes'].mean(axis=0),
+        'taux_service': np.nanmean(taux_service, axis=0),
+        'attente_moyenne_min': np.nanmean(attente_moyenne, axis=0),
+        'attente_p90_min': np.nanmean(empiles['attente_p90'], axis=0),
+        'taux_occupation_simule': np.nanmean(occupation, axis=0),
+        'taux_occupation_ecart_type': np.nanstd(occupation, axis=0),
+        'replications': n_replications,
+    })
@@ -0,0 +1,86 @@
+"""Index spatial pour les requêtes de proximité stations / communes.
+
+Les coordonnées GPS sont projetées en mètres (projection équirectangulaire
+locale centrée sur La Réunion, erreur négligeable à l'échelle de l'île) puis
+indexées dans un KD-tree. Toutes les requêtes acceptent des lots de points.
+"""
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+RAYON_TERRE_M = 6371008.8
+ORIGINE_REUNION = (-21.115, 55.536)
+
+
+def project(lat, lon, origine=ORIGINE_REUNION):
+    """Projette des coordonnées (degrés) en mètres, retourne un tableau (n, 2)"""
+    lat = np.asarray(lat, dtype='float64')
+    lon = np.asarray(lon, dtype='float64')
+    lat0, lon0 = np.radians(origine[0]), np.radians(origine[1])
+    x = (np.radians(lon) - lon0) * np.cos(lat0) * RAYON_TERRE_M
+    y = (np.radians(lat) - lat0) * RAYON_TERRE_M
+    return np.column_stack([x, y])
+
+
+def unproject(xy, origine=ORIGINE_REUNION):
+    """Inverse de project(), retourne (lat, lon) en degrés"""
+    xy = np.asarray(xy, dtype='float64')
+    lat0, lon0 = np.radians(origine[0]), np.radians(origine[1])
+    lat = np.degrees(xy[:, 1] / RAYON_TERRE_M + lat0)
+    lon = np.degrees(xy[:, 0] / (RAYON_TERRE_M * np.cos(lat0)) + lon0)
+    return lat, lon
+
+
+class SpatialIndex:
+    """KD-tree sur coordonnées projetées, avec requêtes vectorisées par lots"""
+
+    def __init__(self, lat, lon, workers=-1):
+        self.points = project(lat, lon)
+        self.tree = cKDTree(self.points)
+        self.workers = workers
+
+    def __len__(self):
+        return len(self.points)
+
+    def nearest(self, lat, lon):
+        """Plus proche point indexé: retourne (distances en m, indices)"""
+        distances, indices = self.tree.query(project(lat, lon), k=1, workers=self.workers)
+        return distances, indices
+
+    def k_nearest(self, lat, lon, k):
+        """k plus proches points: tableaux (n, k) de distances en m et d'indices"""
+        k = min(k, len(self))
+        distances, indices = self.tree.query(project(lat, lon), k=k, workers=self.workers)
+        if k == 1:
+            distances, indices = distances[:, None], indices[:, None]
+        return distances, indices
+
+    def within_radius(self, lat, lon, rayon_m):
+        """Indices des points indexés situés à moins de rayon_m de chaque requête"""
+        return self.tree.query_ball_point(project(lat, lon), r=rayon_m, workers=self.workers)
+
+    def count_within_radius(self, lat, lon, rayon_m):
+        """Nombre de points indexés à moins de rayon_m de chaque requête"""
+        return self.tree.query_ball_point(project(lat, lon), r=rayon_m, workers=self.workers,
+                                          return_length=True)
+
+
+def add_proximity_metrics(current_data, stations):
+    """Ajoute les distances à l'aéroport et à la station la plus proche pour chaque commune"""
+    lat = current_data['lat'].to_numpy()
+    lon = current_data['lon'].to_numpy()
+
+    index_stations = SpatialIndex(stations['lat'], stations['lon'])
+    distances_station, indices_station = index_stations.nearest(lat, lon)
+
+    aeroports = stations[stations['type'] == 'Aéroport']
+    if len(aeroports):
+        distances_aeroport, _ = SpatialIndex(aeroports['lat'], aeroports['lon']).nearest(lat, lon)
+    else:
+        distances_aeroport = np.full(len(current_data), np.nan)
+
+    return current_data.assign(
+        distance_aeroport_km=distances_aeroport / 1000,
+        distance_station_km=distances_station / 1000,
+        station_la_plus_proche=pd.Categorical(stations['nom'].to_numpy()[indices_station]),
+    )
@@ -0,0 +1,163 @@
+"""Console SQL sur les données du dashboard (moteur colonnaire embarqué DuckDB).
+
+Tables exposées:
+- historique: vue sur l'historique Parquet partitionné (annee=/mois=), lue
+  directement par le moteur: seules les colonnes citées sont décodées, les
+  filtres sont poussés dans la lecture et les partitions hors filtre ne sont
+  pas ouvertes (voir EXPLAIN);
+- communes, stations, taxiteurs: copies des tables du dashboard.
+
+Les tables sont écrites dans une base DuckDB rouverte en lecture seule: toute
+écriture (DELETE, UPDATE, CREATE...) échoue dans le moteur, y compris sous un
+EXPLAIN ANALYZE. L'accès aux fichiers est ensuite limité au dossier de
+l'historique et la configuration verrouillée: une requête ne peut ni lire
+d'autres fichiers, ni charger d'extension. Seule une instruction SELECT est
+acceptée (le plan d'exécution s'obtient par explain, qui ajoute lui-même
+EXPLAIN); le résultat est tronqué à lignes_max lignes et la requête
+interrompue au-delà de delai_s secondes.
+
+Sans dossier partitionné (historique CSV ou intégré), l'historique est écrit
+une fois par version des données au format partitionné dans
+TAXIS_RUN_SQL_DIR (à défaut le dossier temporaire du système).
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from taxis_run.history_store import HistoryStore
+
+LIGNES_MAX = 5000
+DELAI_S = 10
+INSTRUCTIONS_AUTORISEES = ('SELECT',)
+EXEMPLES = {
+    "Demande par type de station et par mois": """\
+SELECT s.type,
+       date_trunc('month', h.date) AS mois,
+       count(DISTINCT s.nom) AS stations,
+       round(sum(h.demande_moyenne_journaliere)) AS demande_journaliere
+FROM historique h
+JOIN stations s ON s.commune = h.commune
+WHERE h.annee >= 2022
+GROUP BY ALL
+ORDER BY mois, s.type""",
+    "Évolution annuelle de la demande par taxi (baisses en tête)": """\
+SELECT commune, annee, demande_par_taxi, variation_pct
+FROM (
+    SELECT commune, annee,
+           round(demande_moyenne_journaliere / nombre_taxis, 1) AS demande_par_taxi,
+           round(100 * (demande_moyenne_journaliere / nombre_taxis)
+                 / lag(demande_moyenne_journaliere / nombre_taxis) OVER (PARTITION BY commune ORDER BY date) - 100, 1)
+               AS variation_pct
+    FROM historique
+)
+WHERE variation_pct IS NOT NULL
+ORDER BY variation_pct, annee DESC""",
+    "Taxiteurs par contrat et micro-région": """\
+SELECT micro_region, contrat, count(*) AS taxiteurs, round(avg(heures_hebdo), 1) AS heures_hebdo
+FROM taxiteurs
+GROUP BY ALL
+ORDER BY micro_region, taxiteurs DESC""",
+}
+
+
+def _quoted(texte):
+    return "'" + texte.replace("'", "''") + "'"
+
+
+def history_parquet_dir(data, racine=None):
+    """Dossier partitionné de l'historique: celui des sources, sinon écrit une fois par version"""
+    if data.history_store is not None:
+        return os.path.abspath(data.history_store.dossier)
+    racine = racine or os.environ.get('TAXIS_RUN_SQL_DIR') or os.path.join(tempfile.gettempdir(), 'taxis_run_sql')
+    dossier = os.path.abspath(os.path.join(racine, data.version.token('historique')))
+    if not HistoryStore.exists(dossier):
+        # Écriture dans un dossier temporaire renommé à la fin: jamais d'historique à moitié écrit
+        os.makedirs(racine, exist_ok=True)
+        temporaire = tempfile.mkdtemp(prefix='generation-', dir=racine)
+        HistoryStore(temporaire).append(data.historical_data)
+        try:
+            os.replace(temporaire, dossier)
+        except OSError:
+            # Un autre processus a terminé la même écriture entre-temps
+            shutil.rmtree(temporaire, ignore_errors=True)
+    return dossier
+
+
+class QueryEngine:
+    """Connexion DuckDB en mémoire sur l'historique Parquet et les tables du dashboard"""
+
+    def __init__(self, dossier_historique, tables):
+        import duckdb
+
+        self.duckdb = duckdb
+        dossier = tempfile.mkdtemp(prefix='taxis_run_sql-')
+        base = os.path.join(dossier, 'console.duckdb')
+        with duckdb.connect(base) as construction:
+            for nom, frame in tables.items():
+                construction.register('_source', frame)
+                construction.execute(f"CREATE TABLE {nom} AS SELECT * FROM _source")
+                construction.unregister('_source')
+            fichiers = os.path.join(dossier_historique, '**', '*.parquet')
+            construction.execute(f"CREATE VIEW historique AS SELECT * FROM "
+                                 f"read_parquet({_quoted(fichiers)}, hive_partitioning = true)")
+        self.connexion = duckdb.connect(base, read_only=True)
+        # La connexion ouverte garde le fichier lisible (sous Windows il reste en place)
+        shutil.rmtree(dossier, ignore_errors=True)
+        self.connexion.execute(f"SET allowed_directories = [{_quoted(dossier_historique)}]")
+        self.connexion.execute("SET enable_external_access = false")
+        self.connexion.execute("SET lock_configuration = true")
+
+    def schema(self):
+        """Colonnes des tables exposées: table, colonne, type"""
+        return self.connexion.cursor().sql(
+            "SELECT table_name AS table, column_name AS colonne, data_type AS type "
+            "FROM information_schema.columns ORDER BY table_name, ordinal_position").df()
+
+    def check(self, requete):
+        """Refuse tout ce qui n'est pas une unique instruction SELECT (EXPLAIN compris)"""
+        instructions = self.duckdb.extract_statements(requete)
+        if len(instructions) != 1:
+            raise ValueError("Une seule instruction par requête")
+        nature = instructions[0].type.name
+        if nature not in INSTRUCTIONS_AUTORISEES:
+            raise ValueError(f"Instruction non autorisée: {nature} (lecture seule: SELECT)")
+
+    def run(self, requete, lignes_max=LIGNES_MAX, delai_s=DELAI_S):
+        """Exécute la requête: (résultat d'au plus lignes_max lignes, tronqué, durée en ms)"""
+        self.check(requete)
+        curseur = self.connexion.cursor()
+        minuterie = threading.Timer(delai_s, curseur.interrupt)
+        debut = time.perf_counter()
+        minuterie.start()
+        try:
+            resultat = curseur.sql(requete).limit(lignes_max + 1).df()
+        except self.duckdb.InterruptException:
+            raise TimeoutError(f"Requête interrompue après {delai_s} s") from None
+        finally:
+            minuterie.cancel()
+            curseur.close()
+        duree = (time.perf_counter() - debut) * 1000
+        tronque = len(resultat) > lignes_max
+        return resultat.head(lignes_max), tronque, duree
+
+    def explain(self, requete):
+        """Plan physique de la requête (projections, filtres poussés, fichiers lus)"""
+        self.check(requete)
+        plan = self.connexion.cursor().sql(f"EXPLAIN {requete}").df()
+        return '\n'.join(plan['explain_value'])
+
+
+def query_engine(data):
+    """Moteur de requêtes sur les tables d'une version des données"""
+    return QueryEngine(history_parquet_dir(data), {
+        'communes': data.current_data,
+        'stations': data.taxi_stations_data,
+        'taxiteurs': data.drivers_data,
+    })
+
+
+def normalize_query(requete):
+    """Texte de requête sans blancs ni point-virgule aux extrémités (clé de cache)"""
+    return requete.strip().rstrip(';').rstrip()
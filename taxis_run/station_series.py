@@ -0,0 +1,221 @@
+"""Séries temporelles par station: occupation et file d'attente au pas de 5 minutes.
+
+Chaque mesure est une matrice station x temps en float32 stockée dans un
+fichier mappé en mémoire (np.memmap), une ligne par station. La grille de
+temps est régulière: une plage de dates se traduit en indices par simple
+arithmétique, et la lecture d'une plage pour quelques stations ne charge que
+les pages correspondantes du fichier. Les agrégations temporelles (heure,
+jour...) se font par remodelage des blocs, sans copie des lignes non lues.
+
+En l'absence de relevés réels, un réseau de stations secondaires et des séries
+synthétiques (profil horaire de la demande, effet du jour de la semaine,
+bruit lissé) sont générés une fois par version des données.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+from scipy.ndimage import uniform_filter1d
+
+from taxis_run.coverage import commune_sigmas
+from taxis_run.simulation import PROFIL_HORAIRE
+from taxis_run.spatial import project, unproject
+
+PAS = pd.Timedelta('5min')
+MESURES = ('occupation', 'file_attente')
+FICHIER_META = 'series.json'
+AGREGATIONS = {'mean': np.nanmean, 'max': np.nanmax, 'min': np.nanmin, 'sum': np.nansum}
+# Charge relative par jour de la semaine (lundi -> dimanche)
+PROFIL_HEBDOMADAIRE = np.array([1.0, 1.0, 1.0, 1.02, 1.1, 0.9, 0.75])
+
+
+class StationSeriesStore:
+    """Matrices station x temps (float32, mémoire mappée) d'un réseau de stations"""
+
+    def __init__(self, dossier, mode='r'):
+        with open(os.path.join(dossier, FICHIER_META), encoding='utf-8') as fichier:
+            meta = json.load(fichier)
+        self.dossier = dossier
+        self.stations = pd.DataFrame(meta['stations'])
+        self.debut = pd.Timestamp(meta['debut'])
+        self.pas = pd.Timedelta(meta['pas'])
+        self.n_pas = meta['n_pas']
+        self._positions = pd.Index(self.stations['nom'])
+        self.series = {
+            mesure: np.memmap(os.path.join(dossier, f"{mesure}.f32"), dtype='float32', mode=mode,
+                              shape=(len(self.stations), self.n_pas))
+            for mesure in meta['mesures']
+        }
+
+    @classmethod
+    def create(cls, dossier, stations, debut, n_pas, pas=PAS, mesures=MESURES):
+        """Crée un magasin vide (valeurs NaN) et le retourne ouvert en écriture"""
+        os.makedirs(dossier, exist_ok=True)
+        meta = {
+            'stations': stations.to_dict(orient='records'),
+            'debut': pd.Timestamp(debut).isoformat(),
+            'pas': str(pd.Timedelta(pas)),
+            'n_pas': int(n_pas),
+            'mesures': list(mesures),
+        }
+        for mesure in mesures:
+            serie = np.memmap(os.path.join(dossier, f"{mesure}.f32"), dtype='float32', mode='w+',
+                              shape=(len(stations), n_pas))
+            serie[:] = np.nan
+            serie.flush()
+        with open(os.path.join(dossier, FICHIER_META), 'w', encoding='utf-8') as fichier:
+            json.dump(meta, fichier, ensure_ascii=False, default=str)
+        return cls(dossier, mode='r+')
+
+    @property
+    def fin(self):
+        return self.debut + self.pas * self.n_pas
+
+    @property
+    def nbytes(self):
+        return sum(serie.nbytes for serie in self.series.values())
+
+    def time_slice(self, debut=None, fin=None):
+        """Indices [début, fin) de la grille de temps couvrant la plage demandée (bornée au magasin)"""
+        i0 = 0 if debut is None else (pd.Timestamp(debut) - self.debut) // self.pas
+        i1 = self.n_pas if fin is None else -((self.debut - pd.Timestamp(fin)) // self.pas)
+        return slice(int(np.clip(i0, 0, self.n_pas)), int(np.clip(i1, 0, self.n_pas)))
+
+    def station_positions(self, stations=None):
+        """Lignes des stations demandées (toutes si None)"""
+        if stations is None:
+            return np.arange(len(self._positions))
+        positions = self._positions.get_indexer(list(stations))
+        if (positions < 0).any():
+            inconnues = [s for s, p in zip(stations, positions) if p < 0]
+            raise KeyError(f"Stations inconnues: {inconnues}")
+        return positions
+
+    def instants(self, tranche):
+        return pd.date_range(self.debut + tranche.start * self.pas, periods=tranche.stop - tranche.start,
+                             freq=self.pas)
+
+    def query(self, mesure, stations=None, debut=None, fin=None):
+        """Valeurs brutes (stations x pas) de la plage demandée et instants correspondants"""
+        if mesure not in self.series:
+            raise ValueError(f"Mesure inconnue: {mesure}")
+        tranche = self.time_slice(debut, fin)
+        positions = self.station_positions(stations)
+        return self.instants(tranche), self.series[mesure][positions, tranche]
+
+    def frame(self, mesure, stations=None, debut=None, fin=None):
+        """Plage demandée sous forme de DataFrame (index temps, une colonne par station)"""
+        instants, valeurs = self.query(mesure, stations, debut, fin)
+        noms = self._positions[self.station_positions(stations)]
+        return pd.DataFrame(valeurs.T, index=instants, columns=noms)
+
+    def rollup(self, mesure, frequence='1h', agregation='mean', stations=None, debut=None, fin=None):
+        """Agrégation temporelle par blocs de frequence (multiple du pas): index temps, une colonne par station"""
+        facteur = pd.Timedelta(frequence) // self.pas
+        if facteur < 1 or pd.Timedelta(frequence) % self.pas:
+            raise ValueError(f"Fréquence {frequence} non multiple du pas {self.pas}")
+        tranche = self.time_slice(debut, fin)
+        # Blocs alignés sur la grille de temps du magasin
+        tranche = slice(tranche.start - tranche.start % facteur, tranche.stop)
+        instants, valeurs = self.query(mesure, stations, self.debut + tranche.start * self.pas,
+                                       self.debut + tranche.stop * self.pas)
+        n_blocs = -(-valeurs.shape[1] // facteur)
+        blocs = np.full((valeurs.shape[0], n_blocs * facteur), np.nan, dtype='float32')
+        blocs[:, :valeurs.shape[1]] = valeurs
+        agregats = AGREGATIONS[agregation](blocs.reshape(len(blocs), n_blocs, facteur), axis=2)
+        noms = self._positions[self.station_positions(stations)]
+        return pd.DataFrame(agregats.T, index=instants[::facteur], columns=noms)
+
+    def summary(self, mesure, stations=None, debut=None, fin=None):
+        """Statistiques par station sur la plage: moyenne, p95 et maximum"""
+        _, valeurs = self.query(mesure, stations, debut, fin)
+        noms = self._positions[self.station_positions(stations)]
+        return pd.DataFrame({
+            'moyenne': np.nanmean(valeurs, axis=1),
+            'p95': np.nanpercentile(valeurs, 95, axis=1),
+            'maximum': np.nanmax(valeurs, axis=1),
+        }, index=noms)
+
+    def flush(self):
+        for serie in self.series.values():
+            serie.flush()
+
+
+def synthetic_station_network(current_data, stations, n_stations, seed=0):
+    """Réseau de n_stations: stations existantes puis stations secondaires réparties selon les taxis des communes"""
+    rng = np.random.default_rng(seed)
+    colonnes = ['nom', 'commune', 'nombre_taxis', 'lat', 'lon', 'type']
+    reseau = stations[colonnes].astype({'commune': str}).copy()
+    n_secondaires = max(n_stations - len(reseau), 0)
+    if n_secondaires == 0:
+        return reseau.head(n_stations).reset_index(drop=True)
+
+    poids = current_data['nombre_taxis'].to_numpy(dtype='float64')
+    communes = rng.choice(len(current_data), size=n_secondaires, p=poids / poids.sum())
+    centres = project(current_data['lat'], current_data['lon'])[communes]
+    sigmas = commune_sigmas(current_data['population'])[communes] / 2
+    lat, lon = unproject(centres + rng.normal(size=(n_secondaires, 2)) * sigmas[:, None])
+    noms_communes = current_data['nom'].astype(str).to_numpy()[communes]
+    secondaires = pd.DataFrame({
+        'nom': [f"{commune} - station {rang}" for commune, rang in
+                zip(noms_communes, pd.Series(noms_communes).groupby(noms_communes).cumcount() + 1)],
+        'commune': noms_communes,
+        'nombre_taxis': rng.integers(2, 10, n_secondaires),
+        'lat': lat.round(5),
+        'lon': lon.round(5),
+        'type': 'Secondaire',
+    })
+    return pd.concat([reseau, secondaires], ignore_index=True)
+
+
+def generate_station_series(dossier, reseau, debut, jours, seed=0):
+    """Génère des séries synthétiques jour par jour dans un nouveau magasin (mémoire bornée à un jour)"""
+    pas_par_jour = pd.Timedelta('1D') // PAS
+    store = StationSeriesStore.create(dossier, reseau, debut, jours * pas_par_jour)
+    rng = np.random.default_rng(seed)
+
+    heures = np.arange(pas_par_jour) * PAS / pd.Timedelta('1h')
+    profil = np.interp(heures, np.arange(25), np.append(PROFIL_HORAIRE, PROFIL_HORAIRE[0]))
+    profil = profil / profil.max()
+    # Charge propre à chaque station: les grandes stations sont plus sollicitées
+    charge = np.clip(rng.normal(0.75, 0.12, len(reseau)), 0.3, 1.1)
+    charge += 0.1 * np.log1p(reseau['nombre_taxis'].to_numpy(dtype='float64')) / np.log1p(50)
+
+    for jour in range(jours):
+        facteur_jour = PROFIL_HEBDOMADAIRE[(pd.Timestamp(debut) + pd.Timedelta(days=jour)).dayofweek]
+        bruit = uniform_filter1d(rng.normal(0, 0.25, (len(reseau), pas_par_jour)), size=6, axis=1)
+        pression = charge[:, None] * profil[None, :] * facteur_jour + bruit
+        occupation = np.clip(100 * pression, 0, 100)
+        # La file se forme quand la pression dépasse la capacité de la station
+        file_attente = rng.poisson(np.clip(pression - 0.85, 0, None) * 12 * np.sqrt(reseau['nombre_taxis'].to_numpy())[:, None])
+        tranche = slice(jour * pas_par_jour, (jour + 1) * pas_par_jour)
+        store.series['occupation'][:, tranche] = occupation
+        store.series['file_attente'][:, tranche] = file_attente
+    store.flush()
+    return store
+
+
+def open_station_series(current_data, stations, version, n_stations=2000, jours=28, fin=None, racine=None):
+    """Ouvre le magasin de séries de cette version des données, généré au premier appel.
+
+    Les fichiers sont placés dans TAXIS_RUN_SERIES_DIR (à défaut le dossier
+    temporaire du système), dans un sous-dossier par version et taille.
+    """
+    racine = racine or os.environ.get('TAXIS_RUN_SERIES_DIR') or os.path.join(tempfile.gettempdir(), 'taxis_run_series')
+    dossier = os.path.join(racine, f"{version}-{n_stations}x{jours}j")
+    if not os.path.exists(os.path.join(dossier, FICHIER_META)):
+        fin = pd.Timestamp(fin or pd.Timestamp.now()).normalize()
+        # Génération dans un dossier temporaire renommé à la fin: jamais de magasin à moitié écrit
+        os.makedirs(racine, exist_ok=True)
+        temporaire = tempfile.mkdtemp(prefix='generation-', dir=racine)
+        reseau = synthetic_station_network(current_data, stations, n_stations)
+        generate_station_series(temporaire, reseau, fin - pd.Timedelta(days=jours), jours)
+        try:
+            os.replace(temporaire, dossier)
+        except OSError:
+            # Un autre processus a terminé la même génération entre-temps
+            shutil.rmtree(temporaire, ignore_errors=True)
+    return StationSeriesStore(dossier)
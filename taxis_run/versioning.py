@@ -0,0 +1,234 @@
+"""Version des données par empreinte de contenu et cache d'artefacts associé.
+
+Chaque composant des données (référentiel des communes, stations, partitions
+annuelles de l'historique, registre des taxiteurs, paramètres du modèle de
+simulation) reçoit une empreinte calculée sur son contenu. Un artefact
+(agrégat, grille, figure, carte, réponse de l'API) est indexé par le jeton des
+seuls composants dont il dépend: remplacer une partition d'historique invalide exactement les
+artefacts qui la lisent, et rien d'autre.
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+COMPOSANTS = ('communes', 'stations', 'historique', 'taxiteurs', 'simulateur')
+LONGUEUR_JETON = 12
+
+_empreintes_fichiers = {}
+_empreintes_lock = threading.Lock()
+
+
+def _digest(*parties):
+    """Empreinte SHA-1 d'une suite de chaînes ou d'octets"""
+    h = hashlib.sha1()
+    for partie in parties:
+        h.update(partie if isinstance(partie, bytes) else str(partie).encode('utf-8'))
+        h.update(b'\x00')
+    return h.hexdigest()
+
+
+def hash_frame(frame):
+    """Empreinte d'un DataFrame: colonnes, types et valeurs (hors index)"""
+    valeurs = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    return _digest(','.join(map(str, frame.columns)), ','.join(map(str, frame.dtypes)), valeurs.tobytes())
+
+
+def hash_records(records):
+    """Empreinte d'une liste d'enregistrements (ou de tout objet sérialisable en JSON)"""
+    return _digest(json.dumps(records, sort_keys=True, ensure_ascii=False, default=str))
+
+
+def hash_file(path, taille_bloc=1 << 20):
+    """Empreinte du contenu d'un fichier, mémorisée tant que sa taille et sa date ne changent pas"""
+    stat = os.stat(path)
+    cle = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _empreintes_lock:
+        if cle in _empreintes_fichiers:
+            return _empreintes_fichiers[cle]
+    h = hashlib.sha1()
+    with open(path, 'rb') as fichier:
+        for bloc in iter(lambda: fichier.read(taille_bloc), b''):
+            h.update(bloc)
+    with _empreintes_lock:
+        _empreintes_fichiers[cle] = h.hexdigest()
+    return _empreintes_fichiers[cle]
+
+
+def sources_token(sources):
+    """Jeton des fichiers sources ({source: chemin}); les sources intégrées ont un jeton fixe.
+
+    Une source dossier (historique partitionné) est représentée par son manifeste.
+    """
+    def empreinte(chemin):
+        return hash_file(os.path.join(chemin, 'manifest.json') if os.path.isdir(chemin) else chemin)
+    return _digest(*(f"{source}={empreinte(chemin)}" for source, chemin in sorted(sources.items())))[:LONGUEUR_JETON]
+
+
+def simulator_fingerprint():
+    """Empreinte des paramètres du modèle de simulation et du placement des stations"""
+    from taxis_run import placement, simulation
+    return hash_records({
+        'profil_horaire': simulation.PROFIL_HORAIRE.tolist(),
+        'duree_journee_min': simulation.DUREE_JOURNEE_MIN,
+        'vitesse_m_par_min': simulation.VITESSE_M_PAR_MIN,
+        'duree_course_moyenne_min': simulation.DUREE_COURSE_MOYENNE_MIN,
+        'patience_min': simulation.PATIENCE_MIN,
+        'rayon_approche_max_m': simulation.RAYON_APPROCHE_MAX_M,
+        'rayon_service_m': placement.RAYON_SERVICE_M,
+    })
+
+
+def history_partitions(historical_data):
+    """Empreinte de chaque partition annuelle de l'historique: {année: empreinte}"""
+    annees = historical_data['date'].dt.year
+    return {int(annee): hash_frame(partition) for annee, partition in historical_data.groupby(annees)}
+
+
+class DataVersion:
+    """Empreintes des composants des données et jetons dérivés"""
+
+    def __init__(self, composants, partitions=None):
+        self.composants = dict(composants)
+        self.partitions = dict(partitions or {})
+
+    @classmethod
+    def from_data(cls, communes_data, taxi_stations_data, historical_data, drivers_data):
+        """Calcule la version des données chargées"""
+        partitions = history_partitions(historical_data)
+        return cls({
+            'communes': hash_records(communes_data),
+            'stations': hash_frame(taxi_stations_data),
+            'historique': _digest(*(f"{annee}={h}" for annee, h in sorted(partitions.items()))),
+            'taxiteurs': hash_frame(drivers_data),
+            'simulateur': simulator_fingerprint(),
+        }, partitions)
+
+    def token(self, *composants, annees=None):
+        """Jeton des composants listés (tous par défaut).
+
+        annees restreint le composant historique aux partitions de ces années.
+        """
+        composants = composants or COMPOSANTS
+        inconnus = set(composants) - set(self.composants)
+        if inconnus:
+            raise ValueError(f"Composants de données inconnus: {sorted(inconnus)}")
+        parties = []
+        for composant in sorted(composants):
+            if composant == 'historique' and annees is not None:
+                parties += [f"historique[{a}]={self.partitions.get(a, '-')}" for a in sorted(set(annees))]
+            else:
+                parties.append(f"{composant}={self.composants[composant]}")
+        return _digest(*parties)[:LONGUEUR_JETON]
+
+    def history_years(self, debut=None, fin=None):
+        """Années des partitions d'historique recouvrant l'intervalle [debut, fin]"""
+        return [a for a in sorted(self.partitions)
+                if (debut is None or a >= debut.year) and (fin is None or a <= fin.year)]
+
+    def to_frame(self):
+        """Tableau des composants et partitions avec leur empreinte courte"""
+        lignes = [{'composant': c, 'empreinte': self.composants[c][:LONGUEUR_JETON]} for c in COMPOSANTS]
+        lignes += [{'composant': f"historique[{a}]", 'empreinte': h[:LONGUEUR_JETON]}
+                   for a, h in sorted(self.partitions.items())]
+        return pd.DataFrame(lignes)
+
+    def __str__(self):
+        return self.token()
+
+
+def estimate_size(valeur):
+    """Taille approximative d'un artefact en octets"""
+    if isinstance(valeur, pd.DataFrame):
+        return int(valeur.memory_usage(deep=True).sum())
+    if isinstance(valeur, np.ndarray):
+        return valeur.nbytes
+    if isinstance(valeur, (bytes, str)):
+        return len(valeur)
+    if isinstance(valeur, dict):
+        return sum(estimate_size(v) for v in valeur.values())
+    if isinstance(valeur, (list, tuple)):
+        return sum(estimate_size(v) for v in valeur)
+    return sys.getsizeof(valeur)
+
+
+class _Entry:
+    """Artefact en cache et ses métadonnées"""
+    __slots__ = ('version', 'valeur', 'calcule_le', 'duree_ms', 'taille', 'acces')
+
+    def __init__(self, version, valeur, duree_ms):
+        self.version = version
+        self.valeur = valeur
+        self.calcule_le = time.time()
+        self.duree_ms = duree_ms
+        self.taille = estimate_size(valeur)
+        self.acces = 0
+
+
+class ArtifactCache:
+    """Cache LRU thread-safe d'artefacts indexés par (nom, paramètres) et versionnés.
+
+    Une seule entrée est conservée par (nom, paramètres): si le jeton de version
+    demandé diffère de celui de l'entrée, l'artefact est recalculé et remplace
+    l'ancien.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_or_compute(self, artefact, version, fonction, params=()):
+        """Retourne l'artefact en cache pour cette version, ou le calcule avec fonction()"""
+        cle = (artefact, params)
+        with self._lock:
+            entree = self._entries.get(cle)
+            if entree is not None and entree.version == version:
+                self._entries.move_to_end(cle)
+                entree.acces += 1
+                self.hits += 1
+                return entree.valeur
+            self.misses += 1
+            if entree is not None:
+                self.invalidations += 1
+
+        debut = time.perf_counter()
+        valeur = fonction()
+        entree = _Entry(version, valeur, (time.perf_counter() - debut) * 1000)
+        with self._lock:
+            self._entries[cle] = entree
+            self._entries.move_to_end(cle)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return valeur
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def entries(self):
+        """Tableau des entrées du cache (de la plus ancienne à la plus récemment utilisée)"""
+        with self._lock:
+            lignes = [{
+                'artefact': artefact,
+                'parametres': ', '.join(map(str, params)),
+                'version': entree.version,
+                'calcule_le': pd.Timestamp(entree.calcule_le, unit='s'),
+                'duree_calcul_ms': round(entree.duree_ms, 1),
+                'taille_ko': round(entree.taille / 1024, 1),
+                'acces': entree.acces,
+            } for (artefact, params), entree in self._entries.items()]
+        return pd.DataFrame(lignes, columns=['artefact', 'parametres', 'version', 'calcule_le',
+                                             'duree_calcul_ms', 'taille_ko', 'acces'])
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,65 @@
+"""Parité des moteurs pandas et Polars, y compris sur des lignes mélangées"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('polars')
+
+from taxis_run.compute import PandasBackend, PolarsBackend  # noqa: E402
+from taxis_run.data import ReunionTaxiData  # noqa: E402
+from taxis_run.metrics import derive_microregion_metrics  # noqa: E402
+from taxis_run.schema import MICRO_REGIONS  # noqa: E402
+
+MESURES = ['nombre_taxis', 'demande_moyenne_journaliere']
+OPERATIONS = {
+    'filtre micro-région': lambda moteur, frame: moteur.filter_eq(frame, 'micro_region', 'Est'),
+    'top 10 demande': lambda moteur, frame: moteur.top_n(frame, 'demande_moyenne_journaliere', 10),
+    'sommes année x micro-région': lambda moteur, frame: moteur.group_sum(
+        frame, ['date', 'micro_region'], MESURES, annuel=True),
+    'sommes micro-région x commune': lambda moteur, frame: moteur.group_sum(
+        frame, ['micro_region', 'commune'], MESURES),
+    'sommes par date': lambda moteur, frame: moteur.group_sum(frame, ['date'], ['nombre_taxis']),
+    'agrégations micro-région': lambda moteur, frame: moteur.group_agg(frame, 'micro_region', {
+        'lignes': ('commune', 'size'),
+        'taxis': ('nombre_taxis', 'sum'),
+        'demande_moyenne': ('demande_moyenne_journaliere', 'mean'),
+    }),
+}
+
+
+@pytest.fixture(scope='module')
+def data():
+    np.random.seed(0)
+    return ReunionTaxiData(trace=False)
+
+
+@pytest.fixture(scope='module', params=[None, 0, 1], ids=['integre', 'melange-0', 'melange-1'])
+def historique(request, data):
+    if request.param is None:
+        return data.historical_data
+    return data.historical_data.sample(frac=1, random_state=request.param)
+
+
+def assert_same(attendu, obtenu):
+    pd.testing.assert_frame_equal(attendu, obtenu, check_dtype=False, check_index_type=False,
+                                  check_exact=False, rtol=1e-5)
+    for colonne in attendu.select_dtypes('category'):
+        assert obtenu[colonne].dtype == attendu[colonne].dtype
+        assert list(obtenu[colonne].cat.categories) == list(attendu[colonne].cat.categories)
+
+
+@pytest.mark.parametrize('operation', OPERATIONS.values(), ids=OPERATIONS.keys())
+def test_same_results(historique, operation):
+    assert_same(operation(PandasBackend(), historique), operation(PolarsBackend(), historique))
+
+
+def test_categories_follow_schema(historique):
+    resultat = PolarsBackend().group_sum(historique, ['micro_region'], MESURES)
+    assert list(resultat['micro_region'].cat.categories) == list(MICRO_REGIONS.categories)
+    assert list(resultat['micro_region']) == list(MICRO_REGIONS.categories)
+
+
+def test_microregion_metrics(data):
+    communes = data.current_data.sample(frac=1, random_state=0)
+    assert_same(derive_microregion_metrics(communes, PandasBackend()),
+                derive_microregion_metrics(communes, PolarsBackend()))
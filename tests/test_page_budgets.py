@@ -0,0 +1,33 @@
+"""Budgets de temps et d'éléments émis par page sur un jeu de données agrandi (voir benchmarks/page_budgets.py)"""
+import os
+import statistics
+
+import pytest
+
+pytest.importorskip('streamlit.testing.v1')
+
+from benchmarks.page_budgets import BUDGETS, measure_page, scaled_sources  # noqa: E402
+
+FACTEUR = 20
+REPETITIONS = 3
+# Multiplicateur des budgets de temps pour une machine plus lente
+MARGE = float(os.environ.get('TAXIS_RUN_BUDGET_MARGE', '1.0'))
+
+
+@pytest.fixture(scope='module')
+def sources(tmp_path_factory):
+    dossier = str(tmp_path_factory.mktemp('sources'))
+    scaled_sources(dossier, FACTEUR)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv('TAXIS_RUN_DATA_DIR', dossier)
+        yield dossier
+
+
+@pytest.mark.parametrize('page', list(BUDGETS))
+def test_page_budget(sources, page):
+    _, chauds, elements, exceptions = measure_page(page, REPETITIONS)
+    budget_temps, budget_elements = BUDGETS[page]
+    chaud = statistics.median(chauds) * 1000
+    assert not exceptions
+    assert elements <= budget_elements, f"{elements} éléments émis > {budget_elements}"
+    assert chaud <= budget_temps * MARGE, f"rerun à chaud {chaud:.0f} ms > {budget_temps * MARGE:.0f} ms"
@@ -0,0 +1,55 @@
+"""Console SQL: lecture seule, y compris sous EXPLAIN ANALYZE"""
+import pytest
+
+pytest.importorskip('duckdb')
+
+from taxis_run.data import ReunionTaxiData  # noqa: E402
+from taxis_run.sql import query_engine  # noqa: E402
+
+ECRITURES = [
+    "EXPLAIN ANALYZE DELETE FROM communes",
+    "EXPLAIN ANALYZE UPDATE stations SET nombre_taxis = 0",
+    "EXPLAIN ANALYZE CREATE TABLE pwn AS SELECT 1",
+    "DELETE FROM communes",
+    "CREATE TABLE pwn AS SELECT 1",
+]
+
+
+@pytest.fixture(scope='module')
+def moteur():
+    return query_engine(ReunionTaxiData(trace=False))
+
+
+def counts(moteur):
+    communes = moteur.run("SELECT count(*) AS n FROM communes")[0]['n'].iloc[0]
+    taxis = moteur.run("SELECT sum(nombre_taxis) AS n FROM stations")[0]['n'].iloc[0]
+    return communes, taxis
+
+
+@pytest.mark.parametrize('requete', ECRITURES)
+def test_check_refuses_writes(moteur, requete):
+    avant = counts(moteur)
+    with pytest.raises(ValueError, match="non autorisée"):
+        moteur.run(requete)
+    with pytest.raises(ValueError):
+        moteur.explain(requete)
+    assert counts(moteur) == avant
+
+
+@pytest.mark.parametrize('requete', ECRITURES)
+def test_engine_refuses_writes_without_check(moteur, requete):
+    avant = counts(moteur)
+    curseur = moteur.connexion.cursor()
+    with pytest.raises(moteur.duckdb.Error):
+        curseur.execute(requete)
+    curseur.close()
+    assert counts(moteur) == avant
+    assert 'pwn' not in set(moteur.schema()['table'])
+
+
+def test_select_and_plan(moteur):
+    resultat, tronque, _ = moteur.run("SELECT * FROM historique", lignes_max=10)
+    assert len(resultat) == 10 and tronque
+    assert moteur.run("SELECT count(*) AS n FROM communes")[0]['n'].iloc[0] == 23
+    plan = moteur.explain("SELECT count(*) FROM historique WHERE annee = 2020")
+    assert 'READ_PARQUET' in plan and 'annee = 2020' in plan
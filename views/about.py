@@ -0,0 +1,72 @@
+"""Page À Propos: sources, méthodologie et empreinte mémoire des données"""
+import streamlit as st
+from taxis_run.schema import memory_report
+from views.shared import get_artifact_cache, get_data, payload_report
+
+
+def create_about(data):
+    """Présentation du dashboard, sources et méthodologie"""
+    st.markdown("## 📋 À propos de ce dashboard")
+    st.markdown("""
+    Ce dashboard présente une analyse complète de l'activité taxi à La Réunion.
+    
+    **Sources des données:**
+    - Préfecture de La Réunion - Licences taxi
+    - INSEE - Recensement et statistiques
+    - Observatoire du Tourisme
+    - Enquêtes professionnelles
+    - Collectivités territoriales
+    
+    **Période couverte:**
+    - Données historiques: 2018-2024
+    - Données courantes: 2024
+    - Projections: 2025-2040
+    
+    **Méthodologie:**
+    - Données réelles agrégées
+    - Enquêtes terrain complémentaires
+    - Modélisation économique
+    - Projections tendancielles
+    
+    **⚠️ Avertissement:** 
+    Les données présentées sont des estimations et simulations.
+    Certaines données sont anonymisées pour respecter la confidentialité.
+    
+    **🔒 Confidentialité:** 
+    Toutes les données individuelles sont protégées.
+    """)
+    
+    st.markdown("---")
+    with st.expander("💾 Empreinte mémoire des données"):
+        st.dataframe(memory_report({
+            'current_data': data.current_data,
+            'historical_data': data.historical_data,
+            'microregion_data': data.microregion_data,
+            'taxi_stations_data': data.taxi_stations_data,
+            'drivers_data': data.drivers_data
+        }), use_container_width=True)
+    
+    with st.expander("🗂️ Versions des données et caches"):
+        cache = get_artifact_cache()
+        st.markdown(f"**Version des données:** `{data.version.token()}` — chaque artefact est indexé "
+                    "par l'empreinte des seuls composants dont il dépend.")
+        st.dataframe(data.version.to_frame(), use_container_width=True, hide_index=True)
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Artefacts en cache", len(cache))
+        col2.metric("Succès / échecs", f"{cache.hits} / {cache.misses}")
+        col3.metric("Invalidations", cache.invalidations)
+        st.dataframe(cache.entries(), use_container_width=True, hide_index=True)
+    
+    with st.expander("📦 Poids des graphiques par onglet"):
+        st.caption("Charge utile des figures Plotly envoyées au navigateur (dernier affichage de chaque figure).")
+        st.dataframe(payload_report(), use_container_width=True, hide_index=True)
+    
+    st.markdown("""
+    **📞 Contact:**
+    - Observatoire de la Mobilité de La Réunion
+    - Site web: www.mobilite.reunion.gouv.fr
+    - Email: observatoire.mobilite@reunion.gouv.fr
+    """)
+
+
+create_about(get_data())
@@ -0,0 +1,144 @@
+"""Page Analyse Avancée: relations entre indicateurs, analyse SWOT et console SQL"""
+import streamlit as st
+import plotly.express as px
+from taxis_run.charts import render_mode
+from taxis_run.sql import DELAI_S, EXEMPLES, LIGNES_MAX, normalize_query, query_engine
+from views.shared import FigureBatch, cached_artifact, display_export, get_data
+
+COMPOSANTS_SQL = ('communes', 'stations', 'historique', 'taxiteurs')
+
+
+def create_query_console(data):
+    """Console SQL en lecture seule sur l'historique Parquet et les tables du dashboard"""
+    st.markdown("### 🧮 CONSOLE SQL")
+    lignes_max = f"{LIGNES_MAX:,}".replace(',', ' ')
+    st.caption(f"Tables: historique (Parquet partitionné par annee/mois), communes, stations, taxiteurs. "
+               f"Lecture seule, {lignes_max} lignes et {DELAI_S} s au plus par requête.")
+    
+    moteur = cached_artifact(data, 'moteur_sql', COMPOSANTS_SQL, lambda: query_engine(data))
+    with st.expander("Colonnes des tables"):
+        st.dataframe(moteur.schema(), hide_index=True, use_container_width=True)
+    
+    exemple = st.selectbox("Exemple", list(EXEMPLES))
+    # Sans clé: la zone de saisie est réinitialisée au changement d'exemple
+    requete = st.text_area("Requête", EXEMPLES[exemple], height=220)
+    if st.button("▶️ Exécuter", type="primary"):
+        st.session_state.requete_sql = normalize_query(requete)
+    
+    requete = st.session_state.get('requete_sql')
+    if not requete:
+        return
+    try:
+        resultat, tronque, duree = cached_artifact(data, 'requete_sql', COMPOSANTS_SQL,
+                                                   lambda: moteur.run(requete), (requete, LIGNES_MAX))
+    except (ValueError, TimeoutError, moteur.duckdb.Error) as erreur:
+        st.error(str(erreur))
+        return
+    
+    message = f"{len(resultat)} lignes, calculées en {duree:.0f} ms"
+    if tronque:
+        message += f" (résultat tronqué aux {lignes_max} premières lignes)"
+    st.caption(message)
+    st.dataframe(resultat, hide_index=True, use_container_width=True)
+    display_export(resultat, 'requete_sql', key='export_sql')
+    with st.expander("Plan d'exécution (colonnes lues, filtres poussés, fichiers parcourus)"):
+        st.code(moteur.explain(requete), language=None)
+
+
+def create_advanced_analysis(data):
+    """Analyse avancée: relations demande/revenu, densité/occupation et SWOT"""
+    st.markdown("## 📊 ANALYSE AVANCÉE DE L'ACTIVITÉ TAXI")
+    
+    # Figures construites ensemble à la fin de la page, chacune émise à sa place
+    figures = FigureBatch()
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Relation demande/revenu
+        figures.add('Analyse Avancée', px.scatter, data.current_data,
+                    render_mode=render_mode(len(data.current_data)),
+                    x='demande_moyenne_journaliere',
+                    y='revenu_moyen_mensuel',
+                    size='nombre_taxis',
+                    color='micro_region',
+                    title='Relation entre demande et revenu moyen par commune',
+                    hover_name='nom',
+                    size_max=30,
+                    color_discrete_map={
+                        'Nord': '#1E88E5',
+                        'Sud': '#43A047',
+                        'Ouest': '#FF9800',
+                        'Est': '#AB47BC',
+                        'Cirques': '#5D4037'
+                    })
+    
+    with col2:
+        # Analyse densité/performance
+        figures.add('Analyse Avancée', px.scatter, data.current_data,
+                    render_mode=render_mode(len(data.current_data)),
+                    x='taxis_10k_hab',
+                    y='taux_occupation',
+                    size='population',
+                    color='taux_activite',
+                    title='Densité de taxis vs Taux d\'occupation',
+                    hover_name='nom',
+                    size_max=30,
+                    color_discrete_map={
+                        'Élevé': '#28a745',
+                        'Moyen': '#ffc107',
+                        'Faible': '#dc3545',
+                        'Limitée': '#6c757d'
+                    })
+    
+    # Analyse SWOT
+    st.markdown("### 📋 ANALYSE SWOT DU SECTEUR TAXI RÉUNIONNAIS")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown("""
+        #### 💪 FORCES
+        - Maillage territorial complet
+        - Connaissance fine du territoire
+        - Flexibilité et réactivité
+        - Savoir-faire relationnel
+        - Adaptabilité aux clients
+        """)
+    
+    with col2:
+        st.markdown("""
+        #### 👎 FAIBLESSES
+        - Vieillissement du parc
+        - Digitalisation limitée
+        - Saisonnalité des revenus
+        - Charge de travail élevée
+        - Image parfois dégradée
+        """)
+    
+    with col3:
+        st.markdown("""
+        #### 🚀 OPPORTUNITÉS
+        - Croissance touristique
+        - Transition écologique
+        - Digitalisation des services
+        - Nouvelles mobilités
+        - Services à valeur ajoutée
+        """)
+    
+    with col4:
+        st.markdown("""
+        #### ⚠️ MENACES
+        - Concurrence VTC/transports
+        - Réglementation plus stricte
+        - Coûts d'exploitation
+        - Désaffection du métier
+        - Changements comportementaux
+        """)
+    
+    figures.render()
+    
+    create_query_console(data)
+
+
+create_advanced_analysis(get_data())
@@ -0,0 +1,201 @@
+"""Page Communes: comparaison, top activité et fiche détaillée"""
+import html
+
+import pandas as pd
+import streamlit as st
+import plotly.express as px
+from taxis_run.anomalies import LIBELLES_METRIQUES
+from taxis_run.charts import add_anomaly_markers, render_mode
+from views.shared import FigureBatch, display_export, get_data, load_anomalies
+
+COLONNES_TRI = {
+    'Nombre de taxis': 'nombre_taxis',
+    'Demande journalière': 'demande_moyenne_journaliere',
+    'Revenu moyen': 'revenu_moyen_mensuel',
+    'Taux occupation': 'taux_occupation',
+}
+CLASSES_ACTIVITE = {'Élevé': 'activity-high', 'Moyen': 'activity-medium', 'Faible': 'activity-low'}
+
+
+def commune_list_html(communes):
+    """Liste des communes en un seul bloc HTML, construite colonne par colonne (sans boucle sur les lignes)"""
+    def texte(colonne):
+        return communes[colonne].astype(str).map(html.escape)
+    
+    def cellule(titre, detail):
+        return "<div>" + titre + "<br>" + detail + "</div>"
+    
+    activite = texte('taux_activite')
+    region = texte('micro_region')
+    lignes = "<div class='commune-row'>" \
+        + cellule("<b>" + texte('nom') + "</b>",
+                  "<span class='microregion-badge " + region.str.lower() + "'>" + region + "</span>") \
+        + cellule("<b>" + texte('description') + "</b>",
+                  "Population: " + communes['population'].map('{:,}'.format)
+                  + " hab • Stations: " + texte('stations_principales')) \
+        + cellule("<b>" + texte('nombre_taxis') + " taxis</b>", "Taxiteurs: " + texte('nombre_taxiteurs')) \
+        + cellule("<b>" + activite + "</b>",
+                  "<span class='demand-" + activite.str.lower().str.replace(' ', '-') + "'>Demande: "
+                  + texte('demande_moyenne_journaliere') + "/j</span>") \
+        + cellule("<span class='" + activite.map(CLASSES_ACTIVITE).fillna('activity-limited') + "'>Niveau: "
+                  + activite + "</span>", "Revenu: " + texte('revenu_moyen_mensuel') + " €") \
+        + "</div>"
+    return "<div class='commune-list'>" + "".join(lignes) + "</div>"
+
+
+def create_communes_analysis(data):
+    """Affiche l'analyse détaillée par commune"""
+    st.markdown('<h3 class="section-header">🏢 ANALYSE PAR COMMUNE</h3>', 
+               unsafe_allow_html=True)
+    
+    # Figures construites ensemble à la fin de la page, chacune émise à sa place
+    figures = FigureBatch()
+    
+    tab1, tab2, tab3 = st.tabs(["Comparaison Communes", "Top Activité", "Détails par Commune"])
+    
+    with tab1:
+        # Filtres pour les communes
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            microregion_filtre = st.selectbox("Micro-région:", 
+                                            ['Toutes'] + list(data.microregion_data['micro_region'].unique()))
+        with col2:
+            niveau_filtre = st.selectbox("Niveau d'activité:", 
+                                       ['Tous', 'Élevé', 'Moyen', 'Faible', 'Limitée'])
+        with col3:
+            tri_filtre = st.selectbox("Trier par:", 
+                                    ['Nombre de taxis', 'Demande journalière', 'Revenu moyen', 'Taux occupation'])
+        
+        # Application des filtres (masque sur le tableau en cache, sans copie préalable)
+        masque = pd.Series(True, index=data.current_data.index)
+        if microregion_filtre != 'Toutes':
+            masque &= data.current_data['micro_region'] == microregion_filtre
+        if niveau_filtre != 'Tous':
+            masque &= data.current_data['taux_activite'] == niveau_filtre
+        
+        # Tri
+        colonne_tri = COLONNES_TRI[tri_filtre]
+        communes_filtrees = data.current_data[masque].sort_values(colonne_tri, ascending=False)
+        
+        display_export(communes_filtrees, 'communes_taxis', 'export_communes')
+        
+        # Liste des communes: un seul bloc HTML, quel que soit le nombre de communes
+        st.markdown(commune_list_html(communes_filtrees), unsafe_allow_html=True)
+    
+    with tab2:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Top des communes avec le plus de taxis
+            top_taxis = data.compute.top_n(data.current_data, 'nombre_taxis', 10)
+            figures.add('Communes / Top Activité', px.bar, top_taxis,
+                        x='nombre_taxis',
+                        y='nom',
+                        orientation='h',
+                        title='Top 10 des communes par nombre de taxis',
+                        color='nombre_taxis',
+                        color_continuous_scale='Viridis')
+        
+        with col2:
+            # Top des communes avec la plus forte demande
+            top_demande = data.compute.top_n(data.current_data, 'demande_moyenne_journaliere', 10)
+            figures.add('Communes / Top Activité', px.bar, top_demande,
+                        x='demande_moyenne_journaliere',
+                        y='nom',
+                        orientation='h',
+                        title='Top 10 des communes par demande journalière',
+                        color='demande_moyenne_journaliere',
+                        color_continuous_scale='Oranges')
+    
+    with tab3:
+        # Détails pour une commune sélectionnée
+        commune_selectionnee = st.selectbox("Sélectionnez une commune:", 
+                                         data.current_data['nom'].unique())
+        
+        if commune_selectionnee:
+            commune_data = data.current_data[data.current_data['nom'] == commune_selectionnee].iloc[0]
+            historique_commune = data.compute.filter_eq(data.historical_data, 'commune', commune_selectionnee)
+            anomalies = load_anomalies(data)
+            anomalies_commune = anomalies[anomalies['commune'] == commune_selectionnee]
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.subheader(f"Fiche activité taxi: {commune_selectionnee}")
+                
+                st.metric("Micro-région", commune_data['micro_region'])
+                st.metric("Population", f"{commune_data['population']:,}")
+                st.metric("Nombre de taxis", commune_data['nombre_taxis'])
+                st.metric("Nombre de taxiteurs", commune_data['nombre_taxiteurs'])
+                st.metric("Niveau d'activité", commune_data['taux_activite'])
+                st.metric("Demande journalière moyenne", f"{commune_data['demande_moyenne_journaliere']} courses")
+                st.metric("Revenu mensuel moyen", f"{commune_data['revenu_moyen_mensuel']} €")
+                st.metric("Taux d'occupation", f"{commune_data['taux_occupation']}%")
+                st.metric("Couverture de nuit", commune_data['couverture_nuit'])
+                st.metric("Accès aéroport", commune_data['acces_aeroport'],
+                          f"{commune_data['distance_aeroport_km']:.1f} km", delta_color="off")
+                st.metric("Station la plus proche", commune_data['station_la_plus_proche'],
+                          f"{commune_data['distance_station_km']:.1f} km", delta_color="off")
+                st.metric("Stations principales", commune_data['stations_principales'])
+                st.metric("Taxis pour 10 000 habitants", f"{commune_data['taxis_10k_hab']:.1f}")
+                st.metric("Taxiteurs par taxi", f"{commune_data['taxiteurs_par_taxi']:.2f}")
+                st.metric("Demande par taxi", f"{commune_data['demande_par_taxi']:.1f} courses/j")
+            
+            with col2:
+                # Graphique d'évolution du nombre de taxis pour la commune sélectionnée
+                figures.add('Communes / Détails par Commune', px.line, historique_commune,
+                            render_mode=render_mode(len(historique_commune)),
+                            x='date',
+                            y='nombre_taxis',
+                            title=f'Évolution du nombre de taxis à {commune_selectionnee}',
+                            color_discrete_sequence=['#1E88E5'],
+                            finitions=[(add_anomaly_markers, anomalies_commune, 'nombre_taxis')],
+                            layout=dict(yaxis_title="Nombre de taxis"))
+                
+                # Graphique d'évolution de la demande
+                figures.add('Communes / Détails par Commune', px.line, historique_commune,
+                            render_mode=render_mode(len(historique_commune)),
+                            x='date',
+                            y='demande_moyenne_journaliere',
+                            title=f'Évolution de la demande à {commune_selectionnee}',
+                            color_discrete_sequence=['#FF9800'],
+                            finitions=[(add_anomaly_markers, anomalies_commune, 'demande_moyenne_journaliere')],
+                            layout=dict(yaxis_title="Demande journalière (courses)"))
+                
+                # Diagramme de répartition des zones desservies - CORRIGÉ
+                zones = commune_data['zones_desservies'].split(', ')
+                
+                # Créer une répartition proportionnelle automatique
+                if zones:
+                    # Répartition égale ajustée
+                    base_value = 100 // len(zones)
+                    repartition = [base_value] * len(zones)
+                    
+                    # Ajuster le dernier élément pour faire 100%
+                    total = sum(repartition)
+                    if total < 100:
+                        repartition[-1] += (100 - total)
+                    elif total > 100:
+                        repartition[-1] -= (total - 100)
+                    
+                    figures.add('Communes / Détails par Commune', px.pie, values=repartition,
+                                names=zones,
+                                title=f'Répartition des zones desservies à {commune_selectionnee}')
+                else:
+                    st.info("Aucune zone desservie spécifiée pour cette commune")
+            
+            st.markdown(f"**Valeurs anormales de {commune_selectionnee}**")
+            if len(anomalies_commune):
+                st.dataframe(anomalies_commune.assign(metrique=anomalies_commune['metrique'].map(LIBELLES_METRIQUES))
+                             .drop(columns='commune').round(1), use_container_width=True, hide_index=True)
+            else:
+                st.caption("Aucune valeur ne s'écarte de la tendance des périodes précédentes "
+                           "(score robuste au-delà de 3,5).")
+            
+            st.markdown(f"**Historique de {commune_selectionnee}**")
+            display_export(historique_commune, f"historique_{commune_selectionnee}", 'export_historique_commune')
+    
+    figures.render()
+
+
+create_communes_analysis(get_data())
@@ -0,0 +1,153 @@
+"""Page Taxiteurs: profil, conditions de travail et formation"""
+import os
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from taxis_run.drivers import bracket_distribution, driver_distributions, selection_mask
+from taxis_run.shifts import (SEMAINE, WeeklyHoursAccumulator, read_shift_chunks, shift_log_files,
+                              shift_logs_token, stream_weekly_hours, synthetic_shift_chunks)
+from views.shared import FigureBatch, cached_artifact, get_data
+
+LIBELLES_AXES = {'categorie': '', 'pourcentage': 'Pourcentage', 'effectif': 'Taxiteurs'}
+
+
+def load_weekly_hours(data, progression=None):
+    """Heures hebdomadaires moyennes par taxiteur, agrégées en flux depuis les journaux de service.
+
+    Les journaux sont lus dans le sous-dossier services de TAXIS_RUN_DATA_DIR;
+    à défaut, une année de services synthétiques est générée depuis le registre.
+    """
+    dossier = os.environ.get('TAXIS_RUN_DATA_DIR')
+    fichiers = shift_log_files(os.path.join(dossier, 'services')) if dossier else []
+    
+    def calcul():
+        if fichiers:
+            blocs = read_shift_chunks(fichiers)
+        else:
+            blocs = synthetic_shift_chunks(data.drivers_data, pd.Timestamp.now().normalize() - 52 * SEMAINE)
+        accumulateur = WeeklyHoursAccumulator()
+        for services, _ in stream_weekly_hours(blocs, accumulateur):
+            if progression is not None:
+                progression(services)
+        return accumulateur.driver_hours(), accumulateur.services, accumulateur.rejetes
+    
+    jeton = shift_logs_token(fichiers) if fichiers else 'synthetique'
+    return cached_artifact(data, 'heures_hebdomadaires', ('taxiteurs',), calcul, (jeton,))
+
+
+def create_drivers_analysis(data):
+    """Analyse spécifique des taxiteurs"""
+    st.markdown('<h3 class="section-header">👨‍💼 ANALYSE DES TAXITEURS</h3>', 
+               unsafe_allow_html=True)
+    
+    # Figures construites ensemble à la fin de la page, chacune émise à sa place
+    figures = FigureBatch()
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        micro_regions = st.multiselect("Micro-régions:", sorted(data.drivers_data['micro_region'].cat.categories))
+    with col2:
+        choix_communes = data.current_data
+        if micro_regions:
+            choix_communes = choix_communes[choix_communes['micro_region'].isin(micro_regions)]
+        communes = st.multiselect("Communes:", sorted(choix_communes['nom'].astype(str)))
+    
+    # Six distributions en un passage sur le registre, recalculées seulement si le registre change
+    distributions = cached_artifact(data, 'distributions_taxiteurs', ('taxiteurs',),
+                                    lambda: driver_distributions(data.drivers_data, communes, micro_regions),
+                                    (tuple(communes), tuple(micro_regions)))
+    effectif = int(distributions['age']['effectif'].sum())
+    st.caption(f"{effectif} taxiteurs dans la sélection, sur {len(data.drivers_data)} au registre")
+    
+    tab1, tab2, tab3 = st.tabs(["Profil des Taxiteurs", "Conditions de Travail", "Formation & Compétences"])
+    
+    with tab1:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Répartition par âge
+            age_data = distributions['age']
+            
+            figures.add('Taxiteurs / Profil des Taxiteurs', px.pie, age_data,
+                        values='pourcentage',
+                        names='categorie',
+                        title='Répartition des taxiteurs par tranche d\'âge',
+                        labels=LIBELLES_AXES)
+        
+        with col2:
+            # Ancienneté dans le métier
+            anciennete_data = distributions['anciennete']
+            
+            figures.add('Taxiteurs / Profil des Taxiteurs', px.bar, anciennete_data,
+                        x='categorie',
+                        y='pourcentage',
+                        title='Ancienneté dans le métier',
+                        labels=LIBELLES_AXES,
+                        color='pourcentage',
+                        color_continuous_scale='Blues')
+    
+    with tab2:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Temps de travail hebdomadaire, depuis les journaux de service
+            attente = st.empty()
+            heures, services, rejetes = load_weekly_hours(
+                data, lambda n: attente.caption(f"⏳ {n} services agrégés..."))
+            attente.empty()
+            selection = data.drivers_data['id_taxiteur'][selection_mask(data.drivers_data, communes, micro_regions)]
+            temps_travail = bracket_distribution(heures[heures.index.isin(selection)], 'heures_hebdo')
+            
+            figures.add('Taxiteurs / Conditions de Travail', px.bar, temps_travail,
+                        x='categorie',
+                        y='pourcentage',
+                        title='Temps de travail hebdomadaire',
+                        labels=LIBELLES_AXES,
+                        color='pourcentage',
+                        color_continuous_scale='Reds')
+            services_lus = f"{services:,}".replace(',', ' ')
+            st.caption(f"Moyenne des semaines travaillées de chaque taxiteur, sur {services_lus} services "
+                       f"({rejetes} écartés: durée nulle ou supérieure à 24 h)")
+        
+        with col2:
+            # Types de contrats
+            contrats_data = distributions['contrat']
+            
+            figures.add('Taxiteurs / Conditions de Travail', px.pie, contrats_data,
+                        values='pourcentage',
+                        names='categorie',
+                        title='Répartition des types de contrats',
+                        labels=LIBELLES_AXES)
+    
+    with tab3:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Niveau de formation
+            formation_data = distributions['formation']
+            
+            figures.add('Taxiteurs / Formation & Compétences', px.bar, formation_data,
+                        x='categorie',
+                        y='pourcentage',
+                        title='Niveau de formation des taxiteurs',
+                        labels=LIBELLES_AXES,
+                        color='pourcentage',
+                        color_continuous_scale='Greens')
+        
+        with col2:
+            # Compétences linguistiques
+            langues_data = distributions['langues']
+            
+            figures.add('Taxiteurs / Formation & Compétences', px.bar, langues_data,
+                        x='categorie',
+                        y='pourcentage',
+                        title='Compétences linguistiques des taxiteurs',
+                        labels=LIBELLES_AXES,
+                        color='pourcentage',
+                        color_continuous_scale='Purples')
+    
+    figures.render()
+
+
+create_drivers_analysis(get_data())
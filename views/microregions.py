@@ -0,0 +1,165 @@
+"""Page Micro-régions: comparaison, détails et stratégies territoriales"""
+import streamlit as st
+import plotly.express as px
+from taxis_run.charts import render_mode
+from views.shared import FigureBatch, display_export, get_data
+
+
+def create_microregion_analysis(data):
+    """Analyse détaillée par micro-région"""
+    st.markdown('<h3 class="section-header">📊 ANALYSE PAR MICRO-RÉGION</h3>', 
+               unsafe_allow_html=True)
+    
+    # Figures construites ensemble à la fin de la page, chacune émise à sa place
+    figures = FigureBatch()
+    
+    tab1, tab2, tab3 = st.tabs(["Comparaison Micro-régions", "Détails Micro-région", "Stratégies Territoriales"])
+    
+    with tab1:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Comparaison du nombre de taxis total
+            figures.add('Micro-régions / Comparaison Micro-régions', px.bar, data.microregion_data,
+                        x='micro_region',
+                        y='nombre_taxis_total',
+                        title='Nombre total de taxis par micro-région',
+                        color='micro_region',
+                        color_discrete_map={
+                            'Nord': '#1E88E5',
+                            'Sud': '#43A047',
+                            'Ouest': '#FF9800',
+                            'Est': '#AB47BC',
+                            'Cirques': '#5D4037'
+                        },
+                        layout=dict(yaxis_title="Nombre de taxis"))
+        
+        with col2:
+            # Densité de taxis (taxis/population)
+            figures.add('Micro-régions / Comparaison Micro-régions', px.bar, data.microregion_data,
+                        x='micro_region',
+                        y='densite_taxis',
+                        title='Densité de taxis (pour 10 000 habitants)',
+                        color='micro_region',
+                        color_discrete_map={
+                            'Nord': '#1E88E5',
+                            'Sud': '#43A047',
+                            'Ouest': '#FF9800',
+                            'Est': '#AB47BC',
+                            'Cirques': '#5D4037'
+                        },
+                        layout=dict(yaxis_title="Taxis pour 10 000 habitants"))
+        
+        display_export(data.microregion_data, 'micro_regions_taxis', 'export_microregions')
+    
+    with tab2:
+        # Détails pour une micro-région sélectionnée
+        microregion_selectionnee = st.selectbox("Sélectionnez une micro-région:", 
+                                              data.microregion_data['micro_region'].unique())
+        
+        if microregion_selectionnee:
+            communes_microregion = data.compute.filter_eq(data.current_data, 'micro_region',
+                                                          microregion_selectionnee)
+            historique_microregion = data.compute.filter_eq(data.historical_data, 'micro_region',
+                                                            microregion_selectionnee)
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.subheader(f"Micro-région: {microregion_selectionnee}")
+                
+                microregion_info = data.microregion_data[
+                    data.microregion_data['micro_region'] == microregion_selectionnee
+                ].iloc[0]
+                
+                st.metric("Nombre de communes", microregion_info['nombre_communes'])
+                st.metric("Population totale", f"{microregion_info['population_totale']:,}")
+                st.metric("Nombre total de taxis", microregion_info['nombre_taxis_total'])
+                st.metric("Nombre total de taxiteurs", microregion_info['nombre_taxiteurs_total'])
+                st.metric("Demande journalière totale", f"{microregion_info['demande_totale_journaliere']:,.0f} courses")
+                st.metric("Revenu mensuel moyen", f"{microregion_info['revenu_moyen_mensuel']:.0f} €")
+                st.metric("Taux d'occupation moyen (pondéré)", f"{microregion_info['taux_occupation_pondere']:.1f}%")
+                st.metric("Taxis pour 10 000 habitants", f"{microregion_info['densite_taxis']:.1f}")
+                st.metric("Demande par taxi", f"{microregion_info['demande_par_taxi']:.1f} courses/j")
+                
+                # Répartition des niveaux d'activité dans la micro-région
+                niveaux_counts = communes_microregion['taux_activite'].value_counts()
+                niveaux_counts = niveaux_counts[niveaux_counts > 0]
+                figures.add('Micro-régions / Détails Micro-région', px.pie, values=niveaux_counts.values,
+                            names=niveaux_counts.index,
+                            title=f'Répartition des niveaux d\'activité - {microregion_selectionnee}')
+            
+            with col2:
+                # Graphique d'évolution du nombre de taxis pour la micro-région
+                evolution_microregion = data.compute.group_sum(historique_microregion, ['date'], ['nombre_taxis'])
+                
+                figures.add('Micro-régions / Détails Micro-région', px.line, evolution_microregion,
+                            render_mode=render_mode(len(evolution_microregion)),
+                            x='date',
+                            y='nombre_taxis',
+                            title=f'Évolution du nombre de taxis - {microregion_selectionnee}',
+                            color_discrete_sequence=['#1E88E5'],
+                            layout=dict(yaxis_title="Nombre de taxis"))
+                
+                # Graphique de répartition des taxis par commune
+                figures.add('Micro-régions / Détails Micro-région', px.bar, communes_microregion.sort_values('nombre_taxis', ascending=False),
+                            x='nom',
+                            y='nombre_taxis',
+                            title=f'Nombre de taxis par commune - {microregion_selectionnee}',
+                            color='nombre_taxis',
+                            color_continuous_scale='Viridis',
+                            layout=dict(xaxis_title="Commune", yaxis_title="Nombre de taxis"))
+            
+            st.markdown(f"**Historique de la micro-région {microregion_selectionnee}**")
+            display_export(historique_microregion, f"historique_{microregion_selectionnee}",
+                                'export_historique_microregion')
+    
+    with tab3:
+        st.subheader("Stratégies de Développement par Micro-région")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("""
+            ### 🎯 Micro-régions à Forte Activité
+            
+            **🏛️ Nord:**
+            - Stratégie: Optimisation et professionnalisation
+            - Actions: Digitalisation des services
+            - Enjeux: Saturation du centre-ville
+            - Projets: Application mobile, bornes intelligentes
+            
+            **🏝️ Ouest:**
+            - Stratégie: Développement touristique ciblé
+            - Actions: Formation langues étrangères
+            - Enjeux: Saisonnalité marquée
+            - Projets: Partenariats hôteliers, forfaits touristiques
+            """)
+        
+        with col2:
+            st.markdown("""
+            ### 📈 Micro-régions à Potentiel de Croissance
+            
+            **🌋 Sud:**
+            - Stratégie: Structuration de l'offre
+            - Actions: Création de stations dédiées
+            - Enjeux: Desserte des zones d'activité
+            - Projets: Pôles multimodaux, services entreprises
+            
+            **🌿 Est:**
+            - Stratégie: Maillage territorial
+            - Actions: Développement de services à la demande
+            - Enjeux: Désenclavement, faible densité
+            - Projets: Transport à la demande, points de rendez-vous
+            
+            **⛰️ Cirques:**
+            - Stratégie: Service essentiel préservé
+            - Actions: Aide au renouvellement
+            - Enjeux: Viabilité économique, relève
+            - Projets: Aides à l'installation, services sociaux
+            """)
+    
+    figures.render()
+
+
+create_microregion_analysis(get_data())
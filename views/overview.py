@@ -0,0 +1,248 @@
+"""Page Vue d'ensemble: carte interactive, évolution, micro-régions et stations"""
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import folium
+from folium.plugins import HeatMap
+from taxis_run.anomalies import latest_alerts
+from taxis_run.charts import render_mode
+from taxis_run.markers import MarkerLayer, commune_markers, station_markers
+from taxis_run.station_series import open_station_series
+from views.shared import (FigureBatch, cached_artifact, display_map_html, get_data, load_anomalies,
+                          load_coverage_grid)
+
+RESOLUTIONS_SERIES = {'5 min': '5min', '15 min': '15min', '1 h': '1h', '6 h': '6h', '1 jour': '1D'}
+
+
+def create_activity_overview(data):
+    """Crée la vue d'ensemble de l'activité taxi"""
+    st.markdown('<h3 class="section-header">🏛️ VUE D\'ENSEMBLE DE L\'ACTIVITÉ TAXI</h3>', 
+               unsafe_allow_html=True)
+    
+    # Figures construites ensemble à la fin de la page, chacune émise à sa place
+    figures = FigureBatch()
+    
+    tab1, tab2, tab3, tab4 = st.tabs(["Carte Interactive", "Évolution de l'Activité", "Répartition Micro-régions", "Analyse Stations"])
+    
+    with tab1:
+        # Carte interactive avec Folium
+        st.subheader("Carte de l'activité taxi par commune")
+        
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            afficher_couverture = st.checkbox("Afficher le déficit de couverture offre/demande", value=True)
+        with col2:
+            resolution_grille = st.select_slider("Résolution de la grille (m)",
+                                                 options=[100, 250, 500, 1000], value=100,
+                                                 disabled=not afficher_couverture)
+        
+        if afficher_couverture:
+            grid, points_deficit = load_coverage_grid(data, resolution_grille)
+        
+        # Communes dont la dernière période de l'historique est anormale
+        derniere_periode = data.historical_data['date'].max()
+        alertes = latest_alerts(load_anomalies(data), derniere_periode)
+        
+        def build_map():
+            """Carte rendue en HTML, mise en cache par version des communes, des stations et de l'historique"""
+            # Création de la carte centrée sur La Réunion
+            m = folium.Map(location=[-21.115, 55.536], zoom_start=10)
+            
+            # Marqueurs des communes et des stations principales, une couche chacun
+            MarkerLayer(commune_markers(data.current_data, alertes), max_width=300).add_to(m)
+            MarkerLayer(station_markers(data.taxi_stations_data), max_width=200).add_to(m)
+            
+            # Couche de déficit de couverture (demande non couverte par l'offre)
+            if afficher_couverture:
+                HeatMap(points_deficit, name='Déficit de couverture', radius=12, blur=10,
+                        min_opacity=0.3).add_to(m)
+                folium.LayerControl(collapsed=True).add_to(m)
+            
+            # Légende
+            legend_html = '''
+            <div style="position: fixed; 
+                        bottom: 50px; left: 50px; width: 220px; height: 210px; 
+                        background-color: white; border:2px solid grey; z-index:9999; 
+                        font-size:14px; padding: 10px">
+            <p><strong>Légende Activité</strong></p>
+            <p><i class="fa fa-taxi" style="color:green"></i> Élevée</p>
+            <p><i class="fa fa-taxi" style="color:orange"></i> Moyenne</p>
+            <p><i class="fa fa-taxi" style="color:red"></i> Faible</p>
+            <p><i class="fa fa-taxi" style="color:lightgray"></i> Limitée</p>
+            <p><i class="fa fa-flag" style="color:blue"></i> Station</p>
+            <p><i class="fa fa-fire" style="color:red"></i> Déficit de couverture</p>
+            <p><i class="fa fa-exclamation-triangle"></i> Anomalie récente</p>
+            </div>
+            '''
+            m.get_root().html.add_child(folium.Element(legend_html))
+            return folium.Figure().add_child(m).render()
+        
+        if afficher_couverture:
+            deficit = np.clip(grid['ecart'], 0, None)
+            st.caption(f"Grille {grid['ecart'].shape[1]} x {grid['ecart'].shape[0]} cellules de {resolution_grille} m • "
+                       f"Demande non couverte estimée: {deficit.sum():,.0f} courses/j • "
+                       f"{np.count_nonzero(deficit > 0.01):,} cellules en déficit")
+        
+        # Affichage de la carte (HTML réutilisé tant que communes, stations, historique et options sont inchangés)
+        html_carte = cached_artifact(data, 'carte_activite', ('communes', 'stations', 'historique'), build_map,
+                                     (afficher_couverture, resolution_grille if afficher_couverture else None))
+        display_map_html(html_carte, width=1000, height=500)
+        if alertes:
+            st.warning(f"⚠️ Anomalies sur la période {derniere_periode.year}: "
+                       + " • ".join(f"**{commune}**: {texte}" for commune, texte in sorted(alertes.items())))
+    
+    with tab2:
+        # Agrégat annuel par micro-région, recalculé uniquement si l'historique change
+        evolution_data = cached_artifact(data, 'evolution_annuelle_microregions', ('historique',),
+                                         data.annual_microregion_totals)
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Évolution du nombre de taxis par micro-région
+            figures.add("Vue d'ensemble / Évolution de l'Activité", px.line, evolution_data,
+                        render_mode=render_mode(len(evolution_data)),
+                        x='date',
+                        y='nombre_taxis',
+                        color='micro_region',
+                        title='Évolution du nombre de taxis par micro-région (2018-2024)',
+                        color_discrete_sequence=['#1E88E5', '#43A047', '#FF9800', '#AB47BC', '#5D4037'],
+                        layout=dict(yaxis_title="Nombre de taxis"))
+        
+        with col2:
+            # Évolution de la demande
+            figures.add("Vue d'ensemble / Évolution de l'Activité", px.line, evolution_data,
+                        render_mode=render_mode(len(evolution_data)),
+                        x='date',
+                        y='demande_moyenne_journaliere',
+                        color='micro_region',
+                        title='Évolution de la demande par micro-région (2018-2024)',
+                        color_discrete_sequence=['#1E88E5', '#43A047', '#FF9800', '#AB47BC', '#5D4037'],
+                        layout=dict(yaxis_title="Demande journalière (courses)"))
+    
+    with tab3:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Répartition des taxis par micro-région
+            figures.add("Vue d'ensemble / Répartition Micro-régions", px.pie, data.microregion_data,
+                        values='nombre_taxis_total',
+                        names='micro_region',
+                        title='Répartition des taxis par micro-région',
+                        color='micro_region',
+                        color_discrete_map={
+                            'Nord': '#1E88E5',
+                            'Sud': '#43A047',
+                            'Ouest': '#FF9800',
+                            'Est': '#AB47BC',
+                            'Cirques': '#5D4037'
+                        })
+        
+        with col2:
+            # Demande par micro-région
+            figures.add("Vue d'ensemble / Répartition Micro-régions", px.bar, data.microregion_data,
+                        x='micro_region',
+                        y='demande_totale_journaliere',
+                        title='Demande journalière par micro-région',
+                        color='micro_region',
+                        color_discrete_map={
+                            'Nord': '#1E88E5',
+                            'Sud': '#43A047',
+                            'Ouest': '#FF9800',
+                            'Est': '#AB47BC',
+                            'Cirques': '#5D4037'
+                        },
+                        layout=dict(yaxis_title="Demande journalière (courses)"))
+    
+    with tab4:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Stations principales
+            figures.add("Vue d'ensemble / Analyse Stations", px.bar, data.taxi_stations_data,
+                        x='nom',
+                        y='nombre_taxis',
+                        title='Stations de taxis principales',
+                        color='type',
+                        color_discrete_sequence=['#1E88E5', '#43A047', '#FF9800', '#AB47BC'],
+                        layout=dict(xaxis_title="Station", yaxis_title="Nombre de taxis"))
+        
+        with col2:
+            # Taux d'occupation par micro-région
+            figures.add("Vue d'ensemble / Analyse Stations", px.bar, data.microregion_data,
+                        x='micro_region',
+                        y='taux_occupation_moyen',
+                        title='Taux d\'occupation moyen par micro-région',
+                        color='micro_region',
+                        color_discrete_map={
+                            'Nord': '#1E88E5',
+                            'Sud': '#43A047',
+                            'Ouest': '#FF9800',
+                            'Est': '#AB47BC',
+                            'Cirques': '#5D4037'
+                        },
+                        layout=dict(yaxis_title="Taux d'occupation (%)"))
+        
+        # Séries temporelles par station (pas de 5 minutes, magasin mappé en mémoire)
+        st.markdown("---")
+        st.subheader("Tendances par station")
+        store = cached_artifact(data, 'series_stations', ('communes', 'stations'),
+                                lambda: open_station_series(data.current_data, data.taxi_stations_data,
+                                                            data.version.token('communes', 'stations')))
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            communes_reseau = sorted(store.stations['commune'].unique())
+            commune_stations = st.selectbox("Commune", ['Toutes'] + communes_reseau, key='series_commune')
+        with col2:
+            periode = st.date_input("Période", value=((store.fin - pd.Timedelta(days=7)).date(),
+                                                     (store.fin - pd.Timedelta(days=1)).date()),
+                                    min_value=store.debut.date(), max_value=(store.fin - pd.Timedelta(days=1)).date(),
+                                    key='series_periode')
+        with col3:
+            resolution = st.select_slider("Résolution", options=list(RESOLUTIONS_SERIES), value='1 h',
+                                          key='series_resolution')
+        
+        debut_periode = pd.Timestamp(periode[0])
+        fin_periode = pd.Timestamp(periode[-1]) + pd.Timedelta(days=1)
+        reseau = store.stations if commune_stations == 'Toutes' else \
+            store.stations[store.stations['commune'] == commune_stations]
+        
+        # Stations les plus chargées de la sélection sur la période
+        def rank_stations():
+            charge = store.summary('occupation', reseau['nom'], debut_periode, fin_periode)
+            files = store.summary('file_attente', reseau['nom'], debut_periode, fin_periode)
+            return charge.add_suffix('_occupation').join(files.add_suffix('_file')) \
+                .sort_values('moyenne_occupation', ascending=False)
+        classement = cached_artifact(data, 'classement_stations', ('communes', 'stations'), rank_stations,
+                                     (commune_stations, debut_periode, fin_periode))
+        stations_choisies = st.multiselect("Stations", list(reseau['nom']),
+                                           default=list(classement.index[:3]), max_selections=10,
+                                           key=f"series_stations_{commune_stations}")
+        
+        if stations_choisies:
+            frequence = RESOLUTIONS_SERIES[resolution]
+            col1, col2 = st.columns(2)
+            for colonne, mesure, titre, axe in ((col1, 'occupation', "Taux d'occupation par station", "Occupation (%)"),
+                                                (col2, 'file_attente', "File d'attente par station", "Clients en attente")):
+                agregat = 'mean' if mesure == 'occupation' else 'max'
+                serie = store.rollup(mesure, frequence, agregat, stations_choisies, debut_periode, fin_periode)
+                serie = serie.rename_axis('instant').reset_index().melt(id_vars='instant', var_name='station',
+                                                                         value_name=mesure)
+                with colonne:
+                    figures.add("Vue d'ensemble / Analyse Stations", px.line, serie,
+                                render_mode=render_mode(len(serie)),
+                                x='instant',
+                                y=mesure,
+                                color='station',
+                                title=titre,
+                                layout=dict(yaxis_title=axe, xaxis_title="", legend_title=""))
+        
+        st.dataframe(classement.head(20).round(1), use_container_width=True)
+        st.caption(f"{len(store.stations):,} stations x {store.n_pas:,} pas de 5 min • "
+                   f"{store.nbytes / 1e6:,.0f} Mo mappés en mémoire (réseau secondaire et séries synthétiques)")
+    
+    figures.render()
+
+
+create_activity_overview(get_data())
@@ -0,0 +1,254 @@
+"""Page Scénarios: projections 2030, simulateur, simulation de service et recommandations"""
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import folium
+from taxis_run.markers import MarkerLayer, station_markers
+from taxis_run.simulation import build_simulation_model, run_replications
+from taxis_run.placement import RAYON_SERVICE_M, optimize_station_placement
+from taxis_run.scenarios import project_simulator
+from views.shared import FigureBatch, cached_artifact, display_map_html, get_data, load_coverage_grid
+
+DEPENDANCES_SIMULATEUR = ('communes', 'stations', 'simulateur')
+
+
+def load_service_simulation(data, facteur_flotte, facteur_demande, n_replications):
+    """Résultats agrégés des réplications de la simulation de service (graine fixe)"""
+    def calcul():
+        with st.spinner("Simulation de la journée de service..."):
+            model = build_simulation_model(data.current_data, data.taxi_stations_data,
+                                           facteur_flotte, facteur_demande)
+            return run_replications(model, n_replications, seed=0)
+    return cached_artifact(data, 'simulation_service', DEPENDANCES_SIMULATEUR, calcul,
+                           (facteur_flotte, facteur_demande, n_replications))
+
+
+def load_station_placement(data, n_max=50):
+    """Placement glouton de n_max nouvelles stations (les N premières forment la solution pour N)"""
+    def calcul():
+        grid, _ = load_coverage_grid(data, 500)
+        return optimize_station_placement(grid, data.current_data, n_max)
+    return cached_artifact(data, 'placement_stations', DEPENDANCES_SIMULATEUR, calcul, (500, n_max))
+
+
+def create_development_scenarios(data):
+    """Analyse des scénarios de développement"""
+    st.markdown('<h3 class="section-header">🔮 SCÉNARIOS DE DÉVELOPPEMENT</h3>', 
+               unsafe_allow_html=True)
+    
+    # Figures construites ensemble à la fin de la page, chacune émise à sa place
+    figures = FigureBatch()
+    
+    tab1, tab2, tab3, tab4 = st.tabs(["Scénarios 2030", "Simulateur", "Simulation Journée", "Recommandations"])
+    
+    with tab1:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Scénarios de développement
+            scenarios_data = pd.DataFrame({
+                'Scénario': ['Conservateur', 'Modéré', 'Ambitieux', 'Innovant'],
+                'Taxis_2030': [680, 750, 820, 900],
+                'Demande_2030': [12500, 14500, 16500, 18500],
+                'Revenu_moyen_2030': [2950, 3200, 3500, 3800],
+                'Digitalisation': [40, 60, 80, 95]
+            })
+            
+            figures.add('Scénarios / Scénarios 2030', px.bar, scenarios_data,
+                        x='Scénario',
+                        y='Taxis_2030',
+                        title='Nombre de taxis projeté en 2030 selon les scénarios',
+                        color='Scénario',
+                        color_discrete_sequence=['#E9C46A', '#43A047', '#1E88E5', '#AB47BC'])
+        
+        with col2:
+            # Impact sur la demande
+            figures.add('Scénarios / Scénarios 2030', px.bar, scenarios_data,
+                        x='Scénario',
+                        y='Demande_2030',
+                        title='Demande journalière projetée en 2030 selon les scénarios',
+                        color='Scénario',
+                        color_discrete_sequence=['#E9C46A', '#43A047', '#1E88E5', '#AB47BC'])
+    
+    with tab2:
+        st.subheader("Simulateur de Développement de l'Activité Taxi")
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            croissance_tourisme = st.slider("Croissance touristique (%)", 0, 50, 20)
+            taux_digitalisation = st.slider("Taux de digitalisation (%)", 0, 100, 60)
+        
+        with col2:
+            investissement_formation = st.slider("Investissement formation (M€)", 0, 10, 3)
+            nouvelles_stations = st.slider("Nouvelles stations", 0, 50, 8)
+        
+        with col3:
+            aide_renouvellement = st.slider("Aide au renouvellement (%)", 0, 50, 20)
+            priorite_microregion = st.selectbox("Micro-région prioritaire:", 
+                                              data.microregion_data['micro_region'].unique())
+        
+        # Calculs simulés
+        placement = load_station_placement(data).head(nouvelles_stations)
+        projection = project_simulator(data.current_data, placement, croissance_tourisme,
+                                       taux_digitalisation, nouvelles_stations)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Taxis projetés", f"{projection['taxis_projetes']:.0f}")
+            st.metric("Évolution vs actuel", f"+{projection['evolution_taxis_pct']:.1f}%")
+        with col2:
+            st.metric("Demande projetée", f"{projection['demande_projetee']:,.0f} courses/j")
+            st.metric("Évolution vs actuel", f"+{projection['evolution_demande_pct']:.1f}%")
+        with col3:
+            st.metric("Investissement formation", f"{investissement_formation} M€")
+            st.metric("Nouvelles stations", nouvelles_stations,
+                      f"+{projection['demande_captee']:,.0f} courses/j captées")
+        
+        # Emplacements optimaux des nouvelles stations
+        if nouvelles_stations > 0:
+            st.markdown(f"**📍 Emplacements optimaux des {len(placement)} nouvelles stations** "
+                        f"(demande non couverte à moins de {RAYON_SERVICE_M/1000:.0f} km)")
+            col1, col2 = st.columns([2, 1])
+            
+            with col1:
+                def build_map():
+                    m = folium.Map(location=[-21.115, 55.536], zoom_start=10)
+                    # Stations existantes: une seule couche de marqueurs, construite par colonnes
+                    MarkerLayer(station_markers(data.taxi_stations_data), max_width=200).add_to(m)
+                    for station in placement.itertuples():
+                        folium.Circle([station.lat, station.lon], radius=RAYON_SERVICE_M, color='green',
+                                      fill=True, fill_opacity=0.1, weight=1).add_to(m)
+                        folium.Marker(
+                            [station.lat, station.lon],
+                            tooltip=f"#{station.rang} - {station.commune}: +{station.demande_captee:.0f} courses/j",
+                            icon=folium.Icon(color='green', icon='plus', prefix='fa')
+                        ).add_to(m)
+                    return folium.Figure().add_child(m).render()
+                html_carte = cached_artifact(data, 'carte_placement', DEPENDANCES_SIMULATEUR, build_map,
+                                             (nouvelles_stations,))
+                display_map_html(html_carte, width=700, height=450)
+            
+            with col2:
+                figures.add('Scénarios / Simulateur', px.line, placement,
+                            x='rang',
+                            y='demande_captee_cumulee',
+                            markers=True,
+                            title='Demande captée cumulée',
+                            color_discrete_sequence=['#43A047'],
+                            layout=dict(xaxis_title="Nombre de stations", yaxis_title="Courses/j"))
+    
+    with tab3:
+        st.subheader("Simulation d'une journée de service")
+        st.markdown("Demandes tirées par commune selon la demande journalière, affectées au taxi libre le plus proche "
+                    "(stations et taxis hors station). Occupation calculée sur 24h.")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            flotte_pct = st.slider("Flotte disponible (% du parc)", 50, 150, 100, step=10)
+        with col2:
+            demande_pct = st.slider("Demande (% de l'actuelle)", 50, 200, 100, step=10)
+        with col3:
+            n_replications = st.slider("Nombre de réplications", 1, 32, 8)
+        
+        if st.button("▶️ Lancer la simulation"):
+            st.session_state['simulation_service_lancee'] = True
+        
+        if st.session_state.get('simulation_service_lancee'):
+            simulation = load_service_simulation(data, flotte_pct / 100, demande_pct / 100, n_replications)
+            
+            demandes = simulation['demandes_simulees']
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Demandes simulées", f"{demandes.sum():,.0f} courses/j")
+            with col2:
+                taux_service = (simulation['taux_service'] * demandes).sum() / demandes.sum()
+                st.metric("Demandes servies", f"{taux_service:.1f}%")
+            with col3:
+                attente = (simulation['attente_moyenne_min'] * demandes).sum() / demandes.sum()
+                st.metric("Attente moyenne", f"{attente:.1f} min")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                comparaison = simulation[['commune', 'taux_occupation_simule']].assign(
+                    taux_occupation_declare=data.current_data['taux_occupation'].to_numpy()
+                ).melt(id_vars='commune', var_name='Source', value_name='Taux')
+                figures.add('Scénarios / Simulation Journée', px.bar, comparaison,
+                            x='commune',
+                            y='Taux',
+                            color='Source',
+                            barmode='group',
+                            title='Taux d\'occupation simulé vs déclaré par commune',
+                            color_discrete_sequence=['#1E88E5', '#FF9800'],
+                            layout=dict(xaxis_title="Commune", yaxis_title="Taux d'occupation (%)"))
+            
+            with col2:
+                figures.add('Scénarios / Simulation Journée', px.bar, simulation.sort_values('attente_moyenne_min', ascending=False),
+                            x='commune',
+                            y=['attente_moyenne_min', 'attente_p90_min'],
+                            barmode='group',
+                            title='Temps d\'attente simulé par commune',
+                            color_discrete_sequence=['#43A047', '#AB47BC'],
+                            layout=dict(xaxis_title="Commune", yaxis_title="Attente (min)"))
+            
+            st.caption(f"{n_replications} réplications exécutées en parallèle.")
+    
+    with tab4:
+        st.subheader("Recommandations Stratégiques")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("""
+            ### 🚗 Court terme (2024-2026)
+            
+            **Actions prioritaires:**
+            - Modernisation du parc automobile
+            - Déploiement d'applications de réservation
+            - Formation à l'accueil touristique
+            - Création de stations intelligentes
+            
+            **Cibles:**
+            - 20% de véhicules électriques
+            - 60% de réservations digitalisées
+            - +15% de revenus touristiques
+            - Amélioration des conditions de travail
+            """)
+        
+        with col2:
+            st.markdown("""
+            ### 🚕 Moyen terme (2027-2030)
+            
+            **Actions structurantes:**
+            - Développement de services premium
+            - Intégration multimodalité
+            - Certification qualité
+            - Observatoire de la mobilité
+            
+            **Objectifs:**
+            - 40% de véhicules électriques
+            - 80% de réservations digitalisées
+            - +30% de revenus moyens
+            - Reconnaissance professionnelle
+            """)
+        
+        st.markdown("""
+        ### 🚙 Long terme (2031-2040)
+        
+        **Vision stratégique:**
+        - Parc 100% décarboné
+        - Service de mobilité intégré
+        - Excellence du service client
+        - Modèle économique durable
+        
+        **Indicateurs cibles:**
+        - 100% de véhicules propres
+        - Satisfaction client > 90%
+        - Revenus stables et décents
+        - Attractivité du métier préservée
+        """)
+    
+    figures.render()
+
+
+create_development_scenarios(get_data())
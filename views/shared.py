@@ -0,0 +1,127 @@
+"""Éléments partagés par les pages du dashboard: couche de données en cache et composants communs.
+
+Ce module reste léger: chaque page importe elle-même ses dépendances
+propres (folium, simulation, placement...).
+"""
+import logging
+import os
+
+import pandas as pd
+import streamlit as st
+import streamlit.components.v1 as components
+
+from taxis_run.anomalies import detect_anomalies
+from taxis_run.charts import FigureFactory
+from taxis_run.coverage import compute_coverage_grid, heatmap_points
+from taxis_run.data import ReunionTaxiData, sources_from_directory
+from taxis_run.export import FORMATS, export_to_file
+from taxis_run.versioning import ArtifactCache, sources_token
+
+logger = logging.getLogger('taxis_run.figures')
+
+
+@st.cache_resource(show_spinner="Chargement des données...", max_entries=2)
+def load_data(_sources, version_sources):
+    """Couche de données pour un état des fichiers sources (jeton de contenu version_sources)"""
+    return ReunionTaxiData(_sources)
+
+
+def get_data():
+    """Couche de données unique, chargée une fois par version des sources et partagée par les pages.
+
+    Les fichiers sources sont cherchés dans le dossier TAXIS_RUN_DATA_DIR s'il est défini;
+    un fichier modifié change le jeton et déclenche le rechargement.
+    """
+    sources = sources_from_directory(os.environ.get('TAXIS_RUN_DATA_DIR'))
+    return load_data(sources, sources_token(sources))
+
+
+@st.cache_resource
+def get_artifact_cache():
+    """Cache des artefacts (grilles, placements, figures, cartes) partagé par les sessions"""
+    return ArtifactCache()
+
+
+def cached_artifact(data, artefact, composants, fonction, params=(), annees=None):
+    """Artefact calculé par fonction(), réutilisé tant que les composants dont il dépend sont inchangés"""
+    version = data.version.token(*composants, annees=annees)
+    return get_artifact_cache().get_or_compute(artefact, version, fonction, params)
+
+
+def load_coverage_grid(data, resolution_m):
+    """Grille de couverture offre/demande, recalculée uniquement si les communes ou les stations changent"""
+    def calcul():
+        grid = compute_coverage_grid(data.current_data, data.taxi_stations_data, resolution_m)
+        return grid, heatmap_points(grid)
+    return cached_artifact(data, 'grille_couverture', ('communes', 'stations'), calcul, (resolution_m,))
+
+
+def load_anomalies(data):
+    """Valeurs anormales de l'historique des communes, recalculées uniquement si l'historique change"""
+    return cached_artifact(data, 'anomalies_historique', ('historique',),
+                           lambda: detect_anomalies(data.historical_data))
+
+
+def display_map_html(html, width, height):
+    """Affiche une carte Folium déjà rendue en HTML (équivalent de folium_static)"""
+    components.html(html, height=height + 10, width=width)
+
+
+@st.cache_resource
+def get_payload_log():
+    """Poids de la dernière émission de chaque figure: {(onglet, titre): octets}"""
+    return {}
+
+
+@st.cache_resource
+def get_figure_factory():
+    """Fabrique de figures partagée par les sessions (un pool de processus par serveur)"""
+    return FigureFactory()
+
+
+class FigureBatch:
+    """Figures d'une vue: place réservée à la déclaration, construction concurrente, émission dans l'ordre"""
+
+    def __init__(self):
+        self.figures = []
+
+    def add(self, onglet, constructeur, *args, layout=None, finitions=(), **kwargs):
+        """Réserve la place de la figure constructeur(*args, **kwargs) dans le conteneur courant"""
+        self.figures.append((st.empty(), onglet, (constructeur, args, kwargs, layout, tuple(finitions))))
+
+    def render(self):
+        """Construit toutes les figures ensemble, journalise leur poids et les affiche à leur place"""
+        specs = [spec for _, _, spec in self.figures]
+        for (place, onglet, _), (fig, taille) in zip(self.figures, get_figure_factory().build(specs)):
+            titre = fig.layout.title.text or f"figure {len(fig.data)} traces"
+            get_payload_log()[(onglet, titre)] = taille
+            logger.info("%s | %s: %d octets", onglet, titre, taille)
+            place.plotly_chart(fig, use_container_width=True)
+        self.figures = []
+
+
+def payload_report():
+    """Poids des figures émises, par onglet (total, nombre de figures, plus lourde)"""
+    journal = pd.DataFrame([(onglet, titre, taille) for (onglet, titre), taille in get_payload_log().items()],
+                           columns=['onglet', 'figure', 'octets'])
+    return journal.groupby('onglet').agg(
+        figures=('figure', 'size'),
+        total_ko=('octets', lambda octets: round(octets.sum() / 1024, 1)),
+        plus_lourde_ko=('octets', lambda octets: round(octets.max() / 1024, 1)),
+    ).reset_index()
+
+
+def display_export(frame, nom_fichier, key):
+    """Affiche le choix du format et le bouton d'export de la vue filtrée"""
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        format_export = st.selectbox("Format d'export", list(FORMATS), key=f"{key}_format",
+                                     label_visibility="collapsed")
+    with col2:
+        extension, mime = FORMATS[format_export]
+        # Fichier généré par lots au clic, dans un thread séparé du rerun
+        st.download_button(f"⬇️ Exporter la vue ({len(frame):,} lignes)",
+                           data=lambda: export_to_file(frame, format_export),
+                           file_name=f"{nom_fichier}.{extension}",
+                           mime=mime,
+                           key=key)